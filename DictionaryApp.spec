@@ -5,7 +5,7 @@ a = Analysis(
     ['main_qt.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('irregular_forms.json', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,131 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Профиль сборки с упором на размер и скорость запуска (рядом с DictionaryApp.spec):
+#
+#     pyinstaller DictionaryAppFast.spec
+#     python benchmarks/bench_bundle.py
+#
+# Отличия от DictionaryApp.spec:
+#   * байткод скомпилирован с optimize=2 (без assert и docstring'ов);
+#   * исключены модули Python и PySide6, которые приложение не импортирует;
+#   * из собранных бинарников удалены библиотеки Qt кроме Core/Gui/Widgets
+#     и плагины, которые их подтягивают (imageformats, tls, виртуальная клавиатура...);
+#   * без UPX: распаковка сжатых библиотек замедляет каждый запуск.
+#
+# requests, urllib3, certifi и OpenSSL остаются: через них идёт проверка LanguageTool.
+
+import os
+import sys
+
+# Используются только QtCore / QtGui / QtWidgets. OpenGL остаётся: с ним слинкованы
+# платформы eglfs/minimalegl и EGL-интеграция Wayland
+QT_UNUSED = [
+    "Network", "Pdf", "Qml", "QmlMeta", "QmlModels",
+    "QmlWorkerScript", "Quick", "Svg", "VirtualKeyboard", "VirtualKeyboardQml",
+]
+if not sys.platform.startswith("linux"):
+    # на Linux libQt6Gui.so.6 слинкована с libQt6DBus (NEEDED): без неё QtGui не загрузится
+    QT_UNUSED.append("DBus")
+
+EXCLUDES = [
+    *(f"PySide6.Qt{name}" for name in QT_UNUSED),
+    "PySide6.QtWebEngineCore", "PySide6.QtWebEngineWidgets",
+    "tkinter", "unittest", "doctest", "pydoc", "pdb", "lib2to3",
+    "setuptools", "pkg_resources", "distutils", "readline", "lzma", "bz2",
+]
+
+# Каталоги плагинов Qt, не нужные виджетному приложению
+QT_PLUGIN_DIRS_UNUSED = [
+    "imageformats", "iconengines", "tls", "networkinformation", "generic",
+    "qmltooling", "sqldrivers", "multimedia", "position", "webview",
+]
+QT_PLUGINS_UNUSED = [
+    "platforminputcontexts/libqtvirtualkeyboardplugin",
+    "platforms/libqminimal", "platforms/libqoffscreen",
+    "platforms/libqvnc",  # нужна QtNetwork
+    "wayland-decoration-client/libadwaita",  # нужна QtSvg; остаётся декорация bradient
+    "styles/libqmacstyle",  # стиль задаётся явно: Fusion
+]
+
+
+def _parts(dest):
+    return dest.replace("\\", "/").split("/")
+
+
+def _qt_lib_unused(dest):
+    """QtNetwork.framework/..., Qt6Network.dll, libQt6Network.so.6, QtNetwork.abi3.so"""
+    for part in _parts(dest):
+        name = part.split(".")[0]
+        for prefix in ("libQt6", "Qt6", "Qt"):
+            if name.startswith(prefix) and name[len(prefix):] in QT_UNUSED:
+                return True
+    return False
+
+
+def _qt_plugin_unused(dest):
+    parts = _parts(dest)
+    if "plugins" not in parts:
+        return False
+    rel = parts[parts.index("plugins") + 1:]
+    if rel and rel[0] in QT_PLUGIN_DIRS_UNUSED:
+        return True
+    stem = os.path.splitext("/".join(rel))[0]
+    return any(stem == p or stem == p.replace("/lib", "/") for p in QT_PLUGINS_UNUSED)
+
+
+def prune(toc):
+    return [
+        entry for entry in toc
+        if not (_qt_lib_unused(entry[0]) or _qt_plugin_unused(entry[0]))
+    ]
+
+
+a = Analysis(
+    ['main_qt.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('irregular_forms.json', '.')],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=EXCLUDES,
+    noarchive=False,
+    optimize=2,
+)
+a.binaries = prune(a.binaries)
+a.datas = prune(a.datas)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='DictionaryAppFast',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=True,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=True,
+    upx=False,
+    upx_exclude=[],
+    name='DictionaryAppFast',
+)
+app = BUNDLE(
+    coll,
+    name='DictionaryAppFast.app',
+    icon=None,
+    bundle_identifier=None,
+)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Batch grading throughput: threaded requests client vs asyncio client.
+
+SENTENCES generated sentences (no two alike, the grammar cache is off) are
+graded against the local LanguageTool stand-in, which spends DELAY seconds
+on every request like a loaded server would.
+
+    threads xN  check_sentences_batch in batches of BATCH on the shared
+                grammar pool resized to N threads (one session, N connections)
+    async xN    check_sentences_async with a concurrency limit of N
+
+Both run at the same concurrency for each N in CONCURRENCY, so the rows
+compare the APIs and not the number of requests in flight. Reports
+sentences per minute, requests and failed sentences. The last row runs
+against a stand-in that answers every THROTTLE_EVERY-th request with 429
+and Retry-After: 1; the client must back off and still grade every sentence.
+
+Run from the repository root:
+
+    python benchmarks/bench_async.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import grammar_online
+from grammar_async import AsyncLanguageToolClient, check_sentences_async
+from grammar_online import LanguageToolClient, check_sentences_batch, configure_pool, get_executor
+from lt_standin import StandInServer
+
+SENTENCES = 2000
+BATCH = 25
+DELAY = 0.05
+CONCURRENCY = (4, 16)
+THROTTLE_EVERY = 20
+SUBJECTS = ("I", "She", "We", "They", "My friend", "The teacher", "Our neighbours")
+VERBS = ("read", "write", "open", "clean", "paint", "carry", "find")
+
+
+def corpus(n: int) -> tuple[list[str], list[str]]:
+    sentences, words = [], []
+    for i in range(n):
+        verb = VERBS[i % len(VERBS)]
+        subject = SUBJECTS[(i // len(VERBS)) % len(SUBJECTS)]
+        typo = "teh" if i % 10 == 0 else "the"
+        sentences.append(f"{subject} will {verb} {typo} letter number {i} tomorrow.")
+        words.append(verb)
+    return sentences, words
+
+
+def failed(results) -> int:
+    return sum(1 for r in results
+               if any(m.get("rule", {}).get("id") in ("error", "timeout") for m in r.matches))
+
+
+def run_threads(endpoint: str, sentences: list[str], words: list[str], concurrency: int) -> tuple:
+    client = LanguageToolClient(endpoint=endpoint, pool_size=concurrency)
+    grammar_online.set_client(client)
+    configure_pool(concurrency)
+    batches = [(sentences[i:i + BATCH], words[i:i + BATCH])
+               for i in range(0, len(sentences), BATCH)]
+    t0 = time.perf_counter()
+    futures = [get_executor().submit(check_sentences_batch, s, w, "Future Simple")
+               for s, w in batches]
+    results = [r for f in futures for r in f.result()]
+    wall = time.perf_counter() - t0
+    return wall, client.stats.requests, failed(results), 0
+
+
+def run_async(endpoint: str, sentences: list[str], words: list[str], concurrency: int) -> tuple:
+    async def go():
+        async with AsyncLanguageToolClient(endpoint, concurrency=concurrency) as client:
+            t0 = time.perf_counter()
+            results = await check_sentences_async(sentences, words, "Future Simple", client,
+                                                  batch_size=BATCH)
+            wall = time.perf_counter() - t0
+            return wall, client.stats.requests, failed(results), client.rate_limited
+
+    return asyncio.run(go())
+
+
+def row(name: str, n: int, wall: float, requests: int, fails: int, limited: int) -> None:
+    print(f"{name:>14} {n / wall * 60:10.0f} {wall:7.2f}s {requests:8d} {limited:5d} {fails:6d}")
+
+
+def main() -> None:
+    grammar_online.set_cache(None)
+    sentences, words = corpus(SENTENCES)
+    print(f"{SENTENCES} sentences, batches of {BATCH}, {DELAY * 1000:.0f}ms per request")
+    print(f"{'client':>14} {'sent/min':>10} {'wall':>8} {'requests':>8} {'429s':>5} {'failed':>6}")
+
+    with StandInServer(delay=DELAY) as lt:
+        for c in CONCURRENCY:
+            row(f"threads x{c}", SENTENCES, *run_threads(lt.endpoint, sentences, words, c))
+            row(f"async x{c}", SENTENCES, *run_async(lt.endpoint, sentences, words, c))
+
+    with StandInServer(delay=DELAY, throttle_every=THROTTLE_EVERY, retry_after=1) as lt:
+        c = CONCURRENCY[-1]
+        row(f"async x{c} 429", SENTENCES, *run_async(lt.endpoint, sentences, words, c))
+
+    grammar_online.shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Full card set (5 sentences): one check_sentence call per sentence vs a single
+check_sentences_batch round-trip, against a stand-in with simulated latency.
+
+    python benchmarks/bench_batch.py [latency_ms]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import grammar_online as g
+from lt_standin import StandInServer
+
+SENTENCES = [
+    "I have seldom seen such a landscape.",
+    "It is necessary to build a fence.",
+    "The sun was shining all day.",
+    "She will believe in you.",
+    "We have had enough of it.",
+]
+WORDS = ["seldom", "necessary", "shine", "believe in", "enough"]
+
+
+def main() -> None:
+    latency = (float(sys.argv[1]) if len(sys.argv) > 1 else 80.0) / 1000
+    rounds = 5
+
+    with StandInServer(delay=latency) as srv:
+        g.set_client(g.LanguageToolClient(endpoint=srv.endpoint))
+        g.get_client().languages()  # warm up the connection
+
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for s, w in zip(SENTENCES, WORDS):
+                g.check_sentence(s, w, "Present Simple")
+        serial = (time.perf_counter() - t0) / rounds
+
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            g.check_sentences_batch(SENTENCES, WORDS, "Present Simple")
+        batch = (time.perf_counter() - t0) / rounds
+
+    print(f"server latency:  {latency * 1000:7.1f} ms")
+    print(f"per-sentence:    {serial * 1000:7.1f} ms per card set")
+    print(f"batched:         {batch * 1000:7.1f} ms per card set")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Bundle size and launch time of the two PyInstaller profiles.
+
+    DictionaryApp.spec      default build (dist/DictionaryApp)
+    DictionaryAppFast.spec  excludes, optimize=2, pruned Qt (dist/DictionaryAppFast)
+
+For each built profile: size on disk and file count of the onedir bundle,
+the share taken by Qt, then the time from spawning the executable to the
+main window's first paint (ui_qt writes the timestamp to the file named by
+METHOD_STARTUP_PROBE and quits), median of LAUNCHES launches. A priming
+launch writes the seed vocabulary first. "warm" launches find the bundle in
+the OS file cache; with --purge the cache is also dropped before each of
+LAUNCHES "cold" launches (`purge` on macOS, /proc/sys/vm/drop_caches on
+Linux; needs root).
+
+Run from the repository root:
+
+    python benchmarks/bench_bundle.py [--build] [--purge]
+
+--build runs `python -m PyInstaller --noconfirm` for both specs first.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PROFILES = (("default", "DictionaryApp"), ("fast", "DictionaryAppFast"))
+LAUNCHES = 5
+TIMEOUT = 120
+PROBE_ENV = "METHOD_STARTUP_PROBE"
+
+
+def bundle_stats(path: Path) -> tuple[int, int, int]:
+    """Bytes, files and bytes under Qt/PySide6 of a onedir bundle; symlinks are not followed"""
+    size = files = qt = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for name in filenames:
+            p = Path(dirpath, name)
+            if p.is_symlink():
+                continue
+            n = p.stat().st_size
+            size += n
+            files += 1
+            if "PySide6" in p.parts or "Qt" in p.parts or name.startswith(("Qt", "libQt6")):
+                qt += n
+    return size, files, qt
+
+
+def executable(name: str) -> Path:
+    exe = ROOT / "dist" / name / name
+    return exe.with_suffix(".exe") if sys.platform == "win32" else exe
+
+
+def drop_caches() -> None:
+    if sys.platform == "darwin":
+        subprocess.run(["sudo", "-n", "purge"], check=True)
+    elif sys.platform.startswith("linux"):
+        os.sync()
+        Path("/proc/sys/vm/drop_caches").write_text("3\n")
+    else:
+        raise SystemExit("--purge is supported on macOS and Linux only")
+
+
+def launch(exe: Path, data_home: Path) -> float:
+    """Milliseconds from spawning the executable to the first paint of its window"""
+    probe = data_home / "painted"
+    probe.unlink(missing_ok=True)
+    # a private HOME, so the app finds the vocabulary seeded by the priming launch
+    env = dict(os.environ, HOME=str(data_home), USERPROFILE=str(data_home),
+               **{PROBE_ENV: str(probe)})
+    t0 = time.time()
+    proc = subprocess.run([str(exe)], env=env, capture_output=True, timeout=TIMEOUT)
+    if not probe.exists():
+        raise RuntimeError(f"{exe} exited with {proc.returncode} before painting:\n"
+                           f"{proc.stderr.decode(errors='replace')}")
+    return (float(probe.read_text()) - t0) * 1000
+
+
+def build(spec: str) -> None:
+    subprocess.run([sys.executable, "-m", "PyInstaller", "--noconfirm", spec],
+                   cwd=ROOT, check=True)
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if "--build" in args:
+        for _label, name in PROFILES:
+            build(f"{name}.spec")
+    purge = "--purge" in args
+
+    print(f"{'profile':>8} {'size':>9} {'files':>6} {'Qt':>9} {'warm':>8} {'cold':>8}")
+    for label, name in PROFILES:
+        exe = executable(name)
+        if not exe.exists():
+            print(f"{label:>8}  not built: pyinstaller {name}.spec")
+            continue
+        size, files, qt = bundle_stats(exe.parent)
+        with tempfile.TemporaryDirectory() as home:
+            launch(exe, Path(home))
+            warm = statistics.median([launch(exe, Path(home)) for _ in range(LAUNCHES)])
+            cold = "-"
+            if purge:
+                runs = []
+                for _ in range(LAUNCHES):
+                    drop_caches()
+                    runs.append(launch(exe, Path(home)))
+                cold = f"{statistics.median(runs):.0f}ms"
+        print(f"{label:>8} {size / 2**20:7.1f}MB {files:6d} {qt / 2**20:7.1f}MB "
+              f"{warm:6.0f}ms {cold:>8}")
+
+
+if __name__ == "__main__":
+    main()
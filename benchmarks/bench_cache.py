@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Repeat-check latency with the two-tier grammar cache: network (stand-in)
+vs disk hit vs memory hit.
+
+    python benchmarks/bench_cache.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import grammar_online as g
+from grammar_cache import GrammarCache
+from lt_standin import StandInServer
+
+
+def _us(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main() -> None:
+    sentences = [f"I have seldom seen landscape number {i}." for i in range(200)]
+    with tempfile.TemporaryDirectory() as tmp, StandInServer(delay=0.02) as srv:
+        path = Path(tmp) / "grammar_cache.sqlite3"
+        g.set_client(g.LanguageToolClient(endpoint=srv.endpoint))
+
+        g.set_cache(None)
+        net = _us(lambda: g.check_grammar_language_tool(sentences[0]), 20)
+
+        g.set_cache(GrammarCache(path))
+        for s in sentences:
+            g.check_grammar_language_tool(s)
+
+        # fresh process view: empty memory tier, warm disk tier
+        g.set_cache(GrammarCache(path, max_memory_entries=1))
+        it = iter(sentences * 10)
+        disk = _us(lambda: g.check_grammar_language_tool(next(it)), len(sentences))
+
+        g.set_cache(GrammarCache(path))
+        g.check_grammar_language_tool(sentences[0])
+        mem = _us(lambda: g.check_grammar_language_tool(sentences[0]), 10_000)
+
+        print(f"network (20 ms stand-in): {net:10.1f} us")
+        print(f"disk hit:                 {disk:10.1f} us")
+        print(f"memory hit:               {mem:10.1f} us")
+        print(f"stats: {g.get_cache().stats_dict()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Time to the first round for a vocabulary of growing size: full json.load
++ Entry build, versus opening a compiled deck and drawing 3 cards.
+Run from the repository root:
+
+    python benchmarks/bench_deck.py
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_vocab_index import make_items
+from deck import CompiledDeck, compile_deck
+from vocab_index import ALL_TOPICS, Entry, TopicIndex, VocabIndex
+
+
+def main() -> None:
+    print(f"{'words':>8} {'deck size':>10} {'json':>10} {'deck':>10}")
+    for n in (1_000, 10_000, 100_000):
+        items = make_items(n)
+        with tempfile.TemporaryDirectory() as d:
+            src = Path(d) / "vocab.json"
+            src.write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
+            out = Path(d) / "vocab.deck"
+            compile_deck(items, out)
+
+            t0 = time.perf_counter()
+            with src.open(encoding="utf-8") as f:
+                entries = [Entry.from_item(it) for it in json.load(f)]
+            store = TopicIndex(entries)
+            VocabIndex(entries)
+            store.sample(ALL_TOPICS, 3)
+            t_json = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            deck = CompiledDeck(out)
+            deck.sample(ALL_TOPICS, 3)
+            deck.translations(items[0]["en"], "EN_TO_RU")
+            t_deck = time.perf_counter() - t0
+            deck.close()
+
+            print(f"{n:8d} {out.stat().st_size / 1e6:8.1f}MB "
+                  f"{t_json * 1000:8.1f}ms {t_deck * 1000:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
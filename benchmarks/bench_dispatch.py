@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Delivering background results to the GUI thread.
+
+WORKERS threads each produce RESULTS small results, one every INTERVAL.
+"per-result" posts one event to the GUI thread per result, the same event
+loop traffic as a worker emitting a queued `Signal(object)` for each result;
+"dispatcher" posts them through TaskDispatcher,
+which hands them to the GUI thread in coalesced batches. Reports how many
+times the GUI thread was woken, the delivery latency and the wall time until
+the last result arrived, plus the dispatcher's queue statistics for a burst
+of short tasks.
+
+Run from the repository root:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_dispatch.py
+"""
+
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from collections import deque
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject
+
+from task_dispatcher import TaskDispatcher
+
+WORKERS = 4
+RESULTS = 500
+TASKS = 200
+INTERVAL = 0.001
+
+
+RESULT = QEvent.Type(QEvent.registerEventType())
+
+
+class Receiver(QObject):
+    """One event per result; the values wait in a deque next to it"""
+
+    def __init__(self, on_result):
+        super().__init__()
+        self.values: deque = deque()
+        self.on_result = on_result
+
+    def customEvent(self, event: QEvent) -> None:
+        if event.type() == RESULT:
+            self.on_result(self.values.popleft())
+
+
+def run_per_result(app: QCoreApplication) -> tuple[int, list[float], float]:
+    latencies: list[float] = []
+    wakeups = [0]
+
+    def on_result(t: float) -> None:
+        wakeups[0] += 1
+        latencies.append((time.perf_counter() - t) * 1000)
+        if len(latencies) == WORKERS * RESULTS:
+            app.quit()
+
+    receiver = Receiver(on_result)
+    lock = threading.Lock()
+
+    def produce(_k: int) -> None:
+        for _ in range(RESULTS):
+            with lock:
+                receiver.values.append(time.perf_counter())
+                QCoreApplication.postEvent(receiver, QEvent(RESULT))
+            time.sleep(INTERVAL)
+
+    return _run(app, produce, latencies, wakeups)
+
+
+def run_dispatcher(app: QCoreApplication) -> tuple[int, list[float], float]:
+    dispatcher = TaskDispatcher()
+    latencies: list[float] = []
+    wakeups = [0]
+    last_batch = [None]
+
+    def on_result(t: float) -> None:
+        now = time.perf_counter()
+        # a new batch means a new _drain call from the event loop
+        batch = dispatcher.stats().batches
+        if batch != last_batch[0]:
+            last_batch[0] = batch
+            wakeups[0] += 1
+        latencies.append((now - t) * 1000)
+        if len(latencies) == WORKERS * RESULTS:
+            app.quit()
+
+    def produce(_k: int) -> None:
+        for _ in range(RESULTS):
+            dispatcher.post(on_result, time.perf_counter())
+            time.sleep(INTERVAL)
+
+    result = _run(app, produce, latencies, wakeups)
+    dispatcher.shutdown()
+    return result
+
+
+def _run(app, produce, latencies, wakeups) -> tuple[int, list[float], float]:
+    threads = [threading.Thread(target=produce, args=(k,)) for k in range(WORKERS)]
+    t0 = time.perf_counter()
+    for th in threads:
+        th.start()
+    app.exec()
+    wall = time.perf_counter() - t0
+    for th in threads:
+        th.join()
+    return wakeups[0], latencies, wall
+
+
+def task_burst(app: QCoreApplication) -> str:
+    dispatcher = TaskDispatcher()
+    done = [0]
+
+    def on_result(_value) -> None:
+        done[0] += 1
+        if done[0] == TASKS:
+            app.quit()
+
+    for i in range(TASKS):
+        dispatcher.submit(time.sleep, 0.002, on_result=on_result)
+    app.exec()
+    summary = dispatcher.stats().summary()
+    dispatcher.shutdown()
+    return summary
+
+
+def main() -> None:
+    app = QCoreApplication(sys.argv)
+    print(f"{WORKERS} threads x {RESULTS} results, one per {INTERVAL * 1000:.0f}ms")
+    print(f"{'delivery':>10} {'wakeups':>8} {'median':>9} {'p99':>9} {'max':>9} {'wall':>8}")
+    for name, run in (("per-result", run_per_result), ("dispatcher", run_dispatcher)):
+        wakeups, lat, wall = run(app)
+        lat.sort()
+        print(f"{name:>10} {wakeups:8d} {statistics.median(lat):7.1f}ms "
+              f"{lat[int(len(lat) * 0.99)]:7.1f}ms {lat[-1]:7.1f}ms {wall * 1000:6.0f}ms")
+
+    print()
+    print(f"{TASKS} tasks of 2ms on the dispatcher pool:")
+    print(" ", task_burst(app))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Connection reuse: bare `requests.post` per sentence vs the pooled
+LanguageToolClient, against a local LanguageTool stand-in.
+
+    python benchmarks/bench_lt_client.py [N]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+
+from grammar_online import LanguageToolClient
+from lt_standin import StandInServer
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    sentences = [f"This is test sentence number {i}." for i in range(n)]
+
+    with StandInServer() as srv:
+        t0 = time.perf_counter()
+        for s in sentences:
+            r = requests.post(srv.endpoint, data={"text": s, "language": "en-US"}, timeout=5)
+            r.raise_for_status()
+        bare = time.perf_counter() - t0
+
+        client = LanguageToolClient(endpoint=srv.endpoint)
+        t0 = time.perf_counter()
+        for s in sentences:
+            client.check(s)
+        pooled = time.perf_counter() - t0
+        client.close()
+
+    st = client.stats
+    print(f"sentences:        {n}")
+    print(f"bare requests:    {bare * 1000 / n:8.3f} ms/sentence")
+    print(f"pooled client:    {pooled * 1000 / n:8.3f} ms/sentence "
+          f"(avg {st.avg_ms:.3f} ms, max {st.max_seconds * 1000:.3f} ms, errors {st.errors})")
+    print(f"speedup:          {bare / pooled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+"Which vocabulary words does this text use?" for a whole vocabulary:
+one used_word_in_sentence call per word vs one PhraseMatcher pass.
+
+    python benchmarks/bench_matcher.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_tense import make_corpus
+from bench_vocab_index import make_items
+from grammar_online import used_word_in_sentence
+from phrase_matcher import PhraseMatcher
+from words_seed import SEED_WORDS
+
+
+def main() -> None:
+    corpus = make_corpus(2_000)
+    for label, words in (
+        ("seed", [w["en"] for w in SEED_WORDS]),
+        ("5k synthetic", [w["en"] for w in make_items(5_000)] + [w["en"] for w in SEED_WORDS]),
+    ):
+        t0 = time.perf_counter()
+        matcher = PhraseMatcher(words)
+        matcher.used("warm up")
+        build = time.perf_counter() - t0
+
+        sample = corpus[:200]
+        t0 = time.perf_counter()
+        naive = [{w for w in words if used_word_in_sentence(s, w)} for s in sample]
+        per_word = (time.perf_counter() - t0) / len(sample) * 1e3
+
+        t0 = time.perf_counter()
+        fast = [matcher.used(s) for s in corpus]
+        single_pass = (time.perf_counter() - t0) / len(corpus) * 1e3
+
+        assert naive == fast[:len(sample)]
+        print(f"{label:>13}: {len(words):5d} words  build {build * 1e3:7.1f} ms  "
+              f"per-word {per_word:8.3f} ms/text  matcher {single_pass:6.3f} ms/text")
+
+
+if __name__ == "__main__":
+    main()
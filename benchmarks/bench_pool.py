@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Cost of one Check (mark 3 cards learned, refresh stats, draw the next 3)
+vs deck size.
+
+Compares the old path (filter the topic through _card_key_words on every
+stats refresh and round) with RemainingPool. Run from the repository root:
+
+    python benchmarks/bench_pool.py
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_vocab_index import make_items
+from progress import ProgressStore
+from vocab_index import ALL_TOPICS, RemainingPool, TopicIndex, _norm
+
+
+def _key(item: dict) -> tuple[str, str, str]:
+    # ui_qt._card_key_words without importing Qt
+    return _norm(item.get("topic", "")), _norm(item.get("en", "")), _norm(item.get("ru", ""))
+
+
+def old_check(items: list[dict], learned: set, rng: random.Random) -> None:
+    remaining = [it for it in items if _key(it) not in learned]
+    for it in rng.sample(remaining, 3):
+        learned.add(_key(it))
+    total = len(items)
+    left = len([it for it in items if _key(it) not in learned])     # _refresh_stats
+    pool = [it for it in items if _key(it) not in learned]          # next_round
+    rng.sample(pool, 3)
+    assert total - left >= 0
+
+
+def new_check(pool: RemainingPool) -> None:
+    for it in pool.sample(ALL_TOPICS, 3):
+        pool.mark(it)
+    pool.count(ALL_TOPICS)
+    pool.sample(ALL_TOPICS, 3)
+
+
+def main() -> None:
+    rounds = 20
+    print(f"{'words':>8} {'filter':>10} {'pool':>10}")
+    for n in (1_000, 10_000, 100_000):
+        items = make_items(n)
+        rng = random.Random(0)
+
+        learned: set = set()
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            old_check(items, learned, rng)
+        old = (time.perf_counter() - t0) / rounds
+
+        with tempfile.TemporaryDirectory() as d:
+            store = ProgressStore(Path(d) / "progress.sqlite3")
+            pool = RemainingPool(TopicIndex(items), store.get("words"), _key)
+            pool.sample(ALL_TOPICS, 3)      # loads topics once, as on first round
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                new_check(pool)
+            new = (time.perf_counter() - t0) / rounds
+            store.close()
+
+        print(f"{n:8d} {old * 1000:8.2f}ms {new * 1000:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Startup cost of the Qt app.
+
+1. Imports: `python -X importtime -c "import ui_qt"`, the heaviest
+   direct imports of ui_qt by cumulative time and whether the lazily loaded
+   modules (requests, words_seed, grammar_online) stayed out.
+2. Time to first paint: a fresh interpreter (offscreen Qt platform, vocabulary
+   in a temporary directory) from process launch until the main window
+   receives its first paint event; median of RUNS launches.
+
+With --record the result is appended to benchmarks/startup_history.jsonl
+together with `git describe`, so releases can be compared over time.
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py [--record]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY = Path(__file__).resolve().parent / "startup_history.jsonl"
+RUNS = 7
+TOP = 10
+LAZY = ("requests", "words_seed", "grammar_online")
+
+# Runs in the child interpreter: the app window up to its first paint event
+CHILD = r"""
+import os, sys, time
+sys.path.insert(0, os.environ["BENCH_ROOT"])
+import storage
+from pathlib import Path
+storage._app_support_dir = lambda: Path(os.environ["BENCH_DATA"])
+
+import ui_qt
+from PySide6.QtCore import QEvent, QObject
+from PySide6.QtWidgets import QApplication
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            print("painted", time.time(), flush=True)
+            loaded = [m for m in os.environ["BENCH_LAZY"].split(",") if m in sys.modules]
+            print("lazy", ",".join(loaded), flush=True)
+            os._exit(0)
+        return False
+
+ui_qt.ensure_seed()
+app = QApplication(sys.argv)
+window = ui_qt.MainWindow()
+probe = FirstPaint()
+window.installEventFilter(probe)
+window.show()
+app.exec()
+"""
+
+
+def import_times() -> tuple[float, list[tuple[str, float]], list[str]]:
+    """Import time of ui_qt (ms), its heaviest direct imports, lazy modules loaded"""
+    code = "import sys, ui_qt; print(','.join(m for m in %r if m in sys.modules))" % (LAZY,)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    # importtime prints a module after its dependencies, indentation is the depth
+    children: list[tuple[str, float]] = []
+    top: list[tuple[str, float]] = []
+    total = 0.0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        ms = int(cumulative) / 1000
+        if depth == 1:
+            children.append((name.strip(), ms))
+        elif depth == 0:
+            if name.strip() == "ui_qt":
+                total, top = ms, children
+            children = []
+    top.sort(key=lambda t: -t[1])
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return total, top[:TOP], loaded
+
+
+def first_paint(data_dir: str) -> tuple[float, list[str]]:
+    """Milliseconds from launching the interpreter to the first paint of the window"""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", BENCH_ROOT=str(ROOT),
+               BENCH_DATA=data_dir, BENCH_LAZY=",".join(LAZY))
+    t0 = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=ROOT, env=env,
+        capture_output=True, text=True, timeout=120,
+    )
+    painted, loaded = None, []
+    for line in proc.stdout.splitlines():
+        if line.startswith("painted "):
+            painted = float(line.split()[1])
+        elif line.startswith("lazy"):
+            loaded = [m for m in line[len("lazy"):].strip().split(",") if m]
+    if painted is None:
+        raise RuntimeError(f"no paint event:\n{proc.stderr}")
+    return (painted - t0) * 1000, loaded
+
+
+def git_describe() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "describe", "--tags", "--always", "--dirty"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    record = "--record" in sys.argv[1:]
+
+    total, top, loaded = import_times()
+    print(f"import ui_qt: {total:.1f}ms")
+    print(f"{'module':>24} {'cumulative':>11}")
+    for name, ms in top:
+        print(f"{name:>24} {ms:9.1f}ms")
+    print(f"lazy modules imported eagerly: {', '.join(loaded) or 'none'}")
+
+    with tempfile.TemporaryDirectory() as data:
+        first_paint(data)  # the first launch writes vocab.json from words_seed
+        runs = []
+        for _ in range(RUNS):
+            ms, loaded = first_paint(data)
+            runs.append(ms)
+    paint = statistics.median(runs)
+    print()
+    print(f"time to first paint: median {paint:.0f}ms, min {min(runs):.0f}ms over {RUNS} runs")
+    print(f"lazy modules loaded at first paint: {', '.join(loaded) or 'none'}")
+
+    if record:
+        entry = {
+            "version": git_describe(),
+            "date": time.strftime("%Y-%m-%d"),
+            "python": sys.version.split()[0],
+            "import_ms": round(total, 1),
+            "first_paint_ms": round(paint, 1),
+            "eager": loaded,
+        }
+        with HISTORY.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"recorded in {HISTORY.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Cost of persisting one vocabulary edit vs deck size.
+
+Compares a full `json.dump(indent=2)` rewrite per edit (the old save path)
+with one appended VocabJournal record, and times a compaction.
+Run from the repository root:
+
+    python benchmarks/bench_storage.py
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_vocab_index import make_items
+from storage import VocabJournal, save_vocab
+
+
+def rewrite_indent(items: list[dict], path: Path) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False, indent=2)
+
+
+def main() -> None:
+    edits = 50
+    print(f"{'words':>8} {'rewrite/edit':>14} {'append/edit':>13} {'compact':>10}")
+    for n in (1_000, 10_000, 100_000):
+        items = make_items(n)
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "vocab.json"
+            save_vocab(items, path)
+
+            t0 = time.perf_counter()
+            for i in range(edits):
+                items[i]["ru"] += "!"
+                rewrite_indent(items, path)
+            rewrite = (time.perf_counter() - t0) / edits
+
+            save_vocab(items, path)
+            journal = VocabJournal(path, compact_every=edits + 1)
+            t0 = time.perf_counter()
+            for i in range(edits):
+                journal.update(journal.items[i], ru=journal.items[i]["ru"] + "?")
+            append = (time.perf_counter() - t0) / edits
+
+            t0 = time.perf_counter()
+            journal.compact()
+            compact = time.perf_counter() - t0
+            journal.close()
+
+        print(f"{n:8d} {rewrite * 1000:12.2f}ms {append * 1000:11.3f}ms {compact * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
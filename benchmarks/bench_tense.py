@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Per-sentence cost of the tense heuristic over a synthetic 100k-sentence
+corpus, all 12 tenses per sentence, plus the V2/V3 lookups on their own
+(linear IRREGULAR scan vs the precompiled tables).
+
+    python benchmarks/bench_tense.py [N]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import grammar_online as g
+from morphology import IRREGULAR
+
+SUBJECTS = ["I", "you", "he", "she", "we", "they", "my friend", "the teacher"]
+ADVERBS = ["", "", "just", "already", "never", "often", "really"]
+OBJECTS = ["a letter", "the book", "home", "to school", "some water", "dinner", "it"]
+TEMPLATES = [
+    "{s} {v} {o}.",
+    "{s} {v}s {o}.",
+    "{s} {v2} {o} yesterday.",
+    "{s} will {a} {v} {o}.",
+    "{s} is {a} {ving} {o}.",
+    "{s} was {ving} {o}.",
+    "{s} will be {ving} {o}.",
+    "{s} have {a} {v3} {o}.",
+    "{s} had {v3} {o}.",
+    "{s} will have {v3} {o}.",
+    "{s} have been {a} {ving} {o}.",
+    "{s} had been {ving} {o}.",
+    "{s} will have been {ving} {o}.",
+    "{s} did not {v} {o}.",
+]
+
+
+def _linear_v2(tok: str) -> bool:
+    if g._ends_with_ed(tok):
+        return True
+    for _base, (v2, _v3) in IRREGULAR.items():
+        if tok in [x.strip() for x in v2.split("/")]:
+            return True
+    return False
+
+
+def make_corpus(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    verbs = list(IRREGULAR.items())
+    out = []
+    for _ in range(n):
+        base, (v2, v3) = rng.choice(verbs)
+        out.append(rng.choice(TEMPLATES).format(
+            s=rng.choice(SUBJECTS), a=rng.choice(ADVERBS), o=rng.choice(OBJECTS),
+            v=base, v2=v2.split("/")[0], v3=v3.split("/")[0],
+            ving=(base[:-1] if base.endswith("e") and not base.endswith("ee") else base) + "ing",
+        ).replace("  ", " "))
+    return out
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    corpus = make_corpus(n)
+    tokens = [t for s in corpus[:20_000] for t in g._tokens(s)]
+
+    t0 = time.perf_counter()
+    for t in tokens:
+        _linear_v2(t)
+    linear = (time.perf_counter() - t0) / len(tokens) * 1e9
+
+    t0 = time.perf_counter()
+    for t in tokens:
+        g._looks_like_v2(t)
+    table = (time.perf_counter() - t0) / len(tokens) * 1e9
+
+    t0 = time.perf_counter()
+    for s in corpus:
+        for tense in g.TENSES:
+            g.tense_heuristic_ok(s, tense)
+    per_sentence = (time.perf_counter() - t0) / n * 1e6
+
+    t0 = time.perf_counter()
+    for s in corpus:
+        g.classify_tenses(s)
+    classify = (time.perf_counter() - t0) / n * 1e6
+
+    print(f"sentences:                 {n}")
+    print(f"V2 lookup, linear scan:    {linear:8.1f} ns/token")
+    print(f"V2 lookup, frozen table:   {table:8.1f} ns/token")
+    print(f"tense heuristic, 12 tenses:{per_sentence:8.1f} us/sentence")
+    print(f"classify_tenses:           {classify:8.1f} us/sentence")
+
+
+if __name__ == "__main__":
+    main()
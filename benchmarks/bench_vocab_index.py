@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Latency of one "Check Answers" click vs vocabulary size.
+
+Compares the old path (rebuild both translation indexes on every check)
+with VocabIndex lookups. Run from the repository root:
+
+    python benchmarks/bench_vocab_index.py
+"""
+
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vocab_index import VocabIndex, _extract_variants, _norm
+
+
+def _word(rng: random.Random, alphabet: str) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(4, 10)))
+
+
+def make_items(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    ru_letters = "абвгдежзийклмнопрстуфхцчшщыэюя"
+    return [
+        {
+            "topic": f"Topic {i % 20}",
+            "en": _word(rng, string.ascii_lowercase),
+            "ru": ", ".join(_word(rng, ru_letters) for _ in range(rng.randint(1, 3))),
+        }
+        for i in range(n)
+    ]
+
+
+# old path: both indexes were rebuilt from the whole vocabulary on every check
+def _ru_to_en_index(items: list) -> dict[str, set[str]]:
+    idx: dict[str, set[str]] = {}
+    for it in items:
+        en = _norm(it.get("en", ""))
+        ru = it.get("ru", "")
+        for ru_var in _extract_variants(ru):
+            idx.setdefault(ru_var, set()).add(en)
+    return idx
+
+
+def _en_to_ru_index(items: list) -> dict[str, set[str]]:
+    idx: dict[str, set[str]] = {}
+    for it in items:
+        en = it.get("en", "")
+        ru = it.get("ru", "")
+        en_vars = _extract_variants(en)
+        ru_vars = _extract_variants(ru)
+        for e in en_vars:
+            idx.setdefault(e, set()).update(ru_vars)
+    return idx
+
+
+def check_rebuild(items: list[dict], cards: list[dict]) -> None:
+    ru_index = _ru_to_en_index(items)
+    en_index = _en_to_ru_index(items)
+    for it in cards:
+        poss = set()
+        for en_v in _extract_variants(it["en"]):
+            poss |= en_index.get(en_v, set())
+        _ = _norm("answer") in poss
+        poss = set()
+        for ru_v in _extract_variants(it["ru"]):
+            poss |= ru_index.get(ru_v, set())
+
+
+def check_indexed(index: VocabIndex, cards: list[dict]) -> None:
+    for it in cards:
+        _ = _norm("answer") in index.translations(it["en"], "EN_TO_RU")
+        _ = _norm("answer") in index.translations(it["ru"], "RU_TO_EN")
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    print(f"{'items':>8} {'build ms':>10} {'rebuild/check ms':>18} {'index/check ms':>16}")
+    for n in (1_000, 10_000, 50_000, 100_000):
+        items = make_items(n)
+        cards = random.Random(1).sample(items, 3)
+
+        t0 = time.perf_counter()
+        index = VocabIndex(items)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        old = _best_ms(lambda: check_rebuild(items, cards), 3)
+        new = _best_ms(lambda: check_indexed(index, cards), 200)
+        print(f"{n:>8} {build_ms:>10.1f} {old:>18.2f} {new:>16.4f}")
+
+
+if __name__ == "__main__":
+    main()
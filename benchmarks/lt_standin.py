@@ -0,0 +1,101 @@
+"""
+Minimal local LanguageTool stand-in for benchmarks.
+
+Speaks just enough of the /v2/check API (form-encoded POST, JSON reply with
+a `matches` list that only flags the typo "teh") over HTTP/1.1 keep-alive. `delay` simulates server
+work per request; with `throttle_every` every n-th check is answered with
+429 and `Retry-After: retry_after`, like the public API's rate limit.
+"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+def _typos(text: str) -> list:
+    """Flag every "teh" so offset handling can be checked end to end."""
+    matches = []
+    for m in re.finditer(r"\bteh\b", text):
+        matches.append({
+            "message": "Possible spelling mistake found.",
+            "offset": m.start(),
+            "length": 3,
+            "replacements": [{"value": "the"}],
+            "rule": {"id": "MORFOLOGIK_RULE_EN_US"},
+        })
+    return matches
+
+
+def _handler(delay: float, throttle_every: int = 0, retry_after: int = 1):
+    import itertools
+    import time
+
+    counter = itertools.count(1)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, payload: dict) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._reply([{"name": "English (US)", "code": "en", "longCode": "en-US"}])
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            form = parse_qs(self.rfile.read(length).decode("utf-8"))
+            if throttle_every and next(counter) % throttle_every == 0:
+                body = b'{"message": "Too many requests"}'
+                self.send_response(429)
+                self.send_header("Retry-After", str(retry_after))
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if delay:
+                time.sleep(delay)
+            if "data" in form:
+                parts = json.loads(form["data"][0]).get("annotation", [])
+                text = "".join(p.get("text", p.get("markup", "")) for p in parts)
+            else:
+                text = form.get("text", [""])[0]
+            self._reply({"software": {"name": "stand-in"}, "language": {"code": "en-US"},
+                         "matches": _typos(text)})
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # room for many concurrent clients connecting at once
+
+
+class StandInServer:
+    def __init__(self, delay: float = 0.0, throttle_every: int = 0, retry_after: int = 1):
+        self.httpd = _Server(("127.0.0.1", 0), _handler(delay, throttle_every, retry_after))
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v2/check"
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,143 @@
+import threading
+import time
+from typing import Callable, List
+
+ONLINE = "online"
+OFFLINE = "offline"
+UNKNOWN = "unknown"
+
+# Active probing while offline: first retry after PROBE_MIN_DELAY seconds,
+# doubling up to PROBE_MAX_DELAY.
+PROBE_MIN_DELAY = 5.0
+PROBE_MAX_DELAY = 300.0
+PROBE_TIMEOUT = 2.0
+# close() waits this long for a probe in flight, then leaves the daemon thread behind
+CLOSE_TIMEOUT = 0.2
+
+
+class ConnectivityMonitor:
+    """
+    Shared LanguageTool reachability status.
+
+    The status is inferred passively from real requests: the client calls
+    `report(ok)` after each one. A background thread probes actively only
+    before the first outcome is known and while offline, backing off
+    exponentially between probes; while online nothing is sent.
+
+    Listeners registered with `subscribe` get the new status on every change,
+    on whichever thread observed it.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[float], bool],
+        min_delay: float = PROBE_MIN_DELAY,
+        max_delay: float = PROBE_MAX_DELAY,
+        timeout: float = PROBE_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._probe = probe
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._status = UNKNOWN
+        self._listeners: List[Callable[[str], None]] = []
+        self._delay = min_delay
+        self._next_probe = clock()
+        self._probe_requested = False
+        self._thread = None
+        self._closed = False
+        self.probes = 0
+
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @property
+    def online(self) -> bool:
+        """False only once LanguageTool is known to be unreachable."""
+        return self._status != OFFLINE
+
+    def subscribe(self, listener: Callable[[str], None]) -> None:
+        with self._cond:
+            self._listeners.append(listener)
+
+    def start(self) -> None:
+        """Start the probing thread (the first probe runs right away if the status is unknown)."""
+        with self._cond:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(target=self._run, name="lt-connectivity", daemon=True)
+            self._thread.start()
+
+    def report(self, ok: bool) -> None:
+        """Outcome of a real LanguageTool request."""
+        self._set(ONLINE if ok else OFFLINE)
+
+    def probe_now(self) -> None:
+        """Ask for an immediate probe regardless of the current status."""
+        with self._cond:
+            self._probe_requested = True
+            self._cond.notify()
+
+    def _set(self, status: str, retry_in: float = 0.0) -> None:
+        with self._cond:
+            if status == OFFLINE:
+                if retry_in:
+                    self._next_probe = self._clock() + retry_in
+                elif self._status != OFFLINE:
+                    self._delay = self.min_delay
+                    self._next_probe = self._clock() + self._delay
+            else:
+                self._next_probe = None
+            changed = status != self._status
+            self._status = status
+            listeners = list(self._listeners) if changed else []
+            self._cond.notify()
+        for listener in listeners:
+            listener(status)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not self._probe_requested:
+                    if self._next_probe is not None:
+                        wait = self._next_probe - self._clock()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+                self._probe_requested = False
+                delay = self._delay
+
+            try:
+                ok = bool(self._probe(self.timeout))
+            except Exception:
+                ok = False
+            with self._cond:
+                if self._closed:
+                    return
+                self.probes += 1
+                if not ok:
+                    self._delay = min(delay * 2, self.max_delay)
+            if ok:
+                self._set(ONLINE)
+            else:
+                self._set(OFFLINE, retry_in=delay)
+
+    def close(self, timeout: float = CLOSE_TIMEOUT) -> None:
+        """
+        Stop probing. Does not wait out a probe in flight beyond `timeout`: the
+        thread is a daemon and drops the probe's result once closed.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
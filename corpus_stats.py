@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Vocabulary usage and tense statistics over large text corpora.
+
+The corpus is split into sentences: a line break or . ! ? followed by a
+space ends one. For each sentence the report counts which vocabulary items
+it uses and which tenses it is consistent with. It also counts how the
+sentences using each item spread over the tenses.
+
+- Item matching uses the rules of `used_word_in_sentence`: PhraseMatcher
+  compiles the whole vocabulary, so each sentence is matched once rather
+  than once per item.
+- Tense matching uses the verdicts of `tense_heuristic_ok`, computed once
+  per sentence from the same tokens.
+
+    python corpus_stats.py corpus.txt [more.txt ...] [--vocab vocab.json] [-j N]
+
+The files are cut into newline-aligned shards of a few MB and handed out
+to a process pool as (path, start, end) ranges. Each worker memory-maps
+the file and reads its range straight from the page cache, so the corpus
+is never copied between processes. Each worker returns a small
+CorpusStats. The shard results are then merged with a reduce step, so
+memory depends on the vocabulary size and not on the corpus size.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import reduce
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from grammar_online import TENSES, _classify_tokens, _tokens
+from phrase_matcher import PhraseMatcher
+
+SHARD_BYTES = 8 << 20
+SHARDS_PER_WORKER = 4  # smaller shards than strictly needed, so workers finish together
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+Shard = Tuple[str, int, int]
+
+
+@dataclass
+class CorpusStats:
+    sentences: int = 0
+    tokens: int = 0
+    tenses: Counter = field(default_factory=Counter)        # sentences consistent with the tense
+    unclassified: int = 0                                   # sentences consistent with none
+    uses: Counter = field(default_factory=Counter)          # occurrences of each item
+    sentence_hits: Counter = field(default_factory=Counter)  # sentences using the item
+    item_tenses: Dict[str, Counter] = field(default_factory=dict)
+
+    def merge(self, other: "CorpusStats") -> "CorpusStats":
+        """Add `other` into this one (the reduce step); returns self."""
+        self.sentences += other.sentences
+        self.tokens += other.tokens
+        self.tenses.update(other.tenses)
+        self.unclassified += other.unclassified
+        self.uses.update(other.uses)
+        self.sentence_hits.update(other.sentence_hits)
+        for item, c in other.item_tenses.items():
+            mine = self.item_tenses.get(item)
+            if mine is None:
+                self.item_tenses[item] = c
+            else:
+                mine.update(c)
+        return self
+
+    def add_sentence(self, sentence: str, matcher: PhraseMatcher) -> None:
+        toks = _tokens(sentence)
+        if not toks:
+            return
+        self.sentences += 1
+        self.tokens += len(toks)
+
+        tenses = [t for t, (ok, _msg) in _classify_tokens(toks).items() if ok]
+        if tenses:
+            self.tenses.update(tenses)
+        else:
+            self.unclassified += 1
+
+        used = Counter(k for k, _s, _e in matcher.scan_tokens(toks))
+        if not used:
+            return
+        self.uses.update(used)
+        self.sentence_hits.update(used.keys())
+        for item in used:
+            c = self.item_tenses.get(item)
+            if c is None:
+                c = self.item_tenses[item] = Counter()
+            c.update(tenses)
+
+    def to_dict(self) -> dict:
+        return {
+            "sentences": self.sentences,
+            "tokens": self.tokens,
+            "tenses": {t: self.tenses[t] for t in TENSES},
+            "unclassified": self.unclassified,
+            "items": {
+                item: {
+                    "uses": self.uses[item],
+                    "sentences": n,
+                    "tenses": dict(self.item_tenses.get(item, Counter()).most_common()),
+                }
+                for item, n in self.sentence_hits.most_common()
+            },
+        }
+
+
+def shards(path: Path, shard_bytes: int = SHARD_BYTES) -> List[Shard]:
+    """Byte ranges of roughly shard_bytes each, every one ending after a newline (or at EOF)."""
+    size = path.stat().st_size
+    if not size:
+        return []
+    out = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = min(start + shard_bytes, size)
+            if end < size:
+                nl = mm.find(b"\n", end)
+                end = size if nl < 0 else nl + 1
+            out.append((str(path), start, end))
+            start = end
+    return out
+
+
+def _lines(mm: mmap.mmap, start: int, end: int) -> Iterator[str]:
+    pos = start
+    while pos < end:
+        nl = mm.find(b"\n", pos, end)
+        stop = end if nl < 0 else nl + 1
+        yield mm[pos:stop].decode("utf-8", errors="replace")
+        pos = stop
+
+
+def sentences_in(line: str) -> List[str]:
+    return [s for s in _SENTENCE_END.split(line.strip()) if s]
+
+
+_matcher: Optional[PhraseMatcher] = None
+
+
+def _init_worker(words: List[str]) -> None:
+    global _matcher
+    _matcher = PhraseMatcher(words)
+    _matcher.scan_tokens(())  # compile once, before the first shard
+
+
+def _analyze_shard(shard: Shard) -> CorpusStats:
+    path, start, end = shard
+    stats = CorpusStats()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in _lines(mm, start, end):
+            for sentence in sentences_in(line):
+                stats.add_sentence(sentence, _matcher)
+    return stats
+
+
+def analyze(
+    paths: List[Path],
+    words: List[str],
+    processes: Optional[int] = None,
+    shard_bytes: Optional[int] = None,
+) -> CorpusStats:
+    """Statistics for all files; shards run on `processes` workers (default: all cores)."""
+    words = [w for w in dict.fromkeys(words) if w]
+    processes = processes or os.cpu_count() or 1
+    if shard_bytes is None:
+        total = sum(p.stat().st_size for p in paths)
+        shard_bytes = max(1 << 16, min(SHARD_BYTES, total // (processes * SHARDS_PER_WORKER) + 1))
+    work = [s for p in paths for s in shards(p, shard_bytes)]
+    with Pool(processes, _init_worker, (words,)) as pool:
+        return reduce(CorpusStats.merge, pool.imap_unordered(_analyze_shard, work), CorpusStats())
+
+
+def _vocab_words(path: Optional[Path]) -> List[str]:
+    from storage import load_vocab
+
+    return [it.get("en", "") for it in load_vocab(path)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Vocabulary usage frequency and tense distribution of text corpora.")
+    parser.add_argument("corpus", nargs="+", type=Path, help="UTF-8 text files")
+    parser.add_argument("--vocab", type=Path, default=None,
+                        help="vocabulary file (default: the app's vocab.json with its change log)")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--top", type=int, default=30, help="items to list (default: 30)")
+    parser.add_argument("--json", type=Path, metavar="FILE", help="write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    words = _vocab_words(args.vocab)
+    t0 = time.perf_counter()
+    stats = analyze(args.corpus, words, processes=args.processes)
+    elapsed = time.perf_counter() - t0
+    size = sum(p.stat().st_size for p in args.corpus)
+
+    print(f"{stats.sentences} sentences, {stats.tokens} tokens, "
+          f"{size / 2**20:.1f}MB in {elapsed:.1f}s ({size / 2**20 / max(elapsed, 1e-6):.1f}MB/s)")
+    print()
+    print("sentences consistent with each tense:")
+    for tense in TENSES:
+        n = stats.tenses[tense]
+        print(f"{n:10d}  {n / max(stats.sentences, 1):6.1%}  {tense}")
+    print(f"{stats.unclassified:10d}  {stats.unclassified / max(stats.sentences, 1):6.1%}  (none)")
+    print()
+    used = len(stats.sentence_hits)
+    vocab = len(set(w for w in words if w))
+    print(f"items used: {used}/{vocab}")
+    print(f"{'sentences':>10} {'uses':>8}  {'main tense':<26} item")
+    for item, n in stats.sentence_hits.most_common(args.top):
+        tenses = stats.item_tenses.get(item)
+        main_tense = tenses.most_common(1)[0][0] if tenses else "-"
+        print(f"{n:10d} {stats.uses[item]:8d}  {main_tense:<26} {item}")
+
+    if args.json:
+        with args.json.open("w", encoding="utf-8") as f:
+            json.dump(stats.to_dict(), f, ensure_ascii=False, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Скомпилированная колода: бинарный файл только для чтения, открываемый через mmap.
+
+Файл содержит таблицу строк, записи слов, индекс тем и готовые индексы
+переводов (как у VocabIndex), поэтому при открытии ничего не разбирается:
+слова и переводы читаются прямо из отображённых страниц, а несколько копий
+приложения делят одни и те же страницы.
+
+    python deck.py compile [vocab.json | --seed] [out.deck]
+
+Формат (все числа — u32 little-endian, секции выровнены по 4 байта):
+
+    magic "MTHDECK1" | заголовок из _HEADER_FIELDS
+    strings   2 * n_strings   (смещение, длина) в blob
+    words     9 * n_words     topic, en, ru, en_norm, ru_norm,
+                              en_var_start, en_var_count, ru_var_start, ru_var_count
+    varlist   id строк вариантов
+    topics    3 * n_topics    имя, начало и длина в topic_words (по имени)
+    topic_words               id слов, сгруппированные по темам
+    ru_keys   3 * n           вариант RU, начало и длина в ru_vals (по байтам ключа)
+    ru_vals                   id en_norm
+    en_keys   3 * n           вариант EN, начало и длина в en_vals
+    en_vals                   id вариантов RU
+    blob                      UTF-8 строк
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from vocab_index import ALL_TOPICS, Entry, _extract_variants, _norm, sample_excluding
+
+MAGIC = b"MTHDECK1"
+_HEADER_FIELDS = (
+    "n_strings", "n_words", "n_topics", "n_ru_keys", "n_en_keys",
+    "strings", "words", "varlist", "topics", "topic_words",
+    "ru_keys", "ru_vals", "en_keys", "en_vals", "blob", "blob_len",
+)
+_HEADER = struct.Struct("<" + "I" * len(_HEADER_FIELDS))
+_WORD = 9
+
+
+def compile_deck(items: Iterable[dict], out: Path) -> int:
+    """Собрать колоду из слов (dict или Entry); возвращает число слов"""
+    strings: dict[str, int] = {}
+    blob = bytearray()
+    str_index = array("I")
+
+    def sid(s: str) -> int:
+        i = strings.get(s)
+        if i is None:
+            data = s.encode("utf-8")
+            i = strings[s] = len(str_index) // 2
+            str_index.extend((len(blob), len(data)))
+            blob.extend(data)
+        return i
+
+    words = array("I")
+    varlist = array("I")
+    by_topic: dict[str, list[int]] = {}
+    ru_to_en: dict[str, set[str]] = {}
+    en_to_ru: dict[str, set[str]] = {}
+
+    entries = [Entry.from_item(it) for it in items]
+    for wid, e in enumerate(entries):
+        en_start = len(varlist)
+        varlist.extend(sid(v) for v in e.en_variants)
+        ru_start = len(varlist)
+        varlist.extend(sid(v) for v in e.ru_variants)
+        words.extend((
+            sid(e.topic), sid(e.en), sid(e.ru), sid(e.en_norm), sid(e.ru_norm),
+            en_start, len(e.en_variants), ru_start, len(e.ru_variants),
+        ))
+        by_topic.setdefault(e.topic, []).append(wid)
+        for v in e.ru_variants:
+            ru_to_en.setdefault(v, set()).add(e.en_norm)
+        for v in e.en_variants:
+            en_to_ru.setdefault(v, set()).update(e.ru_variants)
+
+    topics = array("I")
+    topic_words = array("I")
+    for name in sorted(by_topic):
+        ids = by_topic[name]
+        topics.extend((sid(name), len(topic_words), len(ids)))
+        topic_words.extend(ids)
+
+    def build_index(idx: dict[str, set[str]]) -> tuple[array, array]:
+        keys, vals = array("I"), array("I")
+        for k in sorted(idx, key=lambda s: s.encode("utf-8")):
+            vs = sorted(idx[k])
+            keys.extend((sid(k), len(vals), len(vs)))
+            vals.extend(sid(v) for v in vs)
+        return keys, vals
+
+    ru_keys, ru_vals = build_index(ru_to_en)
+    en_keys, en_vals = build_index(en_to_ru)
+
+    sections = [str_index, words, varlist, topics, topic_words, ru_keys, ru_vals, en_keys, en_vals]
+    if sys.byteorder != "little":
+        for a in sections:
+            a.byteswap()
+
+    offsets = []
+    pos = len(MAGIC) + _HEADER.size
+    for a in sections:
+        offsets.append(pos)
+        pos += len(a) * a.itemsize
+    header = _HEADER.pack(
+        len(str_index) // 2, len(entries), len(topics) // 3,
+        len(ru_keys) // 3, len(en_keys) // 3, *offsets, pos, len(blob),
+    )
+
+    out = Path(out)
+    tmp = out.with_name(out.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(MAGIC)
+        f.write(header)
+        for a in sections:
+            a.tofile(f)
+        f.write(blob)
+    os.replace(tmp, out)
+    return len(entries)
+
+
+class CompiledDeck:
+    """
+    Колода из файла compile_deck, открытая через mmap.
+
+    Интерфейс источника карточек как у TopicIndex / VocabDB
+    (topics / count / items / sample) и переводов как у VocabIndex.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path}: не файл колоды")
+        h = dict(zip(_HEADER_FIELDS, _HEADER.unpack_from(self._mm, len(MAGIC))))
+        if sys.byteorder != "little":
+            raise ValueError("колоды читаются только на little-endian платформах")
+
+        view = self._view = memoryview(self._mm)
+        ends = [h[k] for k in _HEADER_FIELDS[6:15]]
+
+        def u32(name: str, end: int) -> memoryview:
+            return view[h[name]:end].cast("I")
+
+        (self._strings, self._words, self._varlist, self._topics, self._topic_words,
+         self._ru_keys, self._ru_vals, self._en_keys, self._en_vals) = (
+            u32(name, end) for name, end in zip(_HEADER_FIELDS[5:14], ends)
+        )
+        self._blob = view[h["blob"]:h["blob"] + h["blob_len"]]
+        self._n_topics = h["n_topics"]
+        self._topic_pos = {self._str(self._topics[3 * i]): i for i in range(self._n_topics)}
+
+    # --- чтение строк и слов ---
+
+    def _bytes(self, i: int) -> bytes:
+        off, n = self._strings[2 * i], self._strings[2 * i + 1]
+        return bytes(self._blob[off:off + n])
+
+    def _str(self, i: int) -> str:
+        return self._bytes(i).decode("utf-8")
+
+    def _vars(self, start: int, n: int) -> tuple[str, ...]:
+        return tuple(self._str(self._varlist[j]) for j in range(start, start + n))
+
+    def _entry(self, wid: int) -> Entry:
+        w = self._words[_WORD * wid:_WORD * wid + _WORD]
+        topic = sys.intern(self._str(w[0]))
+        return Entry(
+            topic=topic,
+            en=self._str(w[1]),
+            ru=self._str(w[2]),
+            topic_norm=sys.intern(_norm(topic)),
+            en_norm=self._str(w[3]),
+            ru_norm=self._str(w[4]),
+            en_variants=self._vars(w[5], w[6]),
+            ru_variants=self._vars(w[7], w[8]),
+        )
+
+    # --- источник карточек ---
+
+    def topics(self) -> list[str]:
+        return list(self._topic_pos)
+
+    def _span(self, topic: str) -> tuple[int, int]:
+        i = self._topic_pos.get(topic)
+        if i is None:
+            return 0, 0
+        return self._topics[3 * i + 1], self._topics[3 * i + 2]
+
+    def count(self, topic: str = ALL_TOPICS) -> int:
+        if topic == ALL_TOPICS:
+            return len(self._topic_words)
+        return self._span(topic)[1]
+
+    def items(self, topic: str = ALL_TOPICS) -> list[Entry]:
+        if topic == ALL_TOPICS:
+            start, n = 0, len(self._topic_words)
+        else:
+            start, n = self._span(topic)
+        return [self._entry(self._topic_words[j]) for j in range(start, start + n)]
+
+    def sample(self, topic: str, k: int,
+               exclude: Optional[Callable[[Entry], bool]] = None) -> list[Entry]:
+        if topic == ALL_TOPICS:
+            start, n = 0, len(self._topic_words)
+        else:
+            start, n = self._span(topic)
+        return sample_excluding(n, lambda j: self._entry(self._topic_words[start + j]), k, exclude)
+
+    # --- переводы ---
+
+    def _lookup(self, keys: memoryview, vals: memoryview, key: str) -> set[str]:
+        target = key.encode("utf-8")
+        lo, hi = 0, len(keys) // 3
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._bytes(keys[3 * mid]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(keys) // 3 or self._bytes(keys[3 * lo]) != target:
+            return set()
+        start, n = keys[3 * lo + 1], keys[3 * lo + 2]
+        return {self._str(vals[j]) for j in range(start, start + n)}
+
+    def en_for_ru(self, ru_text: str) -> set[str]:
+        out: set[str] = set()
+        for v in _extract_variants(ru_text):
+            out |= self._lookup(self._ru_keys, self._ru_vals, v)
+        return out
+
+    def ru_for_en(self, en_text: str) -> set[str]:
+        out: set[str] = set()
+        for v in _extract_variants(en_text):
+            out |= self._lookup(self._en_keys, self._en_vals, v)
+        return out
+
+    def translations(self, prompt: str, mode: str) -> set[str]:
+        if mode == "RU_TO_EN":
+            return self.en_for_ru(prompt)
+        return self.ru_for_en(prompt)
+
+    def close(self) -> None:
+        for name in ("_strings", "_words", "_varlist", "_topics", "_topic_words",
+                     "_ru_keys", "_ru_vals", "_en_keys", "_en_vals", "_blob", "_view"):
+            getattr(self, name).release()
+        self._mm.close()
+
+
+def is_fresh(deck: Path, *sources: Path) -> bool:
+    """Колода есть и не старше ни одного из существующих исходных файлов"""
+    if not deck.exists():
+        return False
+    mtime = deck.stat().st_mtime
+    return all(not s.exists() or s.stat().st_mtime <= mtime for s in sources)
+
+
+def main(argv: list[str] = None) -> int:
+    from storage import deck_path, load_vocab, vocab_path
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "compile" or len(argv) > 3:
+        print("usage: python deck.py compile [vocab.json | --seed] [out.deck]", file=sys.stderr)
+        return 2
+    src = argv[1] if len(argv) > 1 else str(vocab_path())
+    out = Path(argv[2]) if len(argv) > 2 else deck_path()
+    if src == "--seed":
+        from words_seed import SEED_WORDS
+        items = SEED_WORDS
+    else:
+        items = load_vocab(Path(src))
+    n = compile_deck(items, out)
+    print(f"{out}: {n} words, {out.stat().st_size} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
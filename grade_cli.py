@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Headless batch grader: JSONL sentences in, JSONL SentenceCheckResult out.
+
+Every input line is a record `{"sentence": ..., "word": ..., "tense": ...}`.
+Each output line holds the fields of its SentenceCheckResult and the
+input line number. A line that cannot be graded gets
+`{"line": n, "error": ...}` instead; when the cause was LanguageTool (a
+network error, timeout or rate limit) rather than the record, the line is
+`{"line": n, "error": ..., "retry": true}`. Blank lines are skipped, so
+output line k always belongs to the k-th input record.
+
+    python grade_cli.py answers.jsonl -o graded.jsonl [--grammar languagetool]
+
+Records are graded in chunks on a process pool:
+
+- grammar "local" (the default) runs check_grammar_offline, which uses
+  cached LanguageTool results and then the local rules;
+- grammar "languagetool" sends one LanguageTool request per chunk and
+  tense through check_sentences_batch, split so that no request exceeds
+  MAX_BATCH_CHARS.
+
+At most a few chunks per worker are in flight at any time. Results are
+written in input order and flushed chunk by chunk. Memory therefore does
+not grow with the size of the input.
+
+Progress is the output file itself. When an interrupted run is restarted
+with the same arguments, it skips as many input records as the output
+already holds and appends the rest. A torn last line is dropped first, and
+so is everything from the first "retry" record on, so records that
+LanguageTool failed to check are graded again. Use --overwrite to start over.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import asdict
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import grammar_online
+from grammar_online import (
+    TENSES,
+    LanguageToolClient,
+    batch_ranges,
+    check_sentence,
+    check_sentences_batch,
+    grammar_failed,
+)
+
+GRAMMAR_BACKENDS = ("local", "languagetool")
+DEFAULT_CHUNK = 500
+CHUNKS_PER_WORKER = 2  # in flight per worker: one running, one queued
+
+_grammar = "local"
+
+# how a retry record looks in the output (json.dumps spacing); inside a JSON
+# string the quotes would be escaped, so only the key itself can match
+_RETRY_MARK = b'"retry": true'
+
+
+def _init_worker(grammar: str, endpoint: Optional[str], use_cache: bool) -> None:
+    global _grammar
+    _grammar = grammar
+    if not use_cache:
+        grammar_online.set_cache(None)
+    if endpoint:
+        grammar_online.set_client(LanguageToolClient(endpoint=endpoint))
+
+
+def _parse(line: str) -> Tuple[str, str, str]:
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+    fields = []
+    for name in ("sentence", "word", "tense"):
+        if name not in record:
+            raise ValueError(f"missing field {name!r}")
+        value = record[name]
+        if not isinstance(value, str):
+            raise ValueError(f"field {name!r} is not a string")
+        if not value.strip():
+            raise ValueError(f"field {name!r} is empty")
+        fields.append(value)
+    if fields[2] not in TENSES:
+        raise ValueError(f"unknown tense {fields[2]!r}")
+    return tuple(fields)
+
+
+def _grade_chunk(chunk: List[Tuple[int, str]]) -> Tuple[str, int, int, int]:
+    """
+    Grade (line number, line) pairs; returns the output text and the counts
+    of correct, invalid and failed (to be retried) records.
+    """
+    out: List[Optional[dict]] = [None] * len(chunk)
+    by_tense: Dict[str, List[int]] = {}
+    parsed: List[Optional[Tuple[str, str, str]]] = []
+    for i, (n, line) in enumerate(chunk):
+        try:
+            parsed.append(_parse(line))
+        except ValueError as e:  # JSONDecodeError included
+            parsed.append(None)
+            out[i] = {"line": n, "error": str(e)}
+            continue
+        by_tense.setdefault(parsed[i][2], []).append(i)
+
+    for tense, idx in by_tense.items():
+        sentences = [parsed[i][0] for i in idx]
+        words = [parsed[i][1] for i in idx]
+        if _grammar == "languagetool":
+            # one request per range: a chunk over MAX_BATCH_CHARS must not fan out per sentence
+            results = []
+            for a, b in batch_ranges(sentences):
+                results += check_sentences_batch(sentences[a:b], words[a:b], tense)
+        else:
+            results = [
+                check_sentence(s, w, tense, offline=True) for s, w in zip(sentences, words)
+            ]
+        for i, result in zip(idx, results):
+            if grammar_failed(result.matches):
+                # LanguageTool was not reached: not a verdict, grade it again on resume
+                out[i] = {"line": chunk[i][0], "error": result.matches[0]["message"], "retry": True}
+            else:
+                out[i] = {"line": chunk[i][0], **asdict(result)}
+
+    correct = sum(1 for r in out if r.get("ok"))
+    failed = sum(1 for r in out if r.get("retry"))
+    invalid = sum(1 for r in out if "error" in r) - failed
+    text = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in out)
+    return text, correct, invalid, failed
+
+
+def completed_lines(path: Path) -> int:
+    """
+    Number of finished records in an earlier output. The file is cut after
+    them: a torn last line and everything from the first "retry" record on.
+    """
+    if not path.exists():
+        return 0
+    with open(path, "rb+") as f:
+        count = 0
+        end = 0  # offset just past the last finished record
+        for line in f:
+            if not line.endswith(b"\n") or _RETRY_MARK in line:
+                break
+            count += 1
+            end += len(line)
+        f.seek(0, os.SEEK_END)
+        if end != f.tell():
+            f.truncate(end)
+    return count
+
+
+def _records(stream, skip: int) -> Iterator[Tuple[int, str]]:
+    """(1-based line number, line) for every non-blank input line after the first `skip`."""
+    numbered = ((n, line) for n, line in enumerate(stream, 1) if line.strip())
+    return itertools.islice(numbered, skip, None)
+
+
+def _chunks(records: Iterator[Tuple[int, str]], size: int) -> Iterator[List[Tuple[int, str]]]:
+    while True:
+        chunk = list(itertools.islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def grade_file(
+    source,
+    output: Path,
+    grammar: str = "local",
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK,
+    endpoint: Optional[str] = None,
+    use_cache: bool = True,
+    overwrite: bool = False,
+    progress=None,
+) -> Dict[str, int]:
+    """
+    Grade the JSONL records read from `source` (a text stream) into `output`.
+    Returns counts for this run: records, correct, invalid, failed (LanguageTool
+    could not check them; rerun to retry) and skipped (already graded).
+    """
+    if grammar not in GRAMMAR_BACKENDS:
+        raise ValueError(f"unknown grammar backend {grammar!r}")
+    if overwrite and output.exists():
+        output.unlink()
+    skip = completed_lines(output)
+    processes = processes or os.cpu_count() or 1
+    counts = {"records": 0, "correct": 0, "invalid": 0, "failed": 0, "skipped": skip}
+
+    def write(pending) -> None:
+        n, result = pending
+        text, correct, invalid, failed = result.get()
+        out.write(text)
+        out.flush()
+        counts["records"] += n
+        counts["correct"] += correct
+        counts["invalid"] += invalid
+        counts["failed"] += failed
+        if progress is not None:
+            progress(counts)
+
+    limit = processes * CHUNKS_PER_WORKER
+    with Pool(processes, _init_worker, (grammar, endpoint, use_cache)) as pool, \
+            open(output, "a", encoding="utf-8") as out:
+        in_flight: deque = deque()
+        # the input is read only as fast as results are written out
+        for chunk in _chunks(_records(source, skip), chunk_size):
+            if len(in_flight) >= limit:
+                write(in_flight.popleft())
+            in_flight.append((len(chunk), pool.apply_async(_grade_chunk, (chunk,))))
+        while in_flight:
+            write(in_flight.popleft())
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Grade JSONL {sentence, word, tense} records into JSONL check results.")
+    parser.add_argument("input", help="input JSONL file, or - for stdin")
+    parser.add_argument("-o", "--output", required=True, type=Path,
+                        help="output JSONL file; an existing one is resumed")
+    parser.add_argument("--grammar", choices=GRAMMAR_BACKENDS, default="local",
+                        help="grammar backend (default: local rules and cached results)")
+    parser.add_argument("--lt-url", metavar="URL",
+                        help="LanguageTool /v2/check endpoint, e.g. a local server")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK,
+                        help=f"records per work unit (default: {DEFAULT_CHUNK})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="do not read or write the grammar result cache")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="discard an existing output instead of resuming it")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+
+    def progress(counts: Dict[str, int]) -> None:
+        rate = counts["records"] / (time.perf_counter() - t0)
+        print(f"\r{counts['skipped'] + counts['records']} graded ({rate:.0f}/s)",
+              end="", file=sys.stderr, flush=True)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        counts = grade_file(
+            source, args.output, grammar=args.grammar, processes=args.processes,
+            chunk_size=args.chunk, endpoint=args.lt_url, use_cache=not args.no_cache,
+            overwrite=args.overwrite, progress=None if args.quiet else progress,
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    if not args.quiet:
+        print(file=sys.stderr)
+        print(f"{counts['records']} graded in {time.perf_counter() - t0:.1f}s, "
+              f"{counts['skipped']} already done; {counts['correct']} correct, "
+              f"{counts['invalid']} invalid records", file=sys.stderr)
+        if counts["failed"]:
+            print(f"{counts['failed']} records could not be checked by LanguageTool; "
+                  f"run again to retry them", file=sys.stderr)
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Asyncio interface to the grammar layer, for batch grading without the GUI.
+
+This is not a native async transport. `AsyncLanguageToolClient` runs the
+blocking, pooled `LanguageToolClient` (keep-alive sessions, retries on
+connection errors and 5xx) on a thread pool, one thread per request in
+flight, so its throughput is that of the threaded client at the same
+concurrency (see benchmarks/bench_async.py). What it adds is the asyncio
+API: a semaphore bounds the number of requests in flight, and a 429/503
+answer pauses every request to that host until its Retry-After has passed
+(at most MAX_RETRY_AFTER seconds). Grammar cache reads and writes are
+SQLite calls and also run off the event loop.
+
+`check_sentences_async` has the semantics of `check_sentences_batch`:
+cached sentences are answered locally and the rest are packed into
+annotated requests of at most `batch_size` sentences / MAX_BATCH_CHARS,
+sent concurrently.
+
+    async with AsyncLanguageToolClient(concurrency=16) as client:
+        results = await check_sentences_async(sentences, words, tenses, client)
+"""
+
+import asyncio
+import email.utils
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Union
+from urllib.parse import urlsplit
+
+from grammar_online import (
+    LT_ENDPOINT,
+    ClientStats,
+    GrammarBatch,
+    LanguageToolClient,
+    LTTimeout,
+    SentenceCheckResult,
+    batch_ranges,
+    build_results,
+    get_cache,
+)
+from grammar_cache import GrammarCache
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_BATCH_SIZE = 25
+MAX_RETRY_AFTER = 60.0  # a longer Retry-After is cut to this, so one answer cannot stall a batch
+RATE_LIMITED = (429, 503)
+
+_SHARED_CACHE = object()  # default for `cache=`: the shared grammar_online cache
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), clamped."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        delay = float(value)
+    else:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        delay = when.timestamp() - time.time()
+    return min(max(0.0, delay), MAX_RETRY_AFTER)
+
+
+class AsyncLanguageToolClient:
+    """
+    LanguageTool client for asyncio on top of `LanguageToolClient` (a thread
+    per request, not a non-blocking socket client).
+
+    Requests run on a thread pool of `concurrency` workers sharing one pooled
+    session, and at most `concurrency` of them are in flight at once. 429 and
+    503 answers are retried after Retry-After (or exponential backoff without
+    one), and the wait applies to all requests to that host, not only the one
+    that was throttled. Connection errors and other 5xx answers are retried by
+    the session itself.
+
+    `client` may be an existing LanguageToolClient created with
+    `retry_rate_limited=False`; by default one is created and closed here.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = LT_ENDPOINT,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = 4,
+        backoff: float = 0.5,
+        timeout: float = 10.0,
+        client: Optional[LanguageToolClient] = None,
+    ):
+        self._owns_client = client is None
+        if client is None:
+            client = LanguageToolClient(
+                endpoint, pool_size=concurrency, retries=retries, backoff=backoff,
+                timeout=timeout, retry_rate_limited=False,
+            )
+        self.client = client
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.rate_limited = 0
+        # not asyncio.to_thread: the default executor has only min(32, cpus + 4) workers
+        self._executor = ThreadPoolExecutor(concurrency, thread_name_prefix="grammar-async")
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._not_before: Dict[str, float] = {}  # host -> loop time before which no request starts
+
+    async def __aenter__(self) -> "AsyncLanguageToolClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    @property
+    def stats(self) -> ClientStats:
+        return self.client.stats
+
+    @property
+    def on_outcome(self) -> Optional[Callable[[bool], None]]:
+        return self.client.on_outcome
+
+    @on_outcome.setter
+    def on_outcome(self, callback: Optional[Callable[[bool], None]]) -> None:
+        self.client.on_outcome = callback
+
+    async def check(self, text: str, lang: str = "en-US") -> dict:
+        return await self._call(self.client.endpoint, self.client.check, text, lang)
+
+    async def check_annotated(self, annotation: List[dict], lang: str = "en-US") -> dict:
+        return await self._call(self.client.endpoint, self.client.check_annotated, annotation, lang)
+
+    async def languages(self) -> list:
+        return await self._call(self.client.languages_url, self.client.languages)
+
+    async def _call(self, url: str, fn: Callable, *args):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            wait = self._not_before.get(host, 0.0) - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            async with self._sem:
+                if self._not_before.get(host, 0.0) > loop.time():
+                    continue  # throttled while waiting for a slot
+                try:
+                    return await loop.run_in_executor(self._executor, fn, *args)
+                except LTTimeout:
+                    raise
+                except Exception as e:
+                    response = getattr(e, "response", None)
+                    if getattr(response, "status_code", None) not in RATE_LIMITED:
+                        raise
+                    if attempt >= self.retries:
+                        raise
+            self.rate_limited += 1
+            delay = _retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = self.backoff * (2 ** attempt)
+            self._not_before[host] = max(self._not_before.get(host, 0.0), loop.time() + delay)
+            attempt += 1
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        if self._owns_client:
+            self.client.close()
+
+
+async def check_grammar_batch_async(
+    client: AsyncLanguageToolClient,
+    sentences: List[str],
+    lang: str = "en-US",
+    cache: Optional[GrammarCache] = None,
+) -> List[List[dict]]:
+    """
+    `check_grammar_batch` over the async client: one request for the uncached
+    sentences. Cache lookups and writes run on the default executor.
+    """
+    loop = asyncio.get_running_loop()
+    if cache is None:
+        batch = GrammarBatch(sentences, lang)
+    else:
+        batch = await loop.run_in_executor(None, GrammarBatch, sentences, lang, cache)
+    if not batch.pending:
+        return batch.matches
+    try:
+        data = await client.check_annotated(batch.annotation, lang)
+    except Exception as e:
+        return batch.fail(e)
+    if cache is None:
+        return batch.finish(data)
+    return await loop.run_in_executor(None, batch.finish, data)
+
+
+async def check_sentences_async(
+    sentences: List[str],
+    words: List[str],
+    tenses: Union[str, Sequence[str]],
+    client: AsyncLanguageToolClient,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    cache=_SHARED_CACHE,
+) -> List[SentenceCheckResult]:
+    """
+    `check_sentences_batch` for any number of sentences: batches go out
+    concurrently (bounded by the client), results come back in input order.
+    `tenses` is one tense for all sentences or one per sentence.
+    """
+    if len(sentences) != len(words):
+        raise ValueError("sentences and words must have the same length")
+    if isinstance(tenses, str):
+        tenses = [tenses] * len(sentences)
+    elif len(tenses) != len(sentences):
+        raise ValueError("tenses must be a single tense or one per sentence")
+    if cache is _SHARED_CACHE:
+        cache = get_cache()
+
+    per_batch = await asyncio.gather(*(
+        check_grammar_batch_async(client, sentences[a:b], "en-US", cache)
+        for a, b in batch_ranges(sentences, batch_size)
+    ))
+    per_sentence = [m for batch in per_batch for m in batch]
+    return build_results(sentences, words, tenses, per_sentence)
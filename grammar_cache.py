@@ -0,0 +1,196 @@
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+def normalize_sentence(text: str) -> str:
+    """Cache key text: NFC, trimmed, internal whitespace collapsed. Case is kept (LT checks it)."""
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / total if total else 0.0
+
+
+class GrammarCache:
+    """
+    Two-tier cache of LanguageTool results: in-memory LRU in front of an
+    on-disk SQLite table, so repeated sentences never hit the network and
+    keep working offline.
+
+    Entries are keyed by (normalized text, language, rule-set version). The
+    rule-set version is the LanguageTool server version last seen in a
+    response; when the server is upgraded, older entries stop matching and
+    age out. Entries expire after `ttl` seconds; the disk table is trimmed to
+    `max_disk_entries` by least-recent use.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_memory_entries: int = 2048,
+        max_disk_entries: int = 100_000,
+        ttl: float = 30 * 24 * 3600,
+    ):
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[Tuple[str, str, str], Tuple[float, List[dict]]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._since_trim = 0
+        self.ruleset = ""
+
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS lt_cache ("
+                " text TEXT NOT NULL, lang TEXT NOT NULL, ruleset TEXT NOT NULL,"
+                " matches TEXT NOT NULL, created REAL NOT NULL, used REAL NOT NULL,"
+                " PRIMARY KEY (text, lang, ruleset))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS lt_cache_used ON lt_cache(used)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS lt_meta (k TEXT PRIMARY KEY, v TEXT)")
+            row = self._db.execute("SELECT v FROM lt_meta WHERE k = 'ruleset'").fetchone()
+            if row:
+                self.ruleset = row[0]
+
+    def _key(self, text: str, lang: str) -> Tuple[str, str, str]:
+        return normalize_sentence(text), lang, self.ruleset
+
+    def get(self, text: str, lang: str = "en-US") -> Optional[List[dict]]:
+        key = self._key(text, lang)
+        now = time.time()
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None:
+                created, matches = hit
+                if now - created <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return matches
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT matches, created FROM lt_cache WHERE text = ? AND lang = ? AND ruleset = ?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    if now - row[1] <= self.ttl:
+                        matches = json.loads(row[0])
+                        self._db.execute(
+                            "UPDATE lt_cache SET used = ? WHERE text = ? AND lang = ? AND ruleset = ?",
+                            (now, *key),
+                        )
+                        self._remember(key, row[1], matches)
+                        self.stats.disk_hits += 1
+                        return matches
+                    self._db.execute(
+                        "DELETE FROM lt_cache WHERE text = ? AND lang = ? AND ruleset = ?", key
+                    )
+                    self.stats.evictions += 1
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, text: str, matches: List[dict], lang: str = "en-US") -> None:
+        key = self._key(text, lang)
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, matches)
+            self.stats.stores += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO lt_cache (text, lang, ruleset, matches, created, used)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, json.dumps(matches, ensure_ascii=False), now, now),
+                )
+                self._since_trim += 1
+                if self._since_trim >= 256:
+                    self._trim_disk()
+
+    def _remember(self, key: Tuple[str, str, str], created: float, matches: List[dict]) -> None:
+        self._memory[key] = (created, matches)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _trim_disk(self) -> None:
+        self._since_trim = 0
+        cur = self._db.execute("DELETE FROM lt_cache WHERE created < ?", (time.time() - self.ttl,))
+        self.stats.evictions += max(cur.rowcount, 0)
+        (count,) = self._db.execute("SELECT COUNT(*) FROM lt_cache").fetchone()
+        extra = count - self.max_disk_entries
+        if extra > 0:
+            self._db.execute(
+                "DELETE FROM lt_cache WHERE rowid IN"
+                " (SELECT rowid FROM lt_cache ORDER BY used LIMIT ?)",
+                (extra,),
+            )
+            self.stats.evictions += extra
+
+    def note_ruleset(self, version: str) -> None:
+        """Record the LanguageTool version from a response; a change invalidates older entries."""
+        version = str(version or "")
+        if not version or version == self.ruleset:
+            return
+        with self._lock:
+            self.ruleset = version
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO lt_meta (k, v) VALUES ('ruleset', ?)", (version,)
+                )
+                self._db.execute("DELETE FROM lt_cache WHERE ruleset != ?", (version,))
+
+    def stats_dict(self) -> Dict[str, float]:
+        with self._lock:
+            st = self.stats
+            disk = 0
+            if self._db is not None:
+                (disk,) = self._db.execute("SELECT COUNT(*) FROM lt_cache").fetchone()
+            return {
+                "memory_hits": st.memory_hits,
+                "disk_hits": st.disk_hits,
+                "misses": st.misses,
+                "stores": st.stores,
+                "evictions": st.evictions,
+                "hit_rate": st.hit_rate,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM lt_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,240 @@
+"""
+Offline grammar backend: a small pluggable rule engine with the same
+interface as `check_grammar_language_tool` (sentence, lang) -> LT-style matches.
+
+It only knows a few high-signal learner mistakes (agreement, articles,
+auxiliary + verb form), so it is a fallback, not a replacement for LanguageTool.
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from morphology import IRREGULAR, LEXICON, word_forms
+
+
+class Token(NamedTuple):
+    text: str      # lower-cased, as produced by grammar_online._tokens
+    raw: str
+    start: int
+    end: int
+    sep: str = ""  # text between the previous token and this one
+
+
+Rule = Callable[[List[Token]], Iterable[dict]]
+
+RULES: List[Rule] = []
+
+
+def register_rule(rule: Rule) -> Rule:
+    """Add a rule to the engine (usable as a decorator)."""
+    RULES.append(rule)
+    return rule
+
+
+def _token_spans(text: str) -> List[Token]:
+    # same token definition as grammar_online._tokens, with offsets
+    toks: List[Token] = []
+    prev_end = 0
+    for m in re.finditer(r"[a-zA-Z']+", text):
+        toks.append(Token(m.group(0).lower(), m.group(0), m.start(), m.end(), text[prev_end:m.start()]))
+        prev_end = m.end()
+    return toks
+
+
+def _match(rule_id: str, message: str, tok: Token, replacements: Iterable[str] = (),
+           category: str = "GRAMMAR") -> dict:
+    return {
+        "message": message,
+        "shortMessage": "",
+        "offset": tok.start,
+        "length": tok.end - tok.start,
+        "replacements": [{"value": r} for r in replacements],
+        "rule": {"id": rule_id, "description": message, "category": {"id": category}},
+        "source": "local",
+    }
+
+
+def _keep_case(orig: str, repl: str) -> str:
+    return repl[:1].upper() + repl[1:] if orig[:1].isupper() else repl
+
+
+# --- verb tables built from IRREGULAR ---
+
+def _third_person(base: str) -> str:
+    if base in ("have",):
+        return "has"
+    if base.endswith("y") and len(base) > 2 and base[-2] not in "aeiou":
+        return base[:-1] + "ies"
+    if base.endswith(("s", "x", "z", "ch", "sh", "o")):
+        return base + "es"
+    return base + "s"
+
+
+def _split(forms: str) -> List[str]:
+    return [f.strip() for f in forms.split("/") if f.strip()]
+
+
+_V2_TO_BASE: Dict[str, str] = {}
+_V3_OF: Dict[str, str] = {}
+for _base, (_v2, _v3) in IRREGULAR.items():
+    for _f in _split(_v2):
+        _V2_TO_BASE.setdefault(_f, _base)
+    _V3_OF[_base] = _split(_v3)[0]
+
+# Past forms that are not also a valid base/participle ("went", not "read"/"put")
+_PAST_ONLY: Dict[str, str] = {
+    v2: base for v2, base in _V2_TO_BASE.items()
+    if v2 not in IRREGULAR and v2 not in LEXICON.v3_forms
+}
+
+# Past forms that are also a base verb or a noun: "I want to saw the plank", "a wheel spoke"
+_PAST_HOMOGRAPHS = frozenset({"saw", "fell", "spoke"}) | frozenset(LEXICON.verbs)
+
+_THIRD_TO_BASE: Dict[str, str] = {_third_person(b): b for b in IRREGULAR if b != "be"}
+
+# Base forms that can't be read as past tense ("he read" is fine, "he go" is not)
+_BARE_BASES = {b for b in IRREGULAR if b not in _V2_TO_BASE and b not in ("be", "have", "do")}
+
+_MODALS = {"will", "would", "can", "could", "shall", "should", "may", "might", "must"}
+_DO = {"do", "does", "did", "don't", "doesn't", "didn't"}
+_HAVE = {"have", "has", "had", "haven't", "hasn't", "hadn't",
+         "i've", "you've", "we've", "they've", "i'd", "you'd", "he'd", "she'd", "we'd", "they'd"}
+_AUX_BEFORE_SUBJECT = _MODALS | _DO | _HAVE | {"am", "is", "are", "was", "were"}
+# "do" forms that are never the main verb: "we do stands" is do + plural noun, "we don't stands" is not
+_DO_NEGATIVE = {"don't", "doesn't", "didn't"}
+# Joins coordinated subjects: "He and I are", "my brother or I have"
+_COORDINATORS = {"and", "or", "nor"}
+
+_THIRD = {"he", "she", "it"}
+
+# Verbs taking an object + bare infinitive: "let it go", "made him come"
+_BARE_INFINITIVE_VERBS = frozenset().union(
+    *(word_forms(v) for v in ("let", "make", "help", "see", "hear", "watch"))
+)
+
+# Agreement of very common auxiliaries: subject -> {wrong: right}
+_AGREEMENT: Dict[str, Dict[str, str]] = {
+    "i": {"is": "am", "are": "am", "has": "have", "does": "do", "doesn't": "don't"},
+    "he": {"am": "is", "are": "is", "have": "has", "do": "does", "don't": "doesn't"},
+    "you": {"am": "are", "is": "are", "was": "were", "has": "have", "does": "do", "doesn't": "don't"},
+}
+for _s in ("she", "it"):
+    _AGREEMENT[_s] = _AGREEMENT["he"]
+for _s in ("we", "they"):
+    _AGREEMENT[_s] = _AGREEMENT["you"]
+
+# Words where spelling and sound disagree for a/an
+_SILENT_H = ("hour", "honest", "honor", "honour", "heir")
+# "yoo"/"w" sounds: a unit, a unanimous vote, a ukulele, a utensil, a euro, a one-off
+_CONSONANT_SOUND_VOWEL = (
+    "unic", "unif", "unil", "unio", "uniq", "unis", "unit", "univ", "unan",
+    "use", "usu", "uk", "ura", "ure", "uri", "uro", "uten", "uti", "utop",
+    "eu", "ewe", "one", "once",
+)
+# Read either way depending on the word: a university, an uninvited guest
+_AMBIGUOUS_VOWEL = ("uni",)
+# Letters whose name starts with a vowel sound: an F, an SUV, an X-ray
+_VOWEL_LETTERS = set("aefhilmnorsx")
+
+
+def _word_vowel_sound(word: str) -> Optional[bool]:
+    """Whether a word read as a word starts with a vowel sound; None if unsure"""
+    if word.startswith(_SILENT_H):
+        return True
+    if word.startswith(_CONSONANT_SOUND_VOWEL):
+        return False
+    if word.startswith(_AMBIGUOUS_VOWEL):
+        return None
+    return word[0] in "aeiou"
+
+
+def _vowel_sound(tok: Token) -> Optional[bool]:
+    """Whether the token starts with a vowel sound; None if it could be read either way"""
+    word = tok.text
+    if len(word) == 1:
+        # a single letter is read by its name: a U-turn, an X-ray
+        return word in _VOWEL_LETTERS
+    if tok.raw.isupper():
+        # an initialism is read letter by letter (an FBI agent) or as a word (a NASA probe)
+        by_letter = word[0] in _VOWEL_LETTERS
+        return by_letter if by_letter == _word_vowel_sound(word) else None
+    return _word_vowel_sound(word)
+
+
+@register_rule
+def rule_articles(toks: List[Token]) -> Iterable[dict]:
+    for a, nxt in zip(toks, toks[1:]):
+        if a.text not in ("a", "an") or not nxt.text[:1].isalpha():
+            continue
+        vowel_sound = _vowel_sound(nxt)
+        if vowel_sound is None:
+            continue
+        if a.text == "a" and vowel_sound:
+            yield _match("LOCAL_EN_A_VS_AN", "Use “an” instead of “a” before a vowel sound.",
+                         a, [_keep_case(a.raw, "an")])
+        elif a.text == "an" and not vowel_sound:
+            yield _match("LOCAL_EN_A_VS_AN", "Use “a” instead of “an” before a consonant sound.",
+                         a, [_keep_case(a.raw, "a")])
+
+
+@register_rule
+def rule_agreement(toks: List[Token]) -> Iterable[dict]:
+    for i, (subj, verb) in enumerate(zip(toks, toks[1:])):
+        # questions/inversions ("Does he go", "Can she come") put the verb elsewhere
+        if i and toks[i - 1].text in _AUX_BEFORE_SUBJECT:
+            continue
+        # the last of several coordinated subjects doesn't choose the verb form
+        if (i and toks[i - 1].text in _COORDINATORS) or "," in subj.sep:
+            continue
+        fixes = _AGREEMENT.get(subj.text)
+        if fixes and verb.text in fixes:
+            yield _match("LOCAL_EN_AGREEMENT",
+                         f"The verb “{verb.raw}” does not agree with “{subj.raw}”.",
+                         verb, [_keep_case(verb.raw, fixes[verb.text])])
+        elif (subj.text in _THIRD and verb.text in _BARE_BASES
+              and not (i and toks[i - 1].text in _BARE_INFINITIVE_VERBS)):
+            yield _match("LOCAL_EN_AGREEMENT",
+                         f"Use the third-person form after “{subj.raw}”.",
+                         verb, [_third_person(verb.text)])
+
+
+@register_rule
+def rule_aux_verb_form(toks: List[Token]) -> Iterable[dict]:
+    for aux, verb in zip(toks, toks[1:]):
+        a, v = aux.text, verb.text
+        if a in _MODALS or a in _DO or a == "to":
+            if v in _PAST_ONLY and v not in _PAST_HOMOGRAPHS:
+                base = _PAST_ONLY[v]
+                yield _match("LOCAL_EN_AUX_BASE_FORM",
+                             f"After “{aux.raw}” use the base form of the verb.",
+                             verb, [base])
+            elif (a in _MODALS or a in _DO_NEGATIVE) and v in _THIRD_TO_BASE:
+                yield _match("LOCAL_EN_AUX_BASE_FORM",
+                             f"After “{aux.raw}” use the base form of the verb.",
+                             verb, [_THIRD_TO_BASE[v]])
+        elif a in _HAVE and v in _PAST_ONLY:
+            base = _PAST_ONLY[v]
+            yield _match("LOCAL_EN_PERFECT_PARTICIPLE",
+                         f"After “{aux.raw}” use the past participle.",
+                         verb, [_V3_OF[base]])
+
+
+@register_rule
+def rule_repeated_word(toks: List[Token]) -> Iterable[dict]:
+    for prev, tok in zip(toks, toks[1:]):
+        if tok.text == prev.text and tok.text not in ("had", "that"):
+            yield _match("LOCAL_EN_WORD_REPEAT", "Possible typo: you repeated a word.",
+                         tok, [], category="TYPOS")
+
+
+def check_grammar_local(sentence: str, lang: str = "en-US") -> List[dict]:
+    """
+    Local counterpart of `check_grammar_language_tool`: runs every registered
+    rule over the sentence and returns LanguageTool-shaped matches, in order.
+    """
+    toks = _token_spans(sentence)
+    matches: List[dict] = []
+    for rule in RULES:
+        matches.extend(rule(toks))
+    matches.sort(key=lambda m: m["offset"])
+    return matches
@@ -1,66 +1,23 @@
+import bisect
+import json
 import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Tuple, Dict, Set
+from typing import Callable, List, Tuple, Dict, Set, Optional, FrozenSet, Sequence, Union
 
-import requests
+from connectivity import ConnectivityMonitor
+from grammar_cache import GrammarCache, normalize_sentence
+from morphology import TENSE_V2_FORMS, TENSE_V3_FORMS, word_forms
+from storage import grammar_cache_path
 
 # Public LanguageTool API endpoint. [web:582]
 LT_ENDPOINT = "https://api.languagetool.org/v2/check"
 
 
-# --- Irregular verbs (base -> (V2, V3)) ---
-IRREGULAR: Dict[str, Tuple[str, str]] = {
-    "be": ("was/were", "been"),
-    "become": ("became", "become"),
-    "begin": ("began", "begun"),
-    "break": ("broke", "broken"),
-    "bring": ("brought", "brought"),
-    "build": ("built", "built"),
-    "buy": ("bought", "bought"),
-    "catch": ("caught", "caught"),
-    "choose": ("chose", "chosen"),
-    "come": ("came", "come"),
-    "do": ("did", "done"),
-    "drink": ("drank", "drunk"),
-    "drive": ("drove", "driven"),
-    "eat": ("ate", "eaten"),
-    "fall": ("fell", "fallen"),
-    "feel": ("felt", "felt"),
-    "find": ("found", "found"),
-    "fly": ("flew", "flown"),
-    "forget": ("forgot", "forgotten"),
-    "get": ("got", "got/gotten"),
-    "give": ("gave", "given"),
-    "go": ("went", "gone"),
-    "have": ("had", "had"),
-    "hear": ("heard", "heard"),
-    "know": ("knew", "known"),
-    "leave": ("left", "left"),
-    "lose": ("lost", "lost"),
-    "make": ("made", "made"),
-    "meet": ("met", "met"),
-    "pay": ("paid", "paid"),
-    "read": ("read", "read"),
-    "run": ("ran", "run"),
-    "say": ("said", "said"),
-    "see": ("saw", "seen"),
-    "sell": ("sold", "sold"),
-    "send": ("sent", "sent"),
-    "sit": ("sat", "sat"),
-    "sleep": ("slept", "slept"),
-    "speak": ("spoke", "spoken"),
-    "spend": ("spent", "spent"),
-    "stand": ("stood", "stood"),
-    "take": ("took", "taken"),
-    "teach": ("taught", "taught"),
-    "tell": ("told", "told"),
-    "think": ("thought", "thought"),
-    "understand": ("understood", "understood"),
-    "wear": ("wore", "worn"),
-    "write": ("wrote", "written"),
-}
-
-
 OPTIONAL_TOKENS = {
     "a", "an", "the",
     "to", "in", "on", "at", "of", "for", "with", "about", "from", "into",
@@ -94,45 +51,12 @@ def _tokens(text: str) -> List[str]:
     return re.findall(r"[a-zA-Z']+", text.lower())
 
 
-def _simple_forms(base: str) -> Set[str]:
+def _simple_forms(base: str) -> FrozenSet[str]:
     """
-    Generate a minimal set of common forms for simple word usage detection:
-    base, 3rd person, past, -ing, and irregular V2/V3 where known.
+    Common forms of the word for simple usage detection (see morphology.word_forms):
+    base, 3rd person/plural, past, -ing, comparatives, and irregular forms where known.
     """
-    b = _norm(base)
-    if not b:
-        return set()
-
-    forms = {b}
-
-    # 3rd person / plural
-    if b.endswith("y") and len(b) > 2 and b[-2] not in "aeiou":
-        forms.add(b[:-1] + "ies")
-    if b.endswith(("s", "x", "z", "ch", "sh")):
-        forms.add(b + "es")
-    forms.add(b + "s")
-
-    # past
-    if b.endswith("e"):
-        forms.add(b + "d")
-    else:
-        forms.add(b + "ed")
-
-    # -ing
-    if b.endswith("e") and not b.endswith("ee"):
-        forms.add(b[:-1] + "ing")
-    else:
-        forms.add(b + "ing")
-
-    # irregular
-    if b in IRREGULAR:
-        v2, v3 = IRREGULAR[b]
-        for f in v2.split("/"):
-            forms.add(_norm(f))
-        for f in v3.split("/"):
-            forms.add(_norm(f))
-
-    return {f for f in forms if f}
+    return word_forms(base)
 
 
 def _required_content_tokens(required_word: str) -> List[str]:
@@ -140,44 +64,21 @@ def _required_content_tokens(required_word: str) -> List[str]:
     return [t for t in req if t not in OPTIONAL_TOKENS]
 
 
+@lru_cache(maxsize=8192)
+def _word_matcher(required_word: str):
+    from phrase_matcher import PhraseMatcher
+
+    return PhraseMatcher([required_word])
+
+
 def used_word_in_sentence(sentence: str, required_word: str) -> bool:
     """
     Checks that the required word (or its simple forms) appears in the sentence.
     For multi-token phrases: requires content tokens contiguously, and allows
     inflection only on the first token.
+    Uses the same compiled matcher as phrase_matcher's vocabulary reports.
     """
-    toks = _tokens(sentence)
-    tokset = set(toks)
-
-    content = _required_content_tokens(required_word)
-    if not content:
-        content = _tokens(required_word)
-
-    if len(content) == 1:
-        for f in _simple_forms(content[0]):
-            if f in tokset:
-                return True
-        return False
-
-    head = content[0]
-    tail = content[1:]
-    head_forms = _simple_forms(head)
-
-    n = len(toks)
-    m = len(tail)
-    for i in range(n):
-        if toks[i] not in head_forms:
-            continue
-        if i + m >= n:
-            continue
-        ok = True
-        for j in range(m):
-            if toks[i + 1 + j] != tail[j]:
-                ok = False
-                break
-        if ok:
-            return True
-    return False
+    return next(_word_matcher(required_word).scan(sentence), None) is not None
 
 
 def _ends_with_ed(tok: str) -> bool:
@@ -185,149 +86,470 @@ def _ends_with_ed(tok: str) -> bool:
 
 
 def _looks_like_v3(tok: str) -> bool:
-    if _ends_with_ed(tok):
-        return True
-    for _base, (_v2, v3) in IRREGULAR.items():
-        if tok in [x.strip() for x in v3.split("/")]:
-            return True
-    return False
+    return _ends_with_ed(tok) or tok in TENSE_V3_FORMS
 
 
 def _looks_like_v2(tok: str) -> bool:
-    if _ends_with_ed(tok):
-        return True
-    for _base, (v2, _v3) in IRREGULAR.items():
-        if tok in [x.strip() for x in v2.split("/")]:
-            return True
-    return False
+    return _ends_with_ed(tok) or tok in TENSE_V2_FORMS
+
+
+@dataclass
+class ClientStats:
+    """Per-client request counters (seconds are wall-clock per HTTP call)."""
+    requests: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return (self.total_seconds / self.requests * 1000) if self.requests else 0.0
+
+
+class LTTimeout(TimeoutError):
+    """LanguageTool did not answer within the request timeout."""
+
+
+class LanguageToolClient:
+    """
+    Thin LanguageTool HTTP client on top of a pooled keep-alive `requests.Session`.
+
+    One instance is shared by every grammar call in the process, so sentences
+    reuse the same TCP+TLS connections instead of opening one per request.
+    Transient failures (connection errors, 429/5xx) are retried with backoff.
+    With `retry_rate_limited=False`, 429 and 503 are raised at once (as
+    HTTPError) so the caller can apply its own rate-limit policy.
+
+    `on_outcome(reachable)` is called after every request: False for network
+    errors, timeouts and 5xx answers, True otherwise.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = LT_ENDPOINT,
+        pool_size: int = 4,
+        retries: int = 2,
+        backoff: float = 0.3,
+        timeout: float = 5.0,
+        retry_rate_limited: bool = True,
+    ):
+        self.endpoint = endpoint
+        self.languages_url = endpoint.rsplit("/", 1)[0] + "/languages"
+        self.timeout = timeout
+        self.on_outcome: Optional[Callable[[bool], None]] = None
+        self.stats = ClientStats()
+        self._stats_lock = threading.Lock()
+
+        # requests/urllib3 are imported on first client creation, not at app startup
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self._timeout_error = requests.exceptions.Timeout
+        self._http_error = requests.exceptions.HTTPError
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504) if retry_rate_limited else (500, 502, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=retry_rate_limited,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # reachability probes: one attempt, so a hung server costs at most `timeout`
+        self._probe_session = requests.Session()
+        probe_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+        self._probe_session.mount("https://", probe_adapter)
+        self._probe_session.mount("http://", probe_adapter)
+
+    def _record(self, seconds: float, error: bool = False, timeout: bool = False) -> None:
+        with self._stats_lock:
+            st = self.stats
+            st.requests += 1
+            st.total_seconds += seconds
+            st.max_seconds = max(st.max_seconds, seconds)
+            if error:
+                st.errors += 1
+            if timeout:
+                st.timeouts += 1
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.stats = ClientStats()
+
+    def check(self, text: str, lang: str = "en-US", timeout: Optional[float] = None) -> dict:
+        """
+        POST /check and return the decoded JSON body. Raises LTTimeout on
+        timeouts and the underlying `requests` error on other failures.
+        """
+        return self._post({"text": text, "language": lang, "enabledOnly": "false"}, timeout)
+
+    def check_annotated(self, annotation: List[dict], lang: str = "en-US",
+                        timeout: Optional[float] = None) -> dict:
+        """
+        POST /check with an annotated `data` document ({"text": ...} / {"markup": ...}
+        parts). Match offsets refer to the concatenation of all parts.
+        """
+        form = {
+            "data": json.dumps({"annotation": annotation}),
+            "language": lang,
+            "enabledOnly": "false",
+        }
+        return self._post(form, timeout)
+
+    def languages(self, timeout: Optional[float] = None) -> list:
+        """GET /languages: a cheap request that does not count against the check quota."""
+        return self._request("GET", self.languages_url, timeout)
+
+    def probe(self, timeout: float) -> bool:
+        """
+        Whether the server answers at all: a single GET /languages without retries.
+        Any answer below 500 counts, the same rule `on_outcome` applies to real
+        requests. Probes are not reported to `on_outcome` (the monitor that sends
+        them records the result itself) and not counted in `stats`.
+        """
+        try:
+            resp = self._probe_session.get(self.languages_url, timeout=timeout)
+        except Exception:
+            return False
+        return resp.status_code < 500
+
+    def _post(self, form: dict, timeout: Optional[float]) -> dict:
+        return self._request("POST", self.endpoint, timeout, data=form)
+
+    def _request(self, method: str, url: str, timeout: Optional[float], **kwargs):
+        t0 = time.perf_counter()
+        try:
+            resp = self.session.request(
+                method,
+                url,
+                timeout=timeout if timeout is not None else self.timeout,
+                **kwargs,
+            )
+            resp.raise_for_status()
+            data = resp.json()
+        except self._timeout_error as e:
+            self._record(time.perf_counter() - t0, error=True, timeout=True)
+            self._outcome(False)
+            raise LTTimeout(str(e)) from e
+        except Exception as e:
+            self._record(time.perf_counter() - t0, error=True)
+            # 4xx means the server answered; anything else means it is unreachable
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            self._outcome(isinstance(e, self._http_error) and status is not None and status < 500)
+            raise
+        self._record(time.perf_counter() - t0)
+        self._outcome(True)
+        return data
+
+    def _outcome(self, reachable: bool) -> None:
+        if self.on_outcome is not None:
+            self.on_outcome(reachable)
+
+    def close(self) -> None:
+        self.session.close()
+        self._probe_session.close()
+
+
+_client: Optional[LanguageToolClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> LanguageToolClient:
+    """Process-wide shared LanguageTool client (created on first use)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LanguageToolClient()
+                _client.on_outcome = get_monitor().report
+    return _client
+
+
+def set_client(client: LanguageToolClient) -> None:
+    """Replace the shared client, e.g. to point at a local LanguageTool server."""
+    global _client
+    if client.on_outcome is None:
+        client.on_outcome = get_monitor().report
+    with _client_lock:
+        old, _client = _client, client
+    if old is not None and old is not client:
+        old.close()
 
 
 def lt_online(timeout: float = 2.0) -> bool:
-    """Быстрая проверка подключения с таймаутом"""
+    """Быстрая проверка подключения с таймаутом (GET /languages, без проверки текста)"""
+    return get_client().probe(timeout)
+
+
+_monitor: Optional[ConnectivityMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor() -> ConnectivityMonitor:
+    """
+    Process-wide LanguageTool status, fed by every request of the shared client.
+    Call `start()` on it to enable active probing while offline.
+    """
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = ConnectivityMonitor(lambda timeout: lt_online(timeout))
+    return _monitor
+
+
+_UNSET = object()
+_cache = _UNSET
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[GrammarCache]:
+    """Shared result cache stored next to vocab.json (None when caching is disabled)."""
+    global _cache
+    if _cache is _UNSET:
+        with _cache_lock:
+            if _cache is _UNSET:
+                try:
+                    _cache = GrammarCache(grammar_cache_path())
+                except sqlite3.Error:
+                    _cache = GrammarCache(None)  # unreadable database: memory only
+    return _cache
+
+
+def set_cache(cache: Optional[GrammarCache]) -> None:
+    """Replace the shared cache; pass None to always go to the server."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+def _remember_response(cache: Optional[GrammarCache], data: dict) -> None:
+    if cache is not None:
+        try:
+            cache.note_ruleset((data.get("software") or {}).get("version", ""))
+        except sqlite3.Error:
+            pass
+
+
+# A locked or corrupt cache database must never turn into a grammar error:
+# lookups fall back to "not cached" and failed writes are dropped.
+
+def _cache_get(cache: Optional[GrammarCache], sentence: str, lang: str) -> Optional[List[dict]]:
+    if cache is None:
+        return None
     try:
-        r = requests.post(
-            LT_ENDPOINT, 
-            data={"text": "Hello.", "language": "en-US"}, 
-            timeout=timeout
-        )
-        return r.status_code == 200
-    except requests.exceptions.Timeout:
-        return False
-    except Exception:
-        return False
+        return cache.get(sentence, lang)
+    except sqlite3.Error:
+        return None
+
+
+def _cache_put(cache: Optional[GrammarCache], sentence: str, matches: List[dict], lang: str) -> None:
+    if cache is None:
+        return
+    try:
+        cache.put(sentence, matches, lang)
+    except sqlite3.Error:
+        pass
+
+
+# Rule ids of the placeholder matches returned when LanguageTool could not be asked.
+FAILURE_RULES = frozenset({"error", "timeout"})
+
+
+def grammar_failed(matches: List[dict]) -> bool:
+    """Whether `matches` reports a failed request (error/timeout) rather than a real check."""
+    return any((m.get("rule") or {}).get("id") in FAILURE_RULES for m in matches)
+
+
+def failure_matches(exc: Exception) -> List[dict]:
+    """Placeholder matches for a request that failed with `exc` (see grammar_failed)."""
+    if isinstance(exc, LTTimeout):
+        return [{"message": "Grammar check timeout", "rule": {"id": "timeout"}}]
+    return [{"message": f"Error: {str(exc)}", "rule": {"id": "error"}}]
 
 
 def check_grammar_language_tool(sentence: str, lang: str = "en-US") -> List[dict]:
     """
     LanguageTool check с оптимизированным таймаутом
     """
+    cache = get_cache()
+    sentence = normalize_sentence(sentence)
+    cached = _cache_get(cache, sentence, lang)
+    if cached is not None:
+        return cached
     try:
-        resp = requests.post(
-            LT_ENDPOINT,
-            data={
-                "text": sentence, 
-                "language": lang,
-                "enabledOnly": "false"
-            },
-            timeout=5,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("matches", [])
-    except requests.exceptions.Timeout:
-        return [{"message": "Grammar check timeout", "rule": {"id": "timeout"}}]
+        data = get_client().check(sentence, lang)
     except Exception as e:
-        return [{"message": f"Error: {str(e)}", "rule": {"id": "error"}}]
-
+        return failure_matches(e)
+    matches = data.get("matches", [])
+    _remember_response(cache, data)
+    _cache_put(cache, sentence, matches, lang)
+    return matches
+
+
+# --- Tense classifier: one pass over the tokens for all tenses ---
+
+# Token classes (bit flags), computed once per token.
+_WILL = 1 << 0
+_BE = 1 << 1
+_BEEN = 1 << 2
+_HAVE_HAS = 1 << 3
+_HAD = 1 << 4
+_AM_IS_ARE = 1 << 5
+_WAS_WERE = 1 << 6
+_ING = 1 << 7
+_V3 = 1 << 8
+_HAVE = 1 << 9  # "have" alone: the future perfects take "will have", never "will has"
+
+_WORD_FLAGS: Dict[str, int] = {
+    "will": _WILL,
+    "be": _BE,
+    "been": _BEEN,
+    "have": _HAVE_HAS | _HAVE,
+    "has": _HAVE_HAS,
+    "had": _HAD,
+    "am": _AM_IS_ARE,
+    "is": _AM_IS_ARE,
+    "are": _AM_IS_ARE,
+    "was": _WAS_WERE,
+    "were": _WAS_WERE,
+}
 
-# --- Tense matcher with gaps (allows inserts like adverbs) ---
+# allow 1-3 filler tokens between auxiliaries (e.g. "will just be working")
+_GAP = 3
+
+# (tense, parts in order, max tokens between consecutive parts, found msg, expected msg)
+_TENSE_PATTERNS: List[Tuple[str, Tuple[int, ...], int, str, str]] = [
+    ("Present Continuous", (_AM_IS_ARE, _ING), _GAP,
+     "Found am/is/are ... V-ing.", "Expected: am/is/are ... V-ing."),
+    ("Past Continuous", (_WAS_WERE, _ING), _GAP,
+     "Found was/were ... V-ing.", "Expected: was/were ... V-ing."),
+    ("Future Continuous", (_WILL, _BE, _ING), _GAP,
+     "Found will ... be ... V-ing.", "Expected: will ... be ... V-ing."),
+    ("Present Perfect", (_HAVE_HAS, _V3), _GAP,
+     "Found have/has ... V3.", "Expected: have/has ... V3."),
+    ("Past Perfect", (_HAD, _V3), _GAP,
+     "Found had ... V3.", "Expected: had ... V3."),
+    ("Future Perfect", (_WILL, _HAVE, _V3), _GAP,
+     "Found will ... have ... V3.", "Expected: will ... have ... V3."),
+    ("Present Perfect Continuous", (_HAVE_HAS, _BEEN, _ING), _GAP,
+     "Found have/has ... been ... V-ing.", "Expected: have/has ... been ... V-ing."),
+    ("Past Perfect Continuous", (_HAD, _BEEN, _ING), _GAP,
+     "Found had ... been ... V-ing.", "Expected: had ... been ... V-ing."),
+    ("Future Perfect Continuous", (_WILL, _HAVE, _BEEN, _ING), _GAP,
+     "Found will ... have ... been ... V-ing.", "Expected: will ... have ... been ... V-ing."),
+    # not a tense of its own: a tight "be + V-ing" rules out Present Simple
+    ("_continuous", (_AM_IS_ARE, _ING), 1, "", ""),
+]
 
-def _match_sequence_with_gaps(tokens: List[str], parts: List[Set[str]], max_gap: int) -> bool:
-    """
-    Find parts[0], then parts[1] ... in order, allowing up to max_gap tokens between parts.
-    """
-    n = len(tokens)
-    starts = [i for i, t in enumerate(tokens) if t in parts[0]]
-    for s in starts:
-        pos = s
-        ok = True
-        for k in range(1, len(parts)):
-            found = False
-            for j in range(pos + 1, min(n, pos + 1 + max_gap + 1)):
-                if tokens[j] in parts[k]:
-                    pos = j
-                    found = True
-                    break
-            if not found:
-                ok = False
-                break
-        if ok:
-            return True
-    return False
 
+def _token_flags(tok: str) -> int:
+    f = _WORD_FLAGS.get(tok, 0)
+    if tok.endswith("ing"):
+        f |= _ING
+    if _looks_like_v3(tok):
+        f |= _V3
+    return f
 
-def tense_heuristic_ok(sentence: str, tense: str) -> Tuple[bool, str]:
-    toks = _tokens(sentence.strip())
 
-    # allow 1-3 filler tokens between auxiliaries (e.g. "will just be working")
-    G = 3
+def _run_patterns(flags: List[int]) -> Set[str]:
+    """
+    Match every pattern in one left-to-right pass.
+
+    Same semantics as matching each pattern from every start on its own: a
+    chain started at parts[0] advances on the first token within `gap` that
+    matches the next part, and dies when the window passes without one. For
+    each pattern the live chains are kept as (next part, last index) pairs;
+    chains that reach the same pair behave the same from then on, so the set
+    stays small.
+    """
+    live: List[Set[Tuple[int, int]]] = [set() for _ in _TENSE_PATTERNS]
+    found: Set[str] = set()
+    for i, f in enumerate(flags):
+        if not f:
+            continue
+        for (name, parts, gap, _ok, _no), chains in zip(_TENSE_PATTERNS, live):
+            if name in found:
+                continue
+            nxt: Set[Tuple[int, int]] = set()
+            for k, p in chains:
+                if i - p - 1 > gap:
+                    continue
+                if f & parts[k]:
+                    if k + 1 == len(parts):
+                        found.add(name)
+                        break
+                    nxt.add((k + 1, i))
+                else:
+                    nxt.add((k, p))
+            if f & parts[0]:
+                nxt.add((1, i))
+            chains.clear()
+            chains.update(nxt)
+    return found
+
+
+def _classify_tokens(toks: List[str]) -> Dict[str, Tuple[bool, str]]:
+    """Verdict and explanation for every tense in TENSES."""
+    tokset = set(toks)
+    matched = _run_patterns([_token_flags(t) for t in toks])
+    out: Dict[str, Tuple[bool, str]] = {}
 
-    if tense == "Future Simple":
-        return (True, "Found 'will'.") if "will" in toks else (False, "Expected: will + V1.")
+    if "will" in tokset or "had" in tokset or "been" in tokset:
+        out["Present Simple"] = (False, "Looks like Future/Perfect (will/had/been found).")
+    elif "_continuous" in matched:
+        out["Present Simple"] = (False, "Looks like Continuous (be ... V-ing).")
+    else:
+        out["Present Simple"] = (True, "No strong markers of other tenses.")
 
-    if tense == "Past Simple":
-        if "did" in toks:
-            return True, "Found 'did'."
-        if any(_looks_like_v2(t) for t in toks):
-            return True, "Found V2 marker (-ed or irregular V2)."
-        return False, "Expected: did + V1 or V2."
+    if "did" in tokset:
+        out["Past Simple"] = (True, "Found 'did'.")
+    elif any(_looks_like_v2(t) for t in tokset):
+        out["Past Simple"] = (True, "Found V2 marker (-ed or irregular V2).")
+    else:
+        out["Past Simple"] = (False, "Expected: did + V1 or V2.")
 
-    if tense == "Present Simple":
-        if "will" in toks or "had" in toks or "been" in toks:
-            return False, "Looks like Future/Perfect (will/had/been found)."
-        # If it looks like Continuous, reject
-        ing = {t for t in toks if t.endswith("ing")}
-        if ing and _match_sequence_with_gaps(toks, [set(["am", "is", "are"]), ing], 1):
-            return False, "Looks like Continuous (be ... V-ing)."
-        return True, "No strong markers of other tenses."
+    out["Future Simple"] = (True, "Found 'will'.") if "will" in tokset else (False, "Expected: will + V1.")
 
-    if tense == "Present Continuous":
-        ing = {t for t in toks if t.endswith("ing")}
-        return (True, "Found am/is/are ... V-ing.") if (ing and _match_sequence_with_gaps(toks, [set(["am", "is", "are"]), ing], G)) else (False, "Expected: am/is/are ... V-ing.")
+    for name, _parts, _gap, ok_msg, no_msg in _TENSE_PATTERNS:
+        if not name.startswith("_"):
+            out[name] = (True, ok_msg) if name in matched else (False, no_msg)
 
-    if tense == "Past Continuous":
-        ing = {t for t in toks if t.endswith("ing")}
-        return (True, "Found was/were ... V-ing.") if (ing and _match_sequence_with_gaps(toks, [set(["was", "were"]), ing], G)) else (False, "Expected: was/were ... V-ing.")
+    return {t: out[t] for t in TENSES}
 
-    if tense == "Future Continuous":
-        ing = {t for t in toks if t.endswith("ing")}
-        return (True, "Found will ... be ... V-ing.") if (ing and _match_sequence_with_gaps(toks, [set(["will"]), set(["be"]), ing], G)) else (False, "Expected: will ... be ... V-ing.")
 
-    if tense == "Present Perfect":
-        v3 = {t for t in toks if _looks_like_v3(t)}
-        return (True, "Found have/has ... V3.") if (v3 and _match_sequence_with_gaps(toks, [set(["have", "has"]), v3], G)) else (False, "Expected: have/has ... V3.")
+def classify_tenses(sentence: str) -> Dict[str, str]:
+    """
+    All tenses (from TENSES, in order) the sentence is consistent with,
+    mapped to a short explanation. Tokenizes and scans the sentence once.
+    """
+    return {t: msg for t, (ok, msg) in _classify_tokens(_tokens(sentence.strip())).items() if ok}
 
-    if tense == "Past Perfect":
-        v3 = {t for t in toks if _looks_like_v3(t)}
-        return (True, "Found had ... V3.") if (v3 and _match_sequence_with_gaps(toks, [set(["had"]), v3], G)) else (False, "Expected: had ... V3.")
 
-    if tense == "Future Perfect":
-        v3 = {t for t in toks if _looks_like_v3(t)}
-        return (True, "Found will ... have ... V3.") if (v3 and _match_sequence_with_gaps(toks, [set(["will"]), set(["have"]), v3], G)) else (False, "Expected: will ... have ... V3.")
+@lru_cache(maxsize=1024)
+def _tense_verdicts(sentence: str) -> Tuple[Tuple[bool, str], ...]:
+    verdicts = _classify_tokens(_tokens(sentence.strip()))
+    return tuple(verdicts[t] for t in TENSES)
 
-    if tense == "Present Perfect Continuous":
-        ing = {t for t in toks if t.endswith("ing")}
-        return (True, "Found have/has ... been ... V-ing.") if (ing and _match_sequence_with_gaps(toks, [set(["have", "has"]), set(["been"]), ing], G)) else (False, "Expected: have/has ... been ... V-ing.")
 
-    if tense == "Past Perfect Continuous":
-        ing = {t for t in toks if t.endswith("ing")}
-        return (True, "Found had ... been ... V-ing.") if (ing and _match_sequence_with_gaps(toks, [set(["had"]), set(["been"]), ing], G)) else (False, "Expected: had ... been ... V-ing.")
+_TENSE_POS = {t: i for i, t in enumerate(TENSES)}
 
-    if tense == "Future Perfect Continuous":
-        ing = {t for t in toks if t.endswith("ing")}
-        return (True, "Found will ... have ... been ... V-ing.") if (ing and _match_sequence_with_gaps(toks, [set(["will"]), set(["have"]), set(["been"]), ing], G)) else (False, "Expected: will ... have ... been ... V-ing.")
 
-    return False, "Unknown tense."
+def tense_heuristic_ok(sentence: str, tense: str) -> Tuple[bool, str]:
+    pos = _TENSE_POS.get(tense)
+    if pos is None:
+        return False, "Unknown tense."
+    return _tense_verdicts(sentence)[pos]
 
 
 @dataclass
@@ -340,25 +562,23 @@ class SentenceCheckResult:
     matches: List[dict]
 
 
-def check_sentence(sentence: str, required_word: str, tense: str) -> SentenceCheckResult:
-    used = used_word_in_sentence(sentence, required_word)
-    tense_ok, tense_msg = tense_heuristic_ok(sentence, tense)
+def _grammar_verdict(matches: List[dict]) -> Tuple[bool, str]:
+    if not matches:
+        return True, "Grammar: OK."
+    first = matches[0]
+    return False, f"Grammar: {first.get('message', 'Errors found.')}"
 
-    matches: List[dict] = []
-    grammar_ok = False
-    grammar_msg = ""
 
-    try:
-        matches = check_grammar_language_tool(sentence, "en-US")
-        grammar_ok = len(matches) == 0
-        if grammar_ok:
-            grammar_msg = "Grammar: OK."
-        else:
-            first = matches[0]
-            grammar_msg = f"Grammar: {first.get('message', 'Errors found.')}"
-    except Exception as e:
-        grammar_ok = False
-        grammar_msg = f"Grammar check error: {e}"
+def _build_result(
+    sentence: str,
+    required_word: str,
+    tense: str,
+    matches: List[dict],
+    grammar_ok: bool,
+    grammar_msg: str,
+) -> SentenceCheckResult:
+    used = used_word_in_sentence(sentence, required_word)
+    tense_ok, tense_msg = tense_heuristic_ok(sentence, tense)
 
     ok = used and tense_ok and grammar_ok
 
@@ -379,4 +599,352 @@ def check_sentence(sentence: str, required_word: str, tense: str) -> SentenceChe
         grammar_ok=grammar_ok,
         message=" ".join(msg_parts) if msg_parts else "OK",
         matches=matches,
-    )
\ No newline at end of file
+    )
+
+
+def check_grammar_offline(sentence: str, lang: str = "en-US") -> List[dict]:
+    """
+    No-network grammar check: a cached LanguageTool result when there is one,
+    otherwise the local rule engine (grammar_local).
+    """
+    from grammar_local import check_grammar_local
+
+    cached = _cache_get(get_cache(), normalize_sentence(sentence), lang)
+    if cached is not None:
+        return cached
+    return check_grammar_local(sentence, lang)
+
+
+def check_sentence(sentence: str, required_word: str, tense: str, offline: bool = False) -> SentenceCheckResult:
+    matches: List[dict] = []
+    grammar_ok = False
+    grammar_msg = ""
+
+    grammar = check_grammar_offline if offline else check_grammar_language_tool
+    try:
+        matches = grammar(sentence, "en-US")
+        grammar_ok, grammar_msg = _grammar_verdict(matches)
+    except Exception as e:
+        grammar_ok = False
+        grammar_msg = f"Grammar check error: {e}"
+
+    return _build_result(sentence, required_word, tense, matches, grammar_ok, grammar_msg)
+
+
+# Paragraph break between sentences of a batch: LanguageTool sees each sentence
+# as its own paragraph, so sentence-level rules don't bleed across.
+BATCH_SEPARATOR = "\n\n"
+
+# Public LanguageTool rejects larger requests; above this we fan out per sentence.
+MAX_BATCH_CHARS = 20000
+
+
+def batch_length(sentences: List[str]) -> int:
+    return sum(len(x) for x in sentences) + len(BATCH_SEPARATOR) * max(0, len(sentences) - 1)
+
+
+def batch_ranges(sentences: List[str], max_sentences: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Split sentences into consecutive (start, end) ranges that each fit one
+    request: at most MAX_BATCH_CHARS characters and `max_sentences` sentences.
+    A single sentence longer than the limit gets a range of its own.
+    """
+    ranges = []
+    start, length = 0, 0
+    for k, sentence in enumerate(sentences):
+        extra = len(sentence) + (len(BATCH_SEPARATOR) if k > start else 0)
+        if k > start and (length + extra > MAX_BATCH_CHARS
+                          or (max_sentences is not None and k - start >= max_sentences)):
+            ranges.append((start, k))
+            start, extra = k, len(sentence)
+            length = 0
+        length += extra
+    if start < len(sentences):
+        ranges.append((start, len(sentences)))
+    return ranges
+
+
+def _split_matches(matches: List[dict], spans: List[Tuple[int, int]]) -> List[List[dict]]:
+    """Assign each match to the sentence whose span contains its offset (offsets made local)."""
+    starts = [a for a, _b in spans]
+    if not starts:
+        return []
+    per_sentence: List[List[dict]] = [[] for _ in spans]
+    for m in matches:
+        off = int(m.get("offset", 0))
+        # matches on a separator (paragraph-level rules) go to the preceding sentence
+        k = max(0, bisect.bisect_right(starts, off) - 1)
+        local = dict(m)
+        local["offset"] = off - starts[k]
+        per_sentence[k].append(local)
+    return per_sentence
+
+
+def _annotate(sentences: List[str]) -> Tuple[List[dict], List[Tuple[int, int]]]:
+    """Annotated document for one batch request and the span of each sentence in it."""
+    annotation: List[dict] = []
+    spans: List[Tuple[int, int]] = []
+    pos = 0
+    for i, sentence in enumerate(sentences):
+        if i:
+            annotation.append({"markup": BATCH_SEPARATOR, "interpretAs": BATCH_SEPARATOR})
+            pos += len(BATCH_SEPARATOR)
+        annotation.append({"text": sentence})
+        spans.append((pos, pos + len(sentence)))
+        pos += len(sentence)
+    return annotation, spans
+
+
+class GrammarBatch:
+    """
+    One batched LanguageTool request without the transport, so the blocking
+    and the asyncio clients share it. Cached sentences are answered up front;
+    if `pending` is true, send `annotation` and pass the response to `finish`
+    (or the exception to `fail`). Both return one `matches` list per sentence,
+    with offsets relative to that sentence.
+    """
+
+    def __init__(self, sentences: List[str], lang: str = "en-US",
+                 cache: Optional[GrammarCache] = None):
+        self.lang = lang
+        self.cache = cache
+        self.sentences = [normalize_sentence(x) for x in sentences]
+        self.matches: List[Optional[List[dict]]] = [_cache_get(cache, x, lang) for x in self.sentences]
+        self.todo = [k for k, m in enumerate(self.matches) if m is None]
+        self.annotation, self._spans = _annotate([self.sentences[k] for k in self.todo])
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.todo)
+
+    def finish(self, data: dict) -> List[List[dict]]:
+        _remember_response(self.cache, data)
+        for k, matches in zip(self.todo, _split_matches(data.get("matches", []), self._spans)):
+            self.matches[k] = matches
+            _cache_put(self.cache, self.sentences[k], matches, self.lang)
+        return self.matches
+
+    def fail(self, exc: Exception) -> List[List[dict]]:
+        for k in self.todo:
+            self.matches[k] = failure_matches(exc)
+        return self.matches
+
+
+def check_grammar_batch(sentences: List[str], lang: str = "en-US") -> List[List[dict]]:
+    """
+    Grammar-check all sentences with a single LanguageTool request.
+    Returns one `matches` list per sentence, with offsets relative to that sentence.
+    Cached sentences are answered locally and left out of the request.
+    """
+    batch = GrammarBatch(sentences, lang, get_cache())
+    if not batch.pending:
+        return batch.matches
+    try:
+        data = get_client().check_annotated(batch.annotation, lang)
+    except Exception as e:
+        return batch.fail(e)
+    return batch.finish(data)
+
+
+def build_results(
+    sentences: List[str],
+    words: List[str],
+    tenses: Union[str, Sequence[str]],
+    per_sentence: List[List[dict]],
+) -> List[SentenceCheckResult]:
+    """
+    `check_sentence` verdicts from grammar matches already fetched for each
+    sentence. `tenses` is one tense for all sentences or one per sentence.
+    """
+    if isinstance(tenses, str):
+        tenses = [tenses] * len(sentences)
+    results = []
+    for sentence, word, tense, matches in zip(sentences, words, tenses, per_sentence):
+        grammar_ok, grammar_msg = _grammar_verdict(matches)
+        results.append(_build_result(sentence, word, tense, matches, grammar_ok, grammar_msg))
+    return results
+
+
+def check_sentences_batch(
+    sentences: List[str], words: List[str], tense: str, offline: bool = False
+) -> List[SentenceCheckResult]:
+    """
+    Like `check_sentence` for each (sentence, word) pair, but with one LanguageTool
+    round-trip for the whole set instead of one per sentence.
+    """
+    if len(sentences) != len(words):
+        raise ValueError("sentences and words must have the same length")
+    if not sentences:
+        return []
+
+    if offline:
+        per_sentence = [check_grammar_offline(x, "en-US") for x in sentences]
+    elif batch_length(sentences) <= MAX_BATCH_CHARS:
+        per_sentence = check_grammar_batch(sentences, "en-US")
+    else:
+        per_sentence = list(get_executor().map(check_grammar_language_tool, sentences))
+
+    return build_results(sentences, words, tense, per_sentence)
+
+
+# --- Shared worker pool for grammar checks ---
+
+DEFAULT_MAX_WORKERS = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Application-wide bounded pool that runs every background grammar call."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="grammar"
+                )
+    return _executor
+
+
+def configure_pool(max_workers: int) -> None:
+    """Change the concurrency limit. Already submitted checks finish on the old pool."""
+    global _executor
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    with _executor_lock:
+        old, _executor = _executor, ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="grammar"
+        )
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def shutdown_pool() -> None:
+    """Drop queued checks and release the pool (called on application exit)."""
+    global _executor
+    with _executor_lock:
+        old, _executor = _executor, None
+    if old is not None:
+        old.shutdown(wait=False, cancel_futures=True)
+
+
+class CheckRound:
+    """
+    Handle for one set of in-flight grammar checks.
+
+    `cancel()` drops queued requests and guarantees the completion callback
+    is never invoked once it has returned, so results from a stale round
+    can't reach new cards: the callback runs under the round's lock, and a
+    cancel that races with it waits for it to finish. Requests already on
+    the wire finish in the background and are discarded.
+    """
+
+    def __init__(self):
+        self._futures: List[Future] = []
+        self._lock = threading.RLock()  # reentrant: the callback may cancel its own round
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def _add(self, fut: Future) -> None:
+        with self._lock:
+            self._futures.append(fut)
+            if self._cancelled:
+                fut.cancel()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            futures = list(self._futures)
+        for fut in futures:
+            fut.cancel()
+
+    def done(self) -> bool:
+        with self._lock:
+            return all(f.done() for f in self._futures)
+
+    def _deliver(self, callback: Callable, *args) -> None:
+        with self._lock:
+            if not self._cancelled:
+                callback(*args)
+
+
+def submit_sentences_check(
+    sentences: List[str],
+    words: List[str],
+    tense: str,
+    on_done: Callable[[List[SentenceCheckResult]], None],
+    offline: bool = False,
+) -> CheckRound:
+    """
+    Run `check_sentences_batch` semantics on the shared pool without blocking.
+
+    Sentence sets that fit one LanguageTool request go out as a single batch;
+    larger ones fan out to one request per sentence, bounded by the pool size.
+    `on_done(results)` is called from a pool thread unless the round was cancelled.
+    Offline checks are local and cheap, so they complete before this returns.
+    """
+    if len(sentences) != len(words):
+        raise ValueError("sentences and words must have the same length")
+
+    rnd = CheckRound()
+    executor = get_executor()
+
+    def finish(per_sentence: List[List[dict]]) -> None:
+        if rnd.cancelled:
+            return
+        try:
+            results = build_results(sentences, words, tense, per_sentence)
+        except Exception as e:
+            results = build_results(sentences, words, tense, [failure_matches(e) for _ in sentences])
+        rnd._deliver(on_done, results)
+
+    # Future callbacks swallow exceptions: a failed check must still complete the round
+    def outcome(f: Future, count: int) -> List[List[dict]]:
+        try:
+            return f.result()
+        except Exception as e:
+            return [failure_matches(e) for _ in range(count)]
+
+    if not sentences:
+        finish([])
+        return rnd
+
+    if offline:
+        finish([check_grammar_offline(x, "en-US") for x in sentences])
+        return rnd
+
+    if batch_length(sentences) <= MAX_BATCH_CHARS:
+        fut = executor.submit(check_grammar_batch, sentences, "en-US")
+
+        def batch_done(f: Future) -> None:
+            if f.cancelled():
+                return
+            finish(outcome(f, len(sentences)))
+
+        rnd._add(fut)
+        fut.add_done_callback(batch_done)
+        return rnd
+
+    per_sentence: List[List[dict]] = [[] for _ in sentences]
+    pending = [len(sentences)]
+    lock = threading.Lock()
+
+    def one_done(k: int, f: Future) -> None:
+        if f.cancelled():
+            return
+        per_sentence[k] = outcome(f, 1)[0]
+        with lock:
+            pending[0] -= 1
+            last = pending[0] == 0
+        if last:
+            finish(per_sentence)
+
+    for k, sentence in enumerate(sentences):
+        fut = executor.submit(check_grammar_language_tool, sentence, "en-US")
+        rnd._add(fut)
+        fut.add_done_callback(lambda f, k=k: one_done(k, f))
+    return rnd
@@ -0,0 +1,265 @@
+"""
+Word-form generation for usage detection: inflections of a base word
+(3rd person / plural, past, -ing, comparatives) plus irregular tables.
+
+`word_forms` is memoized with a bounded cache; `load_forms_file` extends the
+irregular tables from a JSON data file and invalidates that cache. The
+extended tables only feed word forms; tense markers stay on the built-in
+verb table (TENSE_V2_FORMS / TENSE_V3_FORMS).
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Tuple
+
+# --- Irregular verbs (base -> (V2, V3)) ---
+IRREGULAR: Dict[str, Tuple[str, str]] = {
+    "be": ("was/were", "been"),
+    "become": ("became", "become"),
+    "begin": ("began", "begun"),
+    "break": ("broke", "broken"),
+    "bring": ("brought", "brought"),
+    "build": ("built", "built"),
+    "buy": ("bought", "bought"),
+    "catch": ("caught", "caught"),
+    "choose": ("chose", "chosen"),
+    "come": ("came", "come"),
+    "do": ("did", "done"),
+    "drink": ("drank", "drunk"),
+    "drive": ("drove", "driven"),
+    "eat": ("ate", "eaten"),
+    "fall": ("fell", "fallen"),
+    "feel": ("felt", "felt"),
+    "find": ("found", "found"),
+    "fly": ("flew", "flown"),
+    "forget": ("forgot", "forgotten"),
+    "get": ("got", "got/gotten"),
+    "give": ("gave", "given"),
+    "go": ("went", "gone"),
+    "have": ("had", "had"),
+    "hear": ("heard", "heard"),
+    "know": ("knew", "known"),
+    "leave": ("left", "left"),
+    "lose": ("lost", "lost"),
+    "make": ("made", "made"),
+    "meet": ("met", "met"),
+    "pay": ("paid", "paid"),
+    "read": ("read", "read"),
+    "run": ("ran", "run"),
+    "say": ("said", "said"),
+    "see": ("saw", "seen"),
+    "sell": ("sold", "sold"),
+    "send": ("sent", "sent"),
+    "sit": ("sat", "sat"),
+    "sleep": ("slept", "slept"),
+    "speak": ("spoke", "spoken"),
+    "spend": ("spent", "spent"),
+    "stand": ("stood", "stood"),
+    "take": ("took", "taken"),
+    "teach": ("taught", "taught"),
+    "tell": ("told", "told"),
+    "think": ("thought", "thought"),
+    "understand": ("understood", "understood"),
+    "wear": ("wore", "worn"),
+    "write": ("wrote", "written"),
+}
+
+
+# Past forms the tense heuristic takes as V2/V3 markers. Only the built-in
+# table: the extended one adds base == V3 verbs and noun homographs ("set",
+# "cut", "wound") that would read "I have a set of keys." as Present Perfect.
+TENSE_V2_FORMS: FrozenSet[str] = frozenset(
+    f.strip() for v2, _v3 in IRREGULAR.values() for f in v2.split("/") if f.strip()
+)
+TENSE_V3_FORMS: FrozenSet[str] = frozenset(
+    f.strip() for _v2, v3 in IRREGULAR.values() for f in v3.split("/") if f.strip()
+)
+
+
+IRREGULAR_PLURALS: Dict[str, str] = {
+    "man": "men",
+    "woman": "women",
+    "child": "children",
+    "person": "people",
+    "foot": "feet",
+    "tooth": "teeth",
+    "mouse": "mice",
+    "goose": "geese",
+}
+
+IRREGULAR_COMPARATIVES: Dict[str, Tuple[str, str]] = {
+    "good": ("better", "best"),
+    "well": ("better", "best"),
+    "bad": ("worse", "worst"),
+    "far": ("farther/further", "farthest/furthest"),
+    "little": ("less", "least"),
+    "many": ("more", "most"),
+    "much": ("more", "most"),
+}
+
+# Bundled extended table, loaded at import when present.
+FORMS_FILE = Path(__file__).with_name("irregular_forms.json")
+
+FORMS_CACHE_SIZE = 8192
+
+_VOWELS = "aeiou"
+
+
+def _norm(s: str) -> str:
+    return " ".join(str(s).strip().lower().split())
+
+
+def _split_forms(forms: str) -> List[str]:
+    return [x.strip() for x in forms.split("/") if x.strip()]
+
+
+class Lexicon:
+    """
+    Irregular-form tables plus the lookups derived from them (V2 set, V3 set,
+    form -> base map). The derived lookups are frozen and only rebuilt when
+    new tables are loaded.
+    """
+
+    def __init__(self):
+        self.verbs: Dict[str, Tuple[str, str]] = dict(IRREGULAR)
+        self.plurals: Dict[str, str] = dict(IRREGULAR_PLURALS)
+        self.comparatives: Dict[str, Tuple[str, str]] = dict(IRREGULAR_COMPARATIVES)
+        self.v2_forms: FrozenSet[str] = frozenset()
+        self.v3_forms: FrozenSet[str] = frozenset()
+        self.form_to_base: Mapping[str, str] = MappingProxyType({})
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        v2_forms = set()
+        v3_forms = set()
+        form_to_base: Dict[str, str] = {}
+        for base, (v2, v3) in self.verbs.items():
+            for f in _split_forms(v2):
+                v2_forms.add(f)
+                form_to_base.setdefault(f, base)
+            for f in _split_forms(v3):
+                v3_forms.add(f)
+                form_to_base.setdefault(f, base)
+        self.v2_forms = frozenset(v2_forms)
+        self.v3_forms = frozenset(v3_forms)
+        self.form_to_base = MappingProxyType(form_to_base)
+
+    def update(self, data: dict) -> int:
+        """
+        Merge tables of the form
+        {"verbs": {base: [v2, v3]}, "plurals": {sg: pl}, "comparatives": {adj: [cmp, sup]}}.
+        Slash-separated variants ("got/gotten") are allowed. Returns the number of entries.
+        """
+        n = 0
+        for base, (v2, v3) in (data.get("verbs") or {}).items():
+            self.verbs[_norm(base)] = (_norm(v2), _norm(v3))
+            n += 1
+        for sg, pl in (data.get("plurals") or {}).items():
+            self.plurals[_norm(sg)] = _norm(pl)
+            n += 1
+        for adj, (cmp_, sup) in (data.get("comparatives") or {}).items():
+            self.comparatives[_norm(adj)] = (_norm(cmp_), _norm(sup))
+            n += 1
+        self.rebuild()
+        return n
+
+
+LEXICON = Lexicon()
+
+
+def load_forms_file(path: Path) -> int:
+    """Extend LEXICON from a JSON data file; returns the number of entries read."""
+    with Path(path).open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object with verbs/plurals/comparatives")
+    n = LEXICON.update(data)
+    word_forms.cache_clear()
+    return n
+
+
+def _doubles_final(b: str) -> bool:
+    """Short CVC words double the last consonant: stop -> stopped, big -> bigger."""
+    if len(b) < 3 or b[-1] in _VOWELS + "wxy" or b[-2] not in _VOWELS or b[-3] in _VOWELS:
+        return False
+    # one vowel group ~ one syllable, where the stress is on the last syllable
+    groups = sum(1 for i, c in enumerate(b) if c in _VOWELS and (i == 0 or b[i - 1] not in _VOWELS))
+    return groups == 1
+
+
+def _consonant_y(b: str) -> bool:
+    return b.endswith("y") and len(b) > 2 and b[-2] not in _VOWELS
+
+
+@lru_cache(maxsize=FORMS_CACHE_SIZE)
+def word_forms(base: str) -> FrozenSet[str]:
+    """
+    Common forms of a base word for usage detection: base, 3rd person/plural,
+    past, -ing, comparative/superlative, and irregular forms where known.
+    Over-generation is fine here (forms are only matched against real text).
+    """
+    b = _norm(base)
+    if not b:
+        return frozenset()
+
+    forms = {b}
+    dbl = b + b[-1] if _doubles_final(b) else b
+
+    # 3rd person / plural
+    if _consonant_y(b):
+        forms.add(b[:-1] + "ies")
+    if b.endswith(("s", "x", "z", "ch", "sh", "o")):
+        forms.add(b + "es")
+    if b.endswith("fe"):
+        forms.add(b[:-2] + "ves")
+    elif b.endswith("f") and not b.endswith("ff"):
+        forms.add(b[:-1] + "ves")
+    forms.add(b + "s")
+
+    # past
+    if b.endswith("e"):
+        forms.add(b + "d")
+    else:
+        forms.add(b + "ed")
+        forms.add(dbl + "ed")
+    if _consonant_y(b):
+        forms.add(b[:-1] + "ied")
+
+    # -ing
+    if b.endswith("ie"):
+        forms.add(b[:-2] + "ying")
+    elif b.endswith("e") and not b.endswith("ee"):
+        forms.add(b[:-1] + "ing")
+    else:
+        forms.add(b + "ing")
+        forms.add(dbl + "ing")
+
+    # comparative / superlative (short adjectives)
+    if len(b) <= 7 and " " not in b:
+        if b.endswith("e"):
+            forms.update((b + "r", b + "st"))
+        elif _consonant_y(b):
+            forms.update((b[:-1] + "ier", b[:-1] + "iest"))
+        else:
+            forms.update((dbl + "er", dbl + "est"))
+
+    # irregular
+    lex = LEXICON
+    if b in lex.verbs:
+        v2, v3 = lex.verbs[b]
+        forms.update(_split_forms(v2))
+        forms.update(_split_forms(v3))
+    if b in lex.plurals:
+        forms.add(lex.plurals[b])
+    if b in lex.comparatives:
+        cmp_, sup = lex.comparatives[b]
+        forms.update(_split_forms(cmp_))
+        forms.update(_split_forms(sup))
+
+    return frozenset(f for f in forms if f)
+
+
+if FORMS_FILE.exists():
+    load_forms_file(FORMS_FILE)
@@ -0,0 +1,173 @@
+"""
+Multi-phrase vocabulary matcher (Aho–Corasick over word tokens).
+
+Compiled once from a vocabulary, it finds every item used in a text in a
+single linear pass over the tokens, with the same rules as
+`grammar_online.used_word_in_sentence`: content tokens must appear
+contiguously and only the first one may be inflected.
+
+    python phrase_matcher.py vocab.json corpus.txt   # coverage report
+"""
+
+import sys
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from grammar_online import _required_content_tokens, _simple_forms, _tokens
+
+
+def phrase_patterns(word: str) -> List[Tuple[str, ...]]:
+    """Token sequences that count as a use of `word` (head inflected, tail exact)."""
+    content = _required_content_tokens(word)
+    if not content:
+        content = _tokens(word)
+    if not content:
+        return []
+    head, tail = content[0], tuple(content[1:])
+    return [(f,) + tail for f in _simple_forms(head)]
+
+
+class PhraseMatcher:
+    """
+    Aho–Corasick automaton whose alphabet is word tokens.
+
+    Each key (a vocabulary word) owns one or more token sequences; `scan`
+    reports (key, start, end) for every occurrence, overlapping ones included.
+    The automaton is compiled in __init__ and, after later `add` calls, on the
+    next scan under a lock, so a matcher can be shared between threads.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]   # (key id, pattern length)
+        self.keys: List[str] = []
+        self._compiled = True
+        self._lock = threading.Lock()
+        for w in words:
+            self.add(w)
+        self._compile()
+
+    def add(self, word: str, patterns: Iterable[Sequence[str]] = None) -> None:
+        """Register `word` with its patterns (default: `phrase_patterns(word)`)."""
+        patterns = phrase_patterns(word) if patterns is None else patterns
+        with self._lock:
+            kid = len(self.keys)
+            self.keys.append(word)
+            for pat in patterns:
+                node = 0
+                for tok in pat:
+                    nxt = self._goto[node].get(tok)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[node][tok] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._out.append([])
+                    node = nxt
+                hit = (kid, len(pat))
+                if node and hit not in self._out[node]:
+                    self._out[node].append(hit)
+            self._compiled = False
+
+    def _compile(self) -> None:
+        # BFS: fail links, and merge outputs along them so scanning never walks the chain
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for tok, child in self._goto[node].items():
+                f = self._fail[node]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(tok, 0)
+                self._fail[child] = cand if cand != child else 0
+                self._out[child] = self._out[child] + [
+                    h for h in self._out[self._fail[child]] if h not in self._out[child]
+                ]
+                queue.append(child)
+        self._compiled = True
+
+    def scan_tokens(self, toks: Sequence[str]) -> Iterator[Tuple[str, int, int]]:
+        if not self._compiled:
+            with self._lock:
+                if not self._compiled:
+                    self._compile()
+        goto, fail, out, keys = self._goto, self._fail, self._out, self.keys
+        node = 0
+        for i, tok in enumerate(toks):
+            while node and tok not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(tok, 0)
+            for kid, length in out[node]:
+                yield keys[kid], i - length + 1, i + 1
+
+    def scan(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """(word, start, end) token spans of every occurrence."""
+        return self.scan_tokens(_tokens(text))
+
+    def used(self, text: str) -> Set[str]:
+        """Vocabulary words used in the text."""
+        return {k for k, _s, _e in self.scan(text)}
+
+    def counts(self, text: str) -> Counter:
+        """Occurrences of each vocabulary word in the text."""
+        return Counter(k for k, _s, _e in self.scan(text))
+
+
+@dataclass
+class CoverageReport:
+    texts: int = 0
+    uses: Counter = field(default_factory=Counter)        # total occurrences
+    text_hits: Counter = field(default_factory=Counter)   # texts containing the word
+    unused: List[str] = field(default_factory=list)
+
+    @property
+    def coverage(self) -> float:
+        total = len(self.unused) + len(self.text_hits)
+        return len(self.text_hits) / total if total else 0.0
+
+
+def vocabulary_coverage(texts: Iterable[str], words: Iterable[str]) -> CoverageReport:
+    """Which vocabulary words the texts use, and how often (one pass per text)."""
+    words = list(dict.fromkeys(words))
+    matcher = PhraseMatcher(words)
+    report = CoverageReport()
+    for text in texts:
+        report.texts += 1
+        c = matcher.counts(text)
+        report.uses.update(c)
+        report.text_hits.update(c.keys())
+    report.unused = [w for w in words if w not in report.text_hits]
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("usage: python phrase_matcher.py VOCAB.json CORPUS.txt", file=sys.stderr)
+        return 2
+    from storage import load_vocab
+
+    vocab_file, corpus_file = map(Path, argv)
+    # the snapshot with its change log applied, JSON array or JSON Lines
+    words = [it.get("en", "") for it in load_vocab(vocab_file)]
+    with corpus_file.open("r", encoding="utf-8") as f:
+        report = vocabulary_coverage((line for line in f if line.strip()), words)
+
+    print(f"texts: {report.texts}  words used: {len(report.text_hits)}/"
+          f"{len(report.text_hits) + len(report.unused)} ({report.coverage:.1%})")
+    for word, n in report.text_hits.most_common():
+        print(f"{n:8d}  {report.uses[word]:8d}  {word}")
+    if report.unused:
+        print(f"unused ({len(report.unused)}): " + ", ".join(report.unused))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
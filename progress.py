@@ -0,0 +1,250 @@
+"""
+Сохранённый прогресс обучения (выученные слова и слова, уже использованные
+в предложениях).
+
+Ключи — кортежи из ui_qt._card_key_words / _word_key_sentence, первый
+элемент — нормализованная тема. В памяти держатся только открытые темы,
+остальные подгружаются при первом обращении. Изменения копятся в очереди и
+пишутся фоновым потоком одной транзакцией (с задержкой DEBOUNCE), так что
+поток интерфейса не ждёт диска.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+DEBOUNCE = 0.5
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    db = sqlite3.connect(str(path), isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class ProgressStore:
+    """SQLite-файл прогресса с фоновой записью; наборы по видам — через get()"""
+
+    def __init__(self, path: Path, debounce: float = DEBOUNCE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.debounce = debounce
+
+        self._db = _connect(self.path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS progress ("
+            " kind TEXT NOT NULL, topic TEXT NOT NULL, key TEXT NOT NULL,"
+            " PRIMARY KEY (kind, topic, key))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS schedule ("
+            " kind TEXT NOT NULL, topic TEXT NOT NULL, key TEXT NOT NULL, state TEXT NOT NULL,"
+            " due REAL, reps INTEGER,"
+            " PRIMARY KEY (kind, topic, key))"
+        )
+        # due / reps дублируют поля state, чтобы сводка по темам не разбирала JSON
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(schedule)")}
+        if "due" not in columns:
+            with self._db:
+                self._db.execute("BEGIN")
+                self._db.execute("ALTER TABLE schedule ADD COLUMN due REAL")
+                self._db.execute("ALTER TABLE schedule ADD COLUMN reps INTEGER")
+                self._db.execute(
+                    "UPDATE schedule SET due = json_extract(state, '$.due'),"
+                    " reps = json_extract(state, '$.reps')"
+                )
+        # покрывающий индекс для _schedule_topics: сводка не читает сами состояния
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS schedule_due ON schedule (kind, topic, due, reps)"
+        )
+        self._sets: dict[str, "ProgressSet"] = {}
+
+        self._cond = threading.Condition()
+        self._queue: list[tuple] = []
+        self._closed = False
+        self._flush_requested = False
+        self._busy = False
+        self._writer = threading.Thread(target=self._run, name="progress-writer", daemon=True)
+        self._writer.start()
+
+    def get(self, kind: str) -> "ProgressSet":
+        """Набор ключей одного вида ("words", "sentences")"""
+        if kind not in self._sets:
+            self._sets[kind] = ProgressSet(self, kind)
+        return self._sets[kind]
+
+    # --- чтение (поток интерфейса) ---
+
+    def _counts(self, kind: str) -> dict[str, int]:
+        rows = self._db.execute(
+            "SELECT topic, COUNT(*) FROM progress WHERE kind = ? GROUP BY topic", (kind,)
+        )
+        return dict(rows.fetchall())
+
+    def _load(self, kind: str, topic: str) -> set[tuple]:
+        rows = self._db.execute(
+            "SELECT key FROM progress WHERE kind = ? AND topic = ?", (kind, topic)
+        )
+        return {(topic, *json.loads(k)) for (k,) in rows}
+
+    def _schedule_topics(self, kind: str) -> list[tuple[str, int, float, Optional[float]]]:
+        """
+        Сводка расписания по темам без загрузки карточек: число карточек,
+        ближайший срок и ближайший срок среди невыученных (reps = 0).
+        """
+        rows = self._db.execute(
+            "SELECT topic, COUNT(*), MIN(due), MIN(CASE WHEN reps = 0 THEN due END)"
+            " FROM schedule WHERE kind = ? GROUP BY topic", (kind,)
+        )
+        return rows.fetchall()
+
+    def _schedule(self, kind: str, topic: str) -> list[tuple[tuple, dict]]:
+        """Состояния интервального повторения одной темы (scheduler.Scheduler)"""
+        rows = self._db.execute(
+            "SELECT key, state FROM schedule WHERE kind = ? AND topic = ?", (kind, topic)
+        )
+        return [((topic, *json.loads(k)), json.loads(st)) for k, st in rows]
+
+    # --- запись (фоновый поток) ---
+
+    def _enqueue(self, op: tuple) -> None:
+        with self._cond:
+            self._queue.append(op)
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        db = None
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                # ждём, пока поток изменений утихнет, и пишем всё разом
+                deadline = time.monotonic() + self.debounce
+                while not (self._closed or self._flush_requested):
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        break
+                    self._cond.wait(left)
+                batch, self._queue = self._queue, []
+                self._flush_requested = False
+                self._busy = bool(batch)
+                closed = self._closed
+            if batch:
+                if db is None:
+                    db = _connect(self.path)
+                try:
+                    self._write(db, batch)
+                finally:
+                    with self._cond:
+                        self._busy = False
+                        self._cond.notify_all()
+            if closed:
+                break
+        if db is not None:
+            db.close()
+
+    @staticmethod
+    def _write(db: sqlite3.Connection, batch: list[tuple]) -> None:
+        with db:
+            db.execute("BEGIN")
+            for op, kind, key, *rest in batch:
+                if op == "add":
+                    db.execute(
+                        "INSERT OR IGNORE INTO progress (kind, topic, key) VALUES (?, ?, ?)",
+                        (kind, key[0], json.dumps(key[1:], ensure_ascii=False)),
+                    )
+                elif op == "discard":
+                    db.execute(
+                        "DELETE FROM progress WHERE kind = ? AND topic = ? AND key = ?",
+                        (kind, key[0], json.dumps(key[1:], ensure_ascii=False)),
+                    )
+                elif op == "schedule":
+                    state = rest[0]
+                    db.execute(
+                        "INSERT OR REPLACE INTO schedule (kind, topic, key, state, due, reps)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (kind, key[0], json.dumps(key[1:], ensure_ascii=False),
+                         json.dumps(state, ensure_ascii=False), state["due"], state["reps"]),
+                    )
+                elif op == "clear":
+                    db.execute("DELETE FROM progress WHERE kind = ?", (kind,))
+                    db.execute("DELETE FROM schedule WHERE kind = ?", (kind,))
+
+    def flush(self) -> None:
+        """Записать очередь сейчас и дождаться окончания записи"""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while (self._queue or self._busy) and self._writer.is_alive():
+                self._cond.wait()
+
+    def close(self) -> None:
+        """Дописать очередь и остановить фоновый поток"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._db.close()
+
+
+class ProgressSet:
+    """
+    Множество ключей прогресса с ленивой загрузкой по темам.
+
+    Поддерживает то, что нужно вкладкам от set: in / add / discard / clear /
+    len, плюс count(topic) без загрузки темы.
+    """
+
+    def __init__(self, store: ProgressStore, kind: str):
+        self._store = store
+        self.kind = kind
+        self._counts = store._counts(kind)           # темы, ещё не загруженные
+        self._topics: dict[str, set[tuple]] = {}      # загруженные темы
+
+    def _topic(self, topic: str) -> set[tuple]:
+        keys = self._topics.get(topic)
+        if keys is None:
+            keys = self._store._load(self.kind, topic) if self._counts.pop(topic, 0) else set()
+            self._topics[topic] = keys
+        return keys
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._topic(key[0])
+
+    def add(self, key: tuple) -> None:
+        keys = self._topic(key[0])
+        if key not in keys:
+            keys.add(key)
+            self._store._enqueue(("add", self.kind, key))
+
+    def discard(self, key: tuple) -> None:
+        keys = self._topic(key[0])
+        if key in keys:
+            keys.discard(key)
+            self._store._enqueue(("discard", self.kind, key))
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._topics.clear()
+        self._store._enqueue(("clear", self.kind, None))
+
+    def count(self, topic: Optional[str] = None) -> int:
+        """Число ключей в теме (нормализованной) или во всех темах"""
+        if topic is None:
+            return sum(self._counts.values()) + sum(map(len, self._topics.values()))
+        if topic in self._topics:
+            return len(self._topics[topic])
+        return self._counts.get(topic, 0)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __iter__(self) -> Iterator[tuple]:
+        for topic in list(self._counts):
+            self._topic(topic)
+        for keys in list(self._topics.values()):
+            yield from keys
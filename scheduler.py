@@ -0,0 +1,202 @@
+"""
+Интервальное повторение в духе SM-2.
+
+У каждой карточки есть срок следующего повторения; сроки лежат в кучах
+(общая и по темам) с ленивым удалением устаревших записей, поэтому выбор
+k ближайших карточек стоит O(k log n) даже на очень больших колодах.
+Сохранённые карточки подгружаются из базы по темам при первом обращении.
+Ответы оцениваются бинарно (верно / неверно), как их видит интерфейс.
+"""
+
+import heapq
+import itertools
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Optional
+
+MINUTE = 60.0
+DAY = 24 * 3600.0
+
+# Шаги заучивания: после ошибки — через минуту, после первого верного ответа — через 10 минут
+LEARNING_STEPS = (1 * MINUTE, 10 * MINUTE)
+GRADUATING_INTERVAL = 1 * DAY
+MIN_EASE = 1.3
+START_EASE = 2.5
+
+
+@dataclass
+class CardState:
+    item: dict = field(default_factory=dict)
+    due: float = 0.0
+    interval: float = 0.0
+    ease: float = START_EASE
+    reps: int = 0          # верных ответов подряд
+    lapses: int = 0
+
+
+def next_state(st: CardState, ok: bool, now: float) -> None:
+    """Обновить состояние карточки после ответа (SM-2 с оценками 4 / 1)"""
+    if not ok:
+        st.lapses += 1
+        st.reps = 0
+        st.ease = max(MIN_EASE, st.ease - 0.2)
+        st.interval = LEARNING_STEPS[0]
+    else:
+        st.reps += 1
+        if st.reps == 1:
+            st.interval = LEARNING_STEPS[1]
+        elif st.reps == 2:
+            st.interval = GRADUATING_INTERVAL
+        else:
+            st.interval = st.interval * st.ease
+    st.due = now + st.interval
+
+
+class Scheduler:
+    """
+    Сроки повторения карточек, ключи — как у прогресса (первый элемент — тема).
+
+    Если передан ProgressStore, состояние загружается из него и сохраняется
+    его фоновым потоком. Как и ProgressSet, тема читается из базы при первом
+    обращении; для выбора по всем темам подгружаются только темы, где срок
+    ближайшей карточки не позже уже найденных.
+    """
+
+    def __init__(self, store=None, kind: str = "words",
+                 clock: Callable[[], float] = time.time):
+        self.kind = kind
+        self.clock = clock
+        self._store = store
+        self._cards: dict[tuple, CardState] = {}
+        self._seq: dict[tuple, int] = {}
+        self._heaps: dict[Optional[str], list] = {None: []}
+        # только карточки, последний ответ по которым был неверным (reps == 0)
+        self._lapsed: dict[Optional[str], list] = {None: []}
+        self._counter = itertools.count()
+        # темы в базе, ещё не загруженные: тема -> число карточек (None — сводка не прочитана)
+        self._unloaded: Optional[dict[str, int]] = None if store is not None else {}
+        # (ближайший срок, тема) незагруженных тем — всех и с невыученными карточками
+        self._unloaded_due: list = []
+        self._unloaded_lapsed: list = []
+
+    def _pending(self) -> dict[str, int]:
+        if self._unloaded is None:
+            self._unloaded = {}
+            for topic, n, due, lapsed_due in self._store._schedule_topics(self.kind):
+                self._unloaded[topic] = n
+                self._unloaded_due.append((due, topic))
+                if lapsed_due is not None:
+                    self._unloaded_lapsed.append((lapsed_due, topic))
+            heapq.heapify(self._unloaded_due)
+            heapq.heapify(self._unloaded_lapsed)
+        return self._unloaded
+
+    def _load(self, topic: str) -> None:
+        """Карточки темы из базы, при первом обращении к теме"""
+        if self._pending().pop(topic, None) is not None:
+            for key, data in self._store._schedule(self.kind, topic):
+                self._set(key, CardState(**data), persist=False)
+
+    def _load_due(self, heap: list, now: float, lapsed: bool) -> None:
+        """
+        Подгружать темы, пока ближайшая (невыученная) карточка незагруженной
+        темы не позже now и раньше вершины загруженной кучи heap.
+        """
+        topics = self._unloaded_lapsed if lapsed else self._unloaded_due
+        while topics and topics[0][0] <= (min(now, heap[0][0]) if heap else now):
+            _due, topic = heapq.heappop(topics)
+            self._load(topic)  # уже загруженная тема — пропускается
+
+    def __len__(self) -> int:
+        return len(self._cards) + sum(self._pending().values())
+
+    def __contains__(self, key: tuple) -> bool:
+        self._load(key[0])
+        return key in self._cards
+
+    def state(self, key: tuple) -> Optional[CardState]:
+        self._load(key[0])
+        return self._cards.get(key)
+
+    def _set(self, key: tuple, st: CardState, persist: bool = True) -> None:
+        seq = next(self._counter)
+        self._cards[key] = st
+        self._seq[key] = seq
+        entry = (st.due, seq, key)
+        heapq.heappush(self._heaps[None], entry)
+        heapq.heappush(self._heaps.setdefault(key[0], []), entry)
+        if st.reps == 0:
+            heapq.heappush(self._lapsed[None], entry)
+            heapq.heappush(self._lapsed.setdefault(key[0], []), entry)
+        if persist and self._store is not None:
+            self._store._enqueue(("schedule", self.kind, key, asdict(st)))
+
+    def review(self, key: tuple, item: dict, ok: bool, now: Optional[float] = None) -> CardState:
+        """Записать ответ по карточке и перепланировать её"""
+        now = self.clock() if now is None else now
+        self._load(key[0])
+        st = self._cards.get(key)
+        st = CardState(item=dict(item)) if st is None else CardState(**asdict(st))
+        next_state(st, ok, now)
+        self._set(key, st)
+        return st
+
+    def due(self, topic: Optional[str], k: int, now: Optional[float] = None,
+            exclude: Optional[Callable[[tuple], bool]] = None,
+            lapsed: bool = False) -> list[dict]:
+        """
+        До k карточек темы (None — все темы), срок которых наступил, самые просроченные первыми.
+
+        lapsed=True — только карточки с неверным последним ответом: их куча не
+        содержит выученных, и обход с exclude не перебирает всю колоду.
+        """
+        now = self.clock() if now is None else now
+        if topic is not None:
+            self._load(topic)
+        else:
+            self._pending()
+        heap = (self._lapsed if lapsed else self._heaps).get(topic)
+        if heap is None:
+            return []
+        picked, keep = [], []
+        while len(picked) < k:
+            if topic is None:
+                # тема из базы нужна, только если её карточка раньше лучшей загруженной
+                self._load_due(heap, now, lapsed)
+            if not heap or heap[0][0] > now:
+                break
+            entry = heapq.heappop(heap)
+            _due, seq, key = entry
+            if self._seq.get(key) != seq:
+                continue  # устаревшая запись: карточку уже перепланировали
+            keep.append(entry)
+            if exclude is None or not exclude(key):
+                picked.append(self._cards[key].item)
+        for entry in keep:
+            heapq.heappush(heap, entry)
+        return picked
+
+    def next_due(self, topic: Optional[str] = None) -> Optional[float]:
+        """Ближайший срок повторения в теме"""
+        if topic is not None:
+            self._load(topic)
+        else:
+            for t in list(self._pending()):
+                self._load(t)
+        heap = self._heaps.get(topic)
+        while heap:
+            _due, seq, key = heap[0]
+            if self._seq.get(key) == seq:
+                return heap[0][0]
+            heapq.heappop(heap)
+        return None
+
+    def clear(self) -> None:
+        """Забыть все карточки (в базе их удаляет ProgressSet.clear того же вида)"""
+        self._cards.clear()
+        self._seq.clear()
+        self._heaps = {None: []}
+        self._lapsed = {None: []}
+        self._unloaded = {}
+        self._unloaded_due = []
+        self._unloaded_lapsed = []
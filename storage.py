@@ -1,8 +1,19 @@
+import io
 import json
+import os
+import tempfile
+import zlib
 from pathlib import Path
+from typing import Iterator
 
 APP_NAME = "DictionaryApp"
 
+# После стольких записей в журнале он сворачивается в новый снимок vocab.json
+COMPACT_EVERY = 500
+
+# Размер блока при потоковом чтении словаря
+READ_CHUNK = 1 << 16
+
 
 def _app_support_dir() -> Path:
     base = Path.home() / "Library" / "Application Support"
@@ -15,26 +26,369 @@ def vocab_path() -> Path:
     return d / "vocab.json"
 
 
-def load_vocab(path: Path | None = None) -> list[dict]:
+def changes_path(path: Path | None = None) -> Path:
+    """Журнал изменений (JSON Lines) рядом со снимком словаря"""
     path = path or vocab_path()
+    return path.with_name(path.stem + ".changes.jsonl")
+
+
+def _fingerprint(data: bytes) -> dict:
+    return {"size": len(data), "crc32": zlib.crc32(data)}
+
+
+def _item_key(item: dict) -> tuple[str, str, str]:
+    return str(item.get("topic", "")), str(item.get("en", "")), str(item.get("ru", ""))
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Записать файл целиком: временный файл рядом, fsync, os.replace"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _dump_snapshot(items: list[dict]) -> bytes:
+    # по слову на строку: файл остаётся читаемым, но без дорогого indent=2
+    body = ",\n".join(json.dumps(it, ensure_ascii=False) for it in items)
+    return ("[\n" + body + "\n]\n" if items else "[]\n").encode("utf-8")
+
+
+def _read_snapshot(path: Path) -> tuple[list[dict], dict]:
+    data = path.read_bytes() if path.exists() else b""
+    if not data:
+        return [], _fingerprint(data)
+
+    items = list(_iter_objects(io.StringIO(data.decode("utf-8"))))
+    return items, _fingerprint(data)
+
+
+def _read_changes(path: Path, fingerprint: dict) -> tuple[list[dict], int]:
+    """
+    Записи журнала, относящиеся к текущему снимку, и длина целой части файла.
+
+    Журнал от другого снимка (например, уже свёрнутый перед сбоем) игнорируется,
+    оборванная последняя строка отбрасывается.
+    """
     if not path.exists():
-        return []
+        return [], 0
+    data = path.read_bytes()
+    end = data.find(b"\n") + 1
+    try:
+        header = json.loads(data[:end]) if end else {}
+    except ValueError:
+        return [], 0
+    if header.get("snapshot") != fingerprint:
+        return [], 0
 
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    records = []
+    valid = end
+    while True:
+        end = data.find(b"\n", valid) + 1
+        if not end:
+            break
+        try:
+            records.append(json.loads(data[valid:end]))
+        except ValueError:
+            break
+        valid = end
+    return records, valid
 
-    if not isinstance(data, list):
+
+def _replay(items: list[dict], records: list[dict]) -> list[dict]:
+    by_key: dict[tuple, list[dict]] = {}
+    for it in items:
+        by_key.setdefault(_item_key(it), []).append(it)
+    removed: set[int] = set()
+
+    def take(key) -> dict | None:
+        bucket = by_key.get(tuple(key))
+        return bucket.pop(0) if bucket else None
+
+    for rec in records:
+        op = rec.get("op")
+        if op == "add":
+            it = dict(rec["item"])
+            items.append(it)
+            by_key.setdefault(_item_key(it), []).append(it)
+        elif op == "remove":
+            it = take(rec["key"])
+            if it is not None:
+                removed.add(id(it))
+        elif op == "update":
+            it = take(rec["key"])
+            if it is not None:
+                it.update(rec["fields"])
+                by_key.setdefault(_item_key(it), []).append(it)
+
+    if removed:
+        items = [it for it in items if id(it) not in removed]
+    return items
+
+
+def load_vocab(path: Path | None = None) -> list[dict]:
+    path = path or vocab_path()
+    items, fp = _read_snapshot(path)
+    records, _ = _read_changes(changes_path(path), fp)
+    return _replay(items, records) if records else items
+
+
+def _fill_topic(it: dict) -> dict:
+    if "topic" not in it or not str(it["topic"]).strip():
+        it["topic"] = "Simple words"
+    return it
+
+
+def _iter_json_array(f) -> Iterator[dict]:
+    """Объекты JSON-массива по одному: raw_decode по буферу, дочитываемому блоками"""
+    decoder = json.JSONDecoder()
+    buf, i, eof = "", 0, False
+
+    def fill() -> bool:
+        nonlocal buf, i, eof
+        chunk = f.read(READ_CHUNK)
+        buf, i = buf[i:] + chunk, 0
+        eof = not chunk
+        return bool(chunk)
+
+    def skip(chars: str) -> None:
+        nonlocal i
+        while True:
+            while i < len(buf) and buf[i] in chars:
+                i += 1
+            if i < len(buf) or not fill():
+                return
+
+    skip(" \t\r\n")
+    if buf[i:i + 1] != "[":
         raise ValueError("vocab.json должен содержать список объектов.")
+    i += 1
+    while True:
+        skip(" \t\r\n,")
+        if i >= len(buf) or buf[i] == "]":
+            return
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, i)
+            except ValueError:
+                if eof or not fill():
+                    raise
+                continue
+            # число или слово на границе блока могло прочитаться не целиком
+            if end == len(buf) and not eof and fill():
+                continue
+            break
+        i = end
+        yield obj
+
+
+def _iter_json_lines(f) -> Iterator[dict]:
+    """
+    По слову на строку. Строка, которая не разбирается как объект слова
+    (с полями en и ru), — значит, это не JSON Lines: например, один объект
+    {"words": [...]} или объект на несколько строк.
+    """
+    for line in f:
+        if not line.strip():
+            continue
+        try:
+            it = json.loads(line)
+        except ValueError:
+            it = None
+        if not isinstance(it, dict) or "en" not in it or "ru" not in it:
+            raise ValueError("vocab.json должен содержать список объектов.")
+        yield it
+
 
-    for it in data:
-        if "topic" not in it or not str(it["topic"]).strip():
-            it["topic"] = "Simple words"
+def _iter_objects(f) -> Iterator[dict]:
+    """Слова из файла словаря: JSON-массив (vocab.json) или JSON Lines, по первому символу"""
+    head = f.read(1)
+    while head and head.isspace():
+        head = f.read(1)
+    f.seek(0)
+    objects = _iter_json_array(f) if head == "[" else _iter_json_lines(f)
+    for it in objects:
+        if not isinstance(it, dict):
+            raise ValueError("vocab.json должен содержать список объектов.")
+        yield _fill_topic(it)
 
-    return data
+
+def _snapshot_fingerprint(path: Path) -> dict:
+    crc, size = 0, 0
+    with path.open("rb") as f:
+        while chunk := f.read(READ_CHUNK):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+    return {"size": size, "crc32": crc}
+
+
+def _changes_pending(log: Path, snapshot_size: int) -> bool:
+    """
+    Есть ли в журнале записи, которые могут относиться к снимку такого размера.
+
+    Читается только заголовок: пустой журнал или журнал от снимка другого
+    размера не стоит полного прохода по снимку ради crc32.
+    """
+    if not log.exists():
+        return False
+    with log.open("rb") as f:
+        header = f.readline()
+        if not f.read(1):
+            return False
+    try:
+        snapshot = json.loads(header).get("snapshot")
+    except (ValueError, AttributeError):
+        return False
+    return isinstance(snapshot, dict) and snapshot.get("size") == snapshot_size
+
+
+def iter_vocab(path: Path | None = None) -> Iterator[dict]:
+    """
+    Слова словаря по мере чтения файла, без разбора его целиком.
+
+    Понимает JSON-массив (vocab.json) и JSON Lines (по объекту на строку).
+    Если в журнале изменений есть записи, они применяются на лету:
+    правки и удаления — к проходящим словам, добавления — в конце.
+    """
+    path = path or vocab_path()
+    if not path.exists():
+        return
+
+    records: list[dict] = []
+    log = changes_path(path)
+    if _changes_pending(log, path.stat().st_size):
+        records, _ = _read_changes(log, _snapshot_fingerprint(path))
+
+    pending: dict[tuple, list[dict]] = {}
+    for rec in records:
+        if rec.get("op") in ("remove", "update"):
+            pending.setdefault(tuple(rec["key"]), []).append(rec)
+
+    def apply(it: dict) -> dict | None:
+        ops = pending.get(_item_key(it))
+        while ops:
+            rec = ops.pop(0)
+            if rec["op"] == "remove":
+                return None
+            it.update(rec["fields"])
+            ops = pending.get(_item_key(it))
+        return it
+
+    with path.open("r", encoding="utf-8") as f:
+        for it in _iter_objects(f):
+            it = apply(it) if pending else it
+            if it is not None:
+                yield it
+
+    for rec in records:
+        if rec.get("op") == "add":
+            it = apply(dict(rec["item"])) if pending else dict(rec["item"])
+            if it is not None:
+                yield it
 
 
 def save_vocab(items: list[dict], path: Path | None = None) -> None:
+    """Полная запись: атомарный снимок и пустой журнал к нему"""
     path = path or vocab_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(items, f, ensure_ascii=False, indent=2)
\ No newline at end of file
+    data = _dump_snapshot(items)
+    _atomic_write(path, data)
+    header = json.dumps({"snapshot": _fingerprint(data)}) + "\n"
+    _atomic_write(changes_path(path), header.encode("utf-8"))
+
+
+class VocabJournal:
+    """
+    Словарь с сохранением через журнал изменений.
+
+    Каждое add / remove / update — одна строка JSON в конце vocab.changes.jsonl
+    (O(1) ввода-вывода, fsync на запись), раз в compact_every записей журнал
+    сворачивается в новый снимок vocab.json через атомарный rename.
+    При сбое теряется не больше последней записи.
+    """
+
+    def __init__(self, path: Path | None = None, compact_every: int = COMPACT_EVERY):
+        self.path = path or vocab_path()
+        self.log_path = changes_path(self.path)
+        self.compact_every = compact_every
+
+        items, fp = _read_snapshot(self.path)
+        records, valid = _read_changes(self.log_path, fp)
+        self.items = _replay(items, records) if records else items
+        self.pending = len(records)
+
+        if valid:
+            # отрезаем оборванный хвост, дальше только дописываем
+            with self.log_path.open("r+b") as f:
+                f.truncate(valid)
+        else:
+            header = json.dumps({"snapshot": fp}) + "\n"
+            _atomic_write(self.log_path, header.encode("utf-8"))
+        self._log = self.log_path.open("a", encoding="utf-8")
+
+    def _append(self, record: dict) -> None:
+        self._log.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.compact()
+
+    def add(self, item: dict) -> None:
+        """Добавить слово"""
+        if "topic" not in item or not str(item["topic"]).strip():
+            item["topic"] = "Simple words"
+        self.items.append(item)
+        self._append({"op": "add", "item": item})
+
+    def remove(self, item: dict) -> None:
+        """Удалить слово (тот же объект, что лежит в items)"""
+        for i, it in enumerate(self.items):
+            if it is item:
+                del self.items[i]
+                break
+        else:
+            raise ValueError("слова нет в словаре")
+        self._append({"op": "remove", "key": _item_key(item)})
+
+    def update(self, item: dict, **fields) -> None:
+        """Изменить поля слова на месте"""
+        key = _item_key(item)
+        item.update(fields)
+        self._append({"op": "update", "key": key, "fields": fields})
+
+    def compact(self) -> None:
+        """Свернуть журнал в новый снимок"""
+        self._log.close()
+        save_vocab(self.items, self.path)
+        self.pending = 0
+        self._log = self.log_path.open("a", encoding="utf-8")
+
+    def close(self) -> None:
+        if not self._log.closed:
+            self._log.close()
+
+
+def grammar_cache_path() -> Path:
+    return vocab_path().parent / "grammar_cache.sqlite3"
+
+
+def deck_path() -> Path:
+    return vocab_path().parent / "vocab.deck"
+
+
+def vocab_db_path() -> Path:
+    return vocab_path().parent / "vocab.sqlite3"
+
+
+def progress_path() -> Path:
+    return vocab_path().parent / "progress.sqlite3"
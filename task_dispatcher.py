@@ -0,0 +1,276 @@
+"""
+Диспетчер фоновых задач Qt-интерфейса.
+
+Задачи выполняются на собственном QThreadPool. Их результаты, а также всё,
+что фоновый код передаёт через post(), копятся в очереди и доставляются в
+поток интерфейса пачками: один вызов из цикла событий на всё, что успело
+накопиться за coalesce_ms. Виджеты трогаются только из потока интерфейса.
+
+Диспетчер считает глубину очереди, время ожидания и выполнения задач и
+задержку доставки результатов (stats()).
+"""
+
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, Signal, Slot
+
+MAX_THREADS = 4
+COALESCE_MS = 16  # примерно один кадр
+
+
+@dataclass
+class DispatchStats:
+    """
+    Счётчики диспетчера (stats()).
+
+    Учитываются только задачи, запущенные через submit(). Проверки
+    грамматики идут на собственном пуле grammar_online и в очередь и время
+    выполнения не попадают; их колбэки, переданные через post(), видны
+    лишь в pending и задержке доставки.
+    """
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    queued: int = 0          # ждут свободного потока
+    running: int = 0
+    pending: int = 0         # готовы и ждут доставки в поток интерфейса
+    max_queued: int = 0
+    batches: int = 0
+    delivered: int = 0
+    wait_ms: float = 0.0     # сумма: от submit до начала выполнения
+    run_ms: float = 0.0
+    delivery_ms: float = 0.0  # сумма: от готовности до вызова в потоке интерфейса
+    max_delivery_ms: float = 0.0
+
+    @property
+    def avg_wait_ms(self) -> float:
+        started = self.completed + self.failed
+        return self.wait_ms / started if started else 0.0
+
+    @property
+    def avg_run_ms(self) -> float:
+        started = self.completed + self.failed
+        return self.run_ms / started if started else 0.0
+
+    @property
+    def avg_delivery_ms(self) -> float:
+        return self.delivery_ms / self.delivered if self.delivered else 0.0
+
+    @property
+    def avg_batch(self) -> float:
+        return self.delivered / self.batches if self.batches else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"queued {self.queued} (max {self.max_queued}), running {self.running}, "
+            f"pending {self.pending}; wait {self.avg_wait_ms:.1f}ms, "
+            f"run {self.avg_run_ms:.1f}ms, delivery {self.avg_delivery_ms:.1f}ms "
+            f"(max {self.max_delivery_ms:.1f}ms), {self.avg_batch:.1f} per batch"
+        )
+
+
+class Task(QRunnable):
+    """Одна фоновая задача; cancel() гарантирует, что её результат не будет доставлен"""
+
+    def __init__(self, dispatcher: "TaskDispatcher", fn: Callable, args: tuple,
+                 on_result: Optional[Callable], on_error: Optional[Callable], name: str):
+        super().__init__()
+        self.setAutoDelete(False)  # ссылку держит диспетчер до завершения
+        self.name = name or getattr(fn, "__name__", "task")
+        self._dispatcher = dispatcher
+        self._fn = fn
+        self._args = args
+        self._on_result = on_result
+        self._on_error = on_error
+        self._cancelled = False
+        self.submitted_at = time.perf_counter()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        self._cancelled = True
+        self._dispatcher._cancel(self)
+
+    def run(self) -> None:
+        d = self._dispatcher
+        if not d._start(self):
+            return
+        t0 = time.perf_counter()
+        try:
+            result = self._fn(*self._args)
+        except Exception as e:
+            d._finish(self, t0, None, e)
+        else:
+            d._finish(self, t0, result, None)
+
+
+def _print_error(task_name: str, error: BaseException) -> None:
+    print(f"background task {task_name!r} failed:", file=sys.stderr)
+    traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
+
+
+class TaskDispatcher(QObject):
+    """
+    Фоновые задачи на QThreadPool с доставкой результатов в поток интерфейса.
+
+    Создаётся в потоке интерфейса. submit() запускает fn(*args) в пуле,
+    on_result(result) / on_error(exc) вызываются в потоке интерфейса.
+    post() и to_gui() переносят в поток интерфейса вызовы из чужих потоков
+    (например, колбэки пула проверок grammar_online).
+    """
+
+    # из любого потока в поток интерфейса: в очереди появились результаты
+    _wake = Signal()
+
+    def __init__(self, max_threads: int = MAX_THREADS, coalesce_ms: int = COALESCE_MS,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._lock = threading.Lock()
+        self._pending: deque = deque()
+        self._wake_sent = False
+        self._closed = False
+        self._tasks: set[Task] = set()
+        self._stats = DispatchStats()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(coalesce_ms)
+        self._timer.timeout.connect(self._drain)
+        self._wake.connect(self._schedule_drain, Qt.ConnectionType.QueuedConnection)
+
+    # --- задачи ---
+
+    def submit(self, fn: Callable, *args, on_result: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               name: str = "") -> Task:
+        """Выполнить fn(*args) в пуле"""
+        task = Task(self, fn, args, on_result, on_error, name)
+        with self._lock:
+            if self._closed:
+                task._cancelled = True
+                return task
+            self._tasks.add(task)
+            st = self._stats
+            st.submitted += 1
+            st.queued += 1
+            st.max_queued = max(st.max_queued, st.queued)
+        self._pool.start(task)
+        return task
+
+    def _start(self, task: Task) -> bool:
+        with self._lock:
+            st = self._stats
+            st.queued -= 1
+            if task.cancelled:
+                st.cancelled += 1
+                self._tasks.discard(task)
+                return False
+            st.running += 1
+            st.wait_ms += (time.perf_counter() - task.submitted_at) * 1000
+            return True
+
+    def _finish(self, task: Task, t0: float, result: Any, error: Optional[BaseException]) -> None:
+        with self._lock:
+            st = self._stats
+            st.running -= 1
+            st.run_ms += (time.perf_counter() - t0) * 1000
+            if error is None:
+                st.completed += 1
+            else:
+                st.failed += 1
+        if error is None:
+            if task._on_result is not None:
+                self.post(self._deliver, task, task._on_result, result)
+        elif task._on_error is not None:
+            self.post(self._deliver, task, task._on_error, error)
+        else:
+            self.post(_print_error, task.name, error)
+        with self._lock:
+            self._tasks.discard(task)
+
+    def _cancel(self, task: Task) -> None:
+        # ещё в очереди пула — убираем оттуда, иначе результат отбросится при доставке
+        if self._pool.tryTake(task):
+            with self._lock:
+                st = self._stats
+                st.queued -= 1
+                st.cancelled += 1
+                self._tasks.discard(task)
+
+    @staticmethod
+    def _deliver(task: Task, callback: Callable, value: Any) -> None:
+        if not task.cancelled:
+            callback(value)
+
+    # --- доставка в поток интерфейса ---
+
+    def post(self, callback: Callable, *args) -> None:
+        """Вызвать callback(*args) в потоке интерфейса; можно звать из любого потока"""
+        with self._lock:
+            if self._closed:
+                return
+            self._pending.append((callback, args, time.perf_counter()))
+            wake = not self._wake_sent
+            self._wake_sent = True
+        if wake:
+            self._wake.emit()
+
+    def to_gui(self, callback: Callable) -> Callable:
+        """Обёртка callback, которую можно вызывать из любого потока"""
+        return lambda *args: self.post(callback, *args)
+
+    @Slot()
+    def _schedule_drain(self) -> None:
+        # пачка копится COALESCE_MS, затем доставляется одним проходом
+        if not self._timer.isActive():
+            self._timer.start()
+
+    @Slot()
+    def _drain(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, deque()
+            self._wake_sent = False
+        if not batch:
+            return
+        now = time.perf_counter()
+        delays = [(now - t) * 1000 for _cb, _args, t in batch]
+        with self._lock:
+            st = self._stats
+            st.batches += 1
+            st.delivered += len(batch)
+            st.delivery_ms += sum(delays)
+            st.max_delivery_ms = max(st.max_delivery_ms, max(delays))
+        for callback, args, _t in batch:
+            try:
+                callback(*args)
+            except Exception:
+                traceback.print_exc()
+
+    # --- состояние ---
+
+    def stats(self) -> DispatchStats:
+        with self._lock:
+            return replace(self._stats, pending=len(self._pending))
+
+    def shutdown(self, wait_ms: int = 5000) -> bool:
+        """Снять задачи из очереди и дождаться выполняющихся; результаты больше не доставляются"""
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        self._timer.stop()
+        return self._pool.waitForDone(wait_ms)
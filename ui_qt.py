@@ -1,7 +1,10 @@
+import contextlib
+import itertools
+import math
+import os
 import sys
-import random
-import re
 import threading
+import time
 from typing import List, Set, Dict
 from dataclasses import dataclass
 
@@ -14,7 +17,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import (
     Qt, QSize, QThread, Signal, Slot, QTimer, QPropertyAnimation,
-    QEasingCurve, QRect, QPoint
+    QEasingCurve, QRect, QPoint, QEvent, QObject
 )
 from PySide6.QtGui import (
     QFont, QPalette, QColor, QTextCursor, QTextCharFormat,
@@ -22,9 +25,27 @@ from PySide6.QtGui import (
     QLinearGradient, QBrush, QPen, QFontMetrics, QAction
 )
 
-from grammar_online import TENSES, check_sentence, lt_online, SentenceCheckResult
-from storage import load_vocab, save_vocab
-from words_seed import SEED_WORDS
+from storage import (
+    changes_path, deck_path, iter_vocab, save_vocab, progress_path, vocab_db_path, vocab_path
+)
+from progress import ProgressStore
+from scheduler import Scheduler
+from deck import CompiledDeck, is_fresh
+from task_dispatcher import TaskDispatcher
+from connectivity import OFFLINE, ONLINE
+from vocab_index import ALL_TOPICS, Entry, RemainingPool, TopicIndex, VocabIndex, _norm
+
+# grammar_online (а с ним requests), words_seed и вкладка предложений
+# импортируются и строятся при первом обращении, а не при запуске.
+
+# Мониторинг соединения запускается после показа окна (мс)
+ONLINE_CHECK_DELAY = 1500
+SENTENCES_TAB = 1
+
+# Замер запуска собранного приложения (benchmarks/bench_bundle.py): если
+# переменная задана, время первой отрисовки окна пишется в этот файл и
+# приложение закрывается
+STARTUP_PROBE_ENV = "METHOD_STARTUP_PROBE"
 
 # ============================================================================
 # Стили и цвета (аналогично tkinter версии)
@@ -55,48 +76,33 @@ class Fonts:
 # Вспомогательные функции
 # ============================================================================
 
-def _norm(s: str) -> str:
-    s = str(s).strip().lower()
-    s = s.replace("ё", "е")
-    s = " ".join(s.split())
-    return s
+def _card_key_words(item: Entry) -> tuple[str, str, str]:
+    return item.card_key
 
-def _extract_variants(text: str) -> set[str]:
-    s = str(text)
-    s = re.sub(r"\[.*?\]|\(.*?\)", "", s)
-    s = s.split(":")[0]
-    s = s.replace("—", "-").replace("–", "-")
-    parts = re.split(r"\s*(?:,|;|/|\||-| или | or )\s*", s, flags=re.IGNORECASE)
-    return {_norm(p) for p in parts if _norm(p)}
+def _word_key_sentence(item: Entry) -> tuple[str, str]:
+    return item.word_key
 
-def _ru_to_en_index(items: list) -> dict[str, set[str]]:
-    idx: dict[str, set[str]] = {}
-    for it in items:
-        en = _norm(it.get("en", ""))
-        ru = it.get("ru", "")
-        for ru_var in _extract_variants(ru):
-            idx.setdefault(ru_var, set()).add(en)
-    return idx
+def _pick_cards(pool, schedule, done, topic: str, k: int, key) -> list[Entry]:
+    """
+    Карточки на раунд: сначала те, которым пора на повторение, затем новые
+    слова темы, а если новых нет — невыученные карточки раньше срока.
+    """
+    topic_key = None if topic == ALL_TOPICS else _norm(topic)
+    picked = [Entry.from_item(it) for it in schedule.due(topic_key, k)]
+    seen = {key(it) for it in picked}
+    if len(picked) < k:
+        picked += pool.sample(topic, k - len(picked), exclude=lambda it: key(it) in schedule)
+    if len(picked) < k:
+        # невыученные — это карточки с неверным последним ответом, их и обходим
+        picked += map(Entry.from_item, schedule.due(
+            topic_key, k - len(picked), now=math.inf,
+            exclude=lambda ck: ck in done or ck in seen, lapsed=True
+        ))
+    return picked
 
-def _en_to_ru_index(items: list) -> dict[str, set[str]]:
-    idx: dict[str, set[str]] = {}
-    for it in items:
-        en = it.get("en", "")
-        ru = it.get("ru", "")
-        en_vars = _extract_variants(en)
-        ru_vars = _extract_variants(ru)
-        for e in en_vars:
-            idx.setdefault(e, set()).update(ru_vars)
-    return idx
-
-def _card_key_words(item: dict) -> tuple[str, str, str]:
-    topic = _norm(item.get("topic", "Simple words"))
-    en = _norm(item.get("en", ""))
-    ru = _norm(item.get("ru", ""))
-    return topic, en, ru
-
-def _word_key_sentence(item: dict) -> tuple[str, str]:
-    return _norm(item.get("topic", "Simple words")), _norm(item.get("en", ""))
+# Сколько слов читается до первого показа окна; остальное — в фоне пачками
+FIRST_PAINT_WORDS = 500
+LOAD_BATCH = 2000
 
 # ============================================================================
 # Кастомные виджеты
@@ -175,12 +181,63 @@ class FastTextEdit(QTextEdit):
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.items = load_vocab()
-        self.online_status = "Checking..."
+        # все фоновые задачи окна; результаты приходят в поток интерфейса
+        self.dispatcher = TaskDispatcher(parent=self)
+        self._vocab_stream = None
+        self._stop_loading = threading.Event()
+        if vocab_db_path().exists():
+            # словарь в SQLite: темы, выборки и переводы — запросами к базе
+            from vocab_db import VocabDB
+            self.store = VocabDB(vocab_db_path())
+            self.index = self.store
+        elif is_fresh(deck_path(), vocab_path(), changes_path()):
+            # скомпилированная колода: открывается через mmap без разбора
+            self.store = CompiledDeck(deck_path())
+            self.index = self.store
+        else:
+            # первые слова — сразу, чтобы окно появилось до разбора всего файла
+            stream = iter_vocab()
+            first = [Entry.from_item(it) for it in itertools.islice(stream, FIRST_PAINT_WORDS)]
+            self.store = TopicIndex(first)
+            self.index = VocabIndex(first)
+            self._vocab_stream = stream
+        self.progress = ProgressStore(progress_path())
+        self.schedules = {
+            kind: Scheduler(self.progress, kind) for kind in ("words", "sentences")
+        }
+        # общий статус LanguageTool (grammar_online.get_monitor), после запуска
+        self.connectivity = None
         
         self._init_ui()
         self._setup_shortcuts()
-        self._check_online_status()
+        QTimer.singleShot(ONLINE_CHECK_DELAY, self._start_connectivity)
+        if self._vocab_stream is not None:
+            self.dispatcher.submit(self._load_vocab_rest, self._vocab_stream, name="vocab")
+    
+    def _load_vocab_rest(self, stream):
+        """Фоновое чтение остатка словаря; пачки Entry уходят в поток интерфейса"""
+        while not self._stop_loading.is_set():
+            batch = [Entry.from_item(it) for it in itertools.islice(stream, LOAD_BATCH)]
+            if not batch:
+                break
+            self.dispatcher.post(self._on_vocab_batch, batch)
+    
+    def _on_vocab_batch(self, entries):
+        """Очередная пачка слов из фонового загрузчика"""
+        for e in entries:
+            self.store.add(e)
+            self.index.add(e)
+        self.words_tab.on_vocab_added(entries)
+        if self.sentences_tab is not None:
+            self.sentences_tab.on_vocab_added(entries)
+    
+    def shutdown(self):
+        """Остановка фоновых задач перед выходом"""
+        self._stop_loading.set()
+        if self.connectivity is not None:
+            self.connectivity.close()
+        self.dispatcher.shutdown()
+        self.progress.close()
         
     def _init_ui(self):
         """Инициализация интерфейса"""
@@ -242,11 +299,15 @@ class MainWindow(QMainWindow):
         """)
         
         # Создаем вкладки
-        self.words_tab = WordsTab(self.items)
-        self.sentences_tab = SentencesTab(self.items, self)
+        self.words_tab = WordsTab(
+            self.store, self.index, self.progress.get("words"), self.schedules["words"]
+        )
+        # вкладка предложений строится при первом открытии
+        self.sentences_tab = None
         
         self.tab_widget.addTab(self.words_tab, "📚 Vocabulary Practice")
-        self.tab_widget.addTab(self.sentences_tab, "✍️ Sentence Builder")
+        self.tab_widget.addTab(QWidget(), "✍️ Sentence Builder")
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
         main_layout.addWidget(self.tab_widget, 1)
         
@@ -345,6 +406,24 @@ class MainWindow(QMainWindow):
         self.cut_shortcut = QShortcut(QKeySequence("Ctrl+X"), self)
         self.cut_shortcut.activated.connect(self._on_cut)
     
+    @Slot(int)
+    def _on_tab_changed(self, index):
+        """Переключение вкладок"""
+        if index == SENTENCES_TAB and self.sentences_tab is None:
+            self._build_sentences_tab()
+    
+    def _build_sentences_tab(self):
+        """Создание вкладки предложений вместо заглушки"""
+        self.sentences_tab = SentencesTab(self.store, self)
+        placeholder = self.tab_widget.widget(SENTENCES_TAB)
+        title = self.tab_widget.tabText(SENTENCES_TAB)
+        self.tab_widget.blockSignals(True)
+        self.tab_widget.removeTab(SENTENCES_TAB)
+        self.tab_widget.insertTab(SENTENCES_TAB, self.sentences_tab, title)
+        self.tab_widget.setCurrentIndex(SENTENCES_TAB)
+        self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+    
     @Slot()
     def _on_check_activated(self):
         """Обработка Enter"""
@@ -422,35 +501,54 @@ class MainWindow(QMainWindow):
         if isinstance(focus_widget, (QTextEdit, QLineEdit)):
             focus_widget.cut()
     
+    def _start_connectivity(self):
+        """
+        Статус LanguageTool: выводится из результатов настоящих проверок,
+        активные пробы (с растущими паузами) — только пока нет связи
+        """
+        if self.connectivity is not None:
+            return
+        from grammar_online import get_monitor
+        self.connectivity = get_monitor()
+        self.connectivity.subscribe(self.dispatcher.to_gui(self._on_online_status))
+        self._on_online_status(self.connectivity.status)
+        self.connectivity.start()
+    
     def _check_online_status(self):
-        """Проверка статуса подключения"""
-        def check():
-            ok = lt_online(timeout=2)
-            status = "Online" if ok else "Offline"
-            color = Colors.text_success if ok else Colors.text_error
-            
-            self.online_label.setText(status)
-            self.online_label.setStyleSheet(f"color: {color.name()};")
-            
-            # Планируем следующую проверку
-            QTimer.singleShot(30000, self._check_online_status)
+        """Проверка статуса подключения по кнопке"""
+        if self.connectivity is None:
+            self._start_connectivity()
+        else:
+            self.connectivity.probe_now()
+    
+    def _on_online_status(self, status):
+        """Новый статус подключения (в потоке интерфейса)"""
+        if status == ONLINE:
+            text, color = "Online", Colors.text_success
+        elif status == OFFLINE:
+            text, color = "Offline", Colors.text_error
+        else:
+            text, color = "Checking...", Colors.text_accent
         
-        # Запускаем в отдельном потоке
-        thread = threading.Thread(target=check, daemon=True)
-        thread.start()
+        self.online_label.setText(text)
+        self.online_label.setStyleSheet(f"color: {color.name()};")
 
 # ============================================================================
 # Вкладка Vocabulary Practice
 # ============================================================================
 
 class WordsTab(QWidget):
-    def __init__(self, items):
+    def __init__(self, store, index, learned, schedule):
         super().__init__()
-        self.items = items
+        self.store = store
+        self.index = index
         self.current = []
-        self.learned = set()
+        self.learned = learned
+        self.pool = RemainingPool(store, learned, _card_key_words)
+        self.schedule = schedule
+        self._graded = set()
         self.mode = "EN_TO_RU"
-        self.current_topic = "All topics"
+        self.current_topic = ALL_TOPICS
         
         self._init_ui()
         self._refresh_stats()
@@ -489,7 +587,7 @@ class WordsTab(QWidget):
         self.topic_combo.setFont(Fonts.small)
         self.topic_combo.setFixedWidth(200)
         self.topic_combo.addItems(self._topics())
-        self.topic_combo.setCurrentText("All topics")
+        self.topic_combo.setCurrentText(ALL_TOPICS)
         self.topic_combo.currentTextChanged.connect(self._on_topic_changed)
         
         # Выбор режима
@@ -620,19 +718,7 @@ class WordsTab(QWidget):
     
     def _topics(self):
         """Получение списка тем"""
-        topics = sorted({str(it.get("topic", "Simple words")) for it in self.items})
-        return ["All topics"] + topics
-    
-    def _topic_pool_all(self):
-        """Все слова в выбранной теме"""
-        if self.current_topic == "All topics":
-            return self.items
-        return [it for it in self.items if str(it.get("topic", "Simple words")) == self.current_topic]
-    
-    def _topic_pool_remaining(self):
-        """Оставшиеся слова в теме"""
-        pool = self._topic_pool_all()
-        return [it for it in pool if _card_key_words(it) not in self.learned]
+        return [ALL_TOPICS] + self.store.topics()
     
     @Slot()
     def _on_topic_changed(self, topic):
@@ -641,6 +727,20 @@ class WordsTab(QWidget):
         self._refresh_stats()
         self.next_round()
     
+    def on_vocab_added(self, entries):
+        """Дозагруженные слова: новые темы в списке, пул и статистика"""
+        topics = self._topics()
+        if topics != [self.topic_combo.itemText(i) for i in range(self.topic_combo.count())]:
+            self.topic_combo.blockSignals(True)
+            self.topic_combo.clear()
+            self.topic_combo.addItems(topics)
+            self.topic_combo.setCurrentText(self.current_topic)
+            self.topic_combo.blockSignals(False)
+        self.pool.extend(entries)
+        self._refresh_stats()
+        if not self.current:
+            self.next_round()
+    
     @Slot()
     def _on_mode_changed(self):
         """Обработка изменения режима"""
@@ -652,8 +752,8 @@ class WordsTab(QWidget):
     
     def _refresh_stats(self):
         """Обновление статистики"""
-        total = len(self._topic_pool_all())
-        remaining = len(self._topic_pool_remaining())
+        total = self.store.count(self.current_topic)
+        remaining = min(self.pool.count(self.current_topic), total)
         done = total - remaining
         progress = (done / total * 100) if total > 0 else 0
         
@@ -667,17 +767,22 @@ class WordsTab(QWidget):
     
     def _get_prompt_and_expected(self, item):
         """Получение промпта и ожидаемого ответа"""
-        en = item.get("en", "")
-        ru = item.get("ru", "")
-        return (en, ru) if self.mode == "EN_TO_RU" else (ru, en)
+        return (item.en, item.ru) if self.mode == "EN_TO_RU" else (item.ru, item.en)
+    
+    def _expected_variants(self, item):
+        """Допустимые варианты ответа (посчитаны при загрузке)"""
+        return item.ru_variants if self.mode == "EN_TO_RU" else item.en_variants
     
     @Slot()
     def next_round(self):
         """Следующий раунд"""
-        pool = self._topic_pool_remaining()
+        picked = _pick_cards(
+            self.pool, self.schedule, self.learned, self.current_topic, 3, _card_key_words
+        )
+        self._graded = set()
         self._refresh_stats()
         
-        if len(pool) == 0:
+        if not picked:
             for i in range(3):
                 self.prompt_labels[i].setText("🎉 Congratulations!")
                 self.entry_edits[i].clear()
@@ -685,8 +790,8 @@ class WordsTab(QWidget):
                 self.result_labels[i].setStyleSheet(f"color: {Colors.text_success.name()};")
             return
         
-        take = min(3, len(pool))
-        self.current = random.sample(pool, take)
+        take = len(picked)
+        self.current = picked
         
         for i in range(3):
             if i < take:
@@ -726,60 +831,59 @@ class WordsTab(QWidget):
         
         item = self.current[idx]
         prompt = self.prompt_labels[idx].text()
-        _, expected = self._get_prompt_and_expected(item)
         user = self.entry_edits[idx].text()
         
         user_norm = _norm(user)
-        expected_variants = _extract_variants(expected)
-        ok = user_norm in expected_variants
+        ok = user_norm in self._expected_variants(item)
+        if not ok:
+            ok = user_norm in self.index.translations(prompt, self.mode)
         
+        self._grade(idx, item, user_norm, ok)
         if ok:
             self.result_labels[idx].setText("✅ Correct!")
             self.result_labels[idx].setStyleSheet(f"color: {Colors.text_success.name()};")
-            self.learned.add(_card_key_words(item))
+            self.pool.mark(item)
             self._refresh_stats()
         else:
             self.result_labels[idx].setText("❌ Try again")
             self.result_labels[idx].setStyleSheet(f"color: {Colors.text_error.name()};")
     
+    def _grade(self, idx, item, answer, ok):
+        """Первый непустой ответ по карточке за раунд идёт в расписание повторений"""
+        if not answer or idx in self._graded:
+            return
+        self._graded.add(idx)
+        key = _card_key_words(item)
+        self.schedule.review(key, item.to_item(), ok)
+        if not ok:
+            # забытое слово снова считается невыученным
+            self.pool.unmark(item)
+    
     @Slot()
     def check(self):
         """Проверка всех слов"""
         if not self.current:
             return
         
-        ru_index = _ru_to_en_index(self.items)
-        en_index = _en_to_ru_index(self.items)
-        
         for i in range(3):
             if i >= len(self.current):
                 continue
             
             item = self.current[i]
             prompt = self.prompt_labels[i].text()
-            _, expected = self._get_prompt_and_expected(item)
             user = self.entry_edits[i].text()
             
             user_norm = _norm(user)
-            expected_variants = _extract_variants(expected)
-            ok = user_norm in expected_variants
+            ok = user_norm in self._expected_variants(item)
             
             if not ok:
-                if self.mode == "RU_TO_EN":
-                    poss_en = set()
-                    for ru_v in _extract_variants(prompt):
-                        poss_en |= ru_index.get(ru_v, set())
-                    ok = user_norm in poss_en
-                elif self.mode == "EN_TO_RU":
-                    poss_ru = set()
-                    for en_v in _extract_variants(prompt):
-                        poss_ru |= en_index.get(en_v, set())
-                    ok = user_norm in poss_ru
+                ok = user_norm in self.index.translations(prompt, self.mode)
             
+            self._grade(i, item, user_norm, ok)
             if ok:
                 self.result_labels[i].setText("✅ Correct!")
                 self.result_labels[i].setStyleSheet(f"color: {Colors.text_success.name()};")
-                self.learned.add(_card_key_words(item))
+                self.pool.mark(item)
             else:
                 self.result_labels[i].setText("❌ Incorrect - try again")
                 self.result_labels[i].setStyleSheet(f"color: {Colors.text_error.name()};")
@@ -789,7 +893,8 @@ class WordsTab(QWidget):
     @Slot()
     def reset_progress(self):
         """Сброс прогресса"""
-        self.learned.clear()
+        self.pool.clear()
+        self.schedule.clear()
         self._refresh_stats()
         self.next_round()
         QMessageBox.information(self, "Progress Reset", "Your progress has been reset!")
@@ -799,15 +904,21 @@ class WordsTab(QWidget):
 # ============================================================================
 
 class SentencesTab(QWidget):
-    def __init__(self, items, main_window):
+    def __init__(self, store, main_window):
         super().__init__()
-        self.items = items
+        self.store = store
         self.main_window = main_window
         self.current_words = []
-        self.used_words = set()
-        self.current_topic = "All topics"
+        self.used_words = main_window.progress.get("sentences")
+        self.pool = RemainingPool(store, self.used_words, _word_key_sentence)
+        self.schedule = main_window.schedules["sentences"]
+        self._graded = set()
+        self.current_topic = ALL_TOPICS
+        from grammar_online import TENSES
         self.current_tense = TENSES[0]
         self.last_matches = [[] for _ in range(5)]
+        self._check_round = None
+        self._round_id = 0
         
         self._init_ui()
         self._refresh_stats()
@@ -846,10 +957,11 @@ class SentencesTab(QWidget):
         self.topic_combo.setFont(Fonts.small)
         self.topic_combo.setFixedWidth(200)
         self.topic_combo.addItems(self._topics())
-        self.topic_combo.setCurrentText("All topics")
+        self.topic_combo.setCurrentText(ALL_TOPICS)
         self.topic_combo.currentTextChanged.connect(self._on_topic_changed)
         
         # Выбор времени
+        from grammar_online import TENSES
         tense_label = QLabel("Tense:")
         tense_label.setFont(Fonts.body)
         
@@ -968,19 +1080,7 @@ class SentencesTab(QWidget):
     
     def _topics(self):
         """Получение списка тем"""
-        topics = sorted({str(it.get("topic", "Simple words")) for it in self.items})
-        return ["All topics"] + topics
-    
-    def _topic_pool_all(self):
-        """Все слова в выбранной теме"""
-        if self.current_topic == "All topics":
-            return self.items
-        return [it for it in self.items if str(it.get("topic", "Simple words")) == self.current_topic]
-    
-    def _topic_pool_remaining(self):
-        """Оставшиеся слова в теме"""
-        pool = self._topic_pool_all()
-        return [it for it in pool if _word_key_sentence(it) not in self.used_words]
+        return [ALL_TOPICS] + self.store.topics()
     
     @Slot()
     def _on_topic_changed(self, topic):
@@ -989,6 +1089,20 @@ class SentencesTab(QWidget):
         self._refresh_stats()
         self.next_words()
     
+    def on_vocab_added(self, entries):
+        """Дозагруженные слова: новые темы в списке, пул и статистика"""
+        topics = self._topics()
+        if topics != [self.topic_combo.itemText(i) for i in range(self.topic_combo.count())]:
+            self.topic_combo.blockSignals(True)
+            self.topic_combo.clear()
+            self.topic_combo.addItems(topics)
+            self.topic_combo.setCurrentText(self.current_topic)
+            self.topic_combo.blockSignals(False)
+        self.pool.extend(entries)
+        self._refresh_stats()
+        if not self.current_words:
+            self.next_words()
+    
     @Slot()
     def _on_tense_changed(self, tense):
         """Обработка изменения времени"""
@@ -996,8 +1110,8 @@ class SentencesTab(QWidget):
     
     def _refresh_stats(self):
         """Обновление статистики"""
-        total = len(self._topic_pool_all())
-        remaining = len(self._topic_pool_remaining())
+        total = self.store.count(self.current_topic)
+        remaining = min(self.pool.count(self.current_topic), total)
         done = total - remaining
         progress = (done / total * 100) if total > 0 else 0
         
@@ -1012,10 +1126,14 @@ class SentencesTab(QWidget):
     @Slot()
     def next_words(self):
         """Следующий набор слов"""
-        pool = self._topic_pool_remaining()
+        self._cancel_check()
+        picked = _pick_cards(
+            self.pool, self.schedule, self.used_words, self.current_topic, 5, _word_key_sentence
+        )
+        self._graded = set()
         self._refresh_stats()
         
-        if len(pool) == 0:
+        if not picked:
             for i in range(5):
                 self.word_labels[i].setText("🎉 Congratulations!")
                 self.result_labels[i].setText("You've practiced all words in this topic!")
@@ -1023,12 +1141,12 @@ class SentencesTab(QWidget):
                 self.text_edits[i].clear()
             return
         
-        take = min(5, len(pool))
-        self.current_words = random.sample(pool, take)
+        take = len(picked)
+        self.current_words = picked
         
         for i in range(5):
             if i < take:
-                self.word_labels[i].setText(self.current_words[i].get("en", ""))
+                self.word_labels[i].setText(self.current_words[i].en)
                 self.result_labels[i].clear()
                 self.result_labels[i].setStyleSheet("")
             else:
@@ -1060,10 +1178,9 @@ class SentencesTab(QWidget):
         if not self.current_words:
             return
         
-        # Проверка онлайн-статуса
-        if self.main_window.online_label.text() != "Online":
-            QMessageBox.warning(self, "Offline", "Grammar check requires internet connection.")
-            return
+        # Без сети проверяем локальными правилами (и кэшем LanguageTool)
+        from grammar_online import TENSES, get_monitor, submit_sentences_check
+        offline = not get_monitor().online
         
         tense = self.current_tense.strip() or TENSES[0]
         
@@ -1071,57 +1188,78 @@ class SentencesTab(QWidget):
         for i in range(5):
             if i >= len(self.current_words):
                 continue
-            word = self.current_words[i].get("en", "")
+            word = self.current_words[i].en
             sentence = self.text_edits[i].toPlainText().strip()
             words.append(word)
             sentences.append(sentence)
             idx_map.append(i)
         
+        # Отменяем предыдущую проверку, если она ещё идёт
+        self._cancel_check()
+        round_id = self._round_id
+        
         # Визуальная обратная связь
         self.check_btn.setText("Checking...")
         self.check_btn.setEnabled(False)
         
-        def worker():
-            results = []
-            for k, sentence in enumerate(sentences):
-                if not sentence:
-                    results.append((False, "Please write a sentence", [], False))
-                    continue
-                try:
-                    res = check_sentence(
-                        sentence=sentence,
-                        required_word=words[k],
-                        tense=tense
-                    )
-                    results.append((True, res.message, res.matches or [], res.ok))
-                except Exception as e:
-                    results.append((False, f"Error: {str(e)[:50]}", [], False))
+        todo = [k for k, sentence in enumerate(sentences) if sentence]
+        
+        def on_done(batch):
+            if round_id != self._round_id:
+                return
+            results = [(False, "Please write a sentence", [], False)] * len(sentences)
+            for k, res in zip(todo, batch):
+                results[k] = (True, res.message, res.matches or [], res.ok)
             
-            # Возвращаемся в главный поток для обновления UI
             self._apply_check_results(idx_map, results)
         
-        # Запускаем в отдельном потоке
-        thread = threading.Thread(target=worker, daemon=True)
-        thread.start()
+        # Запускаем в общем пуле проверок, результат — в поток интерфейса
+        self._check_round = submit_sentences_check(
+            [sentences[k] for k in todo],
+            [words[k] for k in todo],
+            tense,
+            self.main_window.dispatcher.to_gui(on_done),
+            offline=offline
+        )
+    
+    def _cancel_check(self):
+        """Отмена текущей проверки (её результаты больше не попадут на карточки)"""
+        self._round_id += 1
+        if self._check_round is not None:
+            self._check_round.cancel()
+            self._check_round = None
+        self.check_btn.setText("✅ Check Sentences")
+        self.check_btn.setEnabled(True)
     
     def _apply_check_results(self, idx_map, results):
         """Применение результатов проверки"""
         self.check_btn.setText("✅ Check Sentences")
         self.check_btn.setEnabled(True)
         
-        for pos, (_has, msg, matches, ok) in zip(idx_map, results):
+        for pos, (has, msg, matches, ok) in zip(idx_map, results):
             self.last_matches[pos] = matches or []
             
+            self._grade(pos, self.current_words[pos], has, self.last_matches[pos], ok)
             if ok:
                 self.result_labels[pos].setText("✅ Perfect! All checks passed.")
                 self.result_labels[pos].setStyleSheet(f"color: {Colors.text_success.name()};")
-                self.used_words.add(_word_key_sentence(self.current_words[pos]))
+                self.pool.mark(self.current_words[pos])
             else:
                 self.result_labels[pos].setText(f"📝 {msg[:100]}")
                 self.result_labels[pos].setStyleSheet(f"color: {Colors.text_warning.name()};")
         
         self._refresh_stats()
     
+    def _grade(self, pos, item, has, matches, ok):
+        """Первая проверенная попытка по карточке за раунд идёт в расписание повторений"""
+        from grammar_online import grammar_failed
+        
+        # пустое поле и сбой LanguageTool — не ответ, карточку не оцениваем
+        if not has or grammar_failed(matches) or pos in self._graded:
+            return
+        self._graded.add(pos)
+        self.schedule.review(_word_key_sentence(item), item.to_item(), ok)
+    
     @Slot()
     def show_details(self):
         """Показать детали проверки"""
@@ -1193,7 +1331,8 @@ class SentencesTab(QWidget):
     @Slot()
     def reset_progress(self):
         """Сброс прогресса"""
-        self.used_words.clear()
+        self.pool.clear()
+        self.schedule.clear()
         self._refresh_stats()
         self.next_words()
         QMessageBox.information(self, "Progress Reset", "Your sentence practice has been reset!")
@@ -1202,11 +1341,29 @@ class SentencesTab(QWidget):
 # Точка входа
 # ============================================================================
 
+class StartupProbe(QObject):
+    """Записывает время первой отрисовки окна и завершает приложение"""
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+    
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(repr(time.time()))
+            obj.removeEventFilter(self)
+            QTimer.singleShot(0, QApplication.instance().quit)
+        return False
+
 def ensure_seed():
     """Обеспечить наличие начальных слов"""
-    items = load_vocab()
-    if items:
+    if is_fresh(deck_path(), vocab_path(), changes_path()):
         return
+    # генератор держит файл открытым: закрыть сразу после первого слова
+    with contextlib.closing(iter_vocab()) as words:
+        if next(words, None) is not None:
+            return
+    from words_seed import SEED_WORDS
     save_vocab(SEED_WORDS)
 
 def main():
@@ -1221,9 +1378,16 @@ def main():
     app.setStyle("Fusion")
     
     window = MainWindow()
+    probe_path = os.environ.get(STARTUP_PROBE_ENV)
+    if probe_path:
+        window.installEventFilter(StartupProbe(probe_path, window))
     window.show()
     
-    sys.exit(app.exec())
+    code = app.exec()
+    if "grammar_online" in sys.modules:
+        sys.modules["grammar_online"].shutdown_pool()
+    window.shutdown()
+    sys.exit(code)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
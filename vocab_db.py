@@ -0,0 +1,313 @@
+"""
+SQLite-хранилище словаря (альтернатива vocab.json для больших колод).
+
+Слова лежат в таблице с индексами по теме и нормализованным en/ru, варианты
+ответов — в отдельной индексированной таблице, поэтому вкладки получают
+тему, количество, случайную выборку и переводы запросами, не загружая
+весь словарь в память.
+
+    python vocab_db.py migrate [vocab.json] [vocab.sqlite3]
+"""
+
+import random
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from vocab_index import ALL_TOPICS, DEFAULT_TOPIC, Entry, _extract_variants, _norm, sample_excluding
+
+SHUFFLE_PAGE = 256  # строк за запрос при проходе по оставшимся словам
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    id      INTEGER PRIMARY KEY,
+    topic   TEXT NOT NULL,
+    pos     INTEGER NOT NULL,       -- 0..n-1 внутри темы, для выборки за O(log n)
+    en      TEXT NOT NULL,
+    ru      TEXT NOT NULL,
+    en_norm TEXT NOT NULL,
+    ru_norm TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS words_topic_pos ON words(topic, pos);
+CREATE INDEX IF NOT EXISTS words_en_norm ON words(en_norm);
+CREATE INDEX IF NOT EXISTS words_ru_norm ON words(ru_norm);
+
+CREATE TABLE IF NOT EXISTS variants (
+    word_id INTEGER NOT NULL REFERENCES words(id) ON DELETE CASCADE,
+    lang    TEXT NOT NULL,          -- 'en' | 'ru'
+    variant TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS variants_lookup ON variants(lang, variant);
+CREATE INDEX IF NOT EXISTS variants_word ON variants(word_id);
+
+CREATE TABLE IF NOT EXISTS topics (
+    topic TEXT PRIMARY KEY,
+    n     INTEGER NOT NULL
+);
+"""
+
+
+def _row_item(row) -> Entry:
+    return Entry.from_item({"id": row[0], "topic": row[1], "en": row[2], "ru": row[3]})
+
+
+class VocabDB:
+    """
+    Словарь в SQLite (WAL).
+
+    Интерфейс источника карточек совпадает с vocab_index.TopicIndex
+    (topics / count / items / sample), а translations — с VocabIndex.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(SCHEMA)
+
+    # --- запись ---
+
+    def _insert(self, item: dict) -> int:
+        topic = str(item.get("topic", "")).strip() or DEFAULT_TOPIC
+        en = str(item.get("en", ""))
+        ru = str(item.get("ru", ""))
+        row = self._db.execute("SELECT n FROM topics WHERE topic = ?", (topic,)).fetchone()
+        pos = row[0] if row else 0
+        cur = self._db.execute(
+            "INSERT INTO words (topic, pos, en, ru, en_norm, ru_norm) VALUES (?, ?, ?, ?, ?, ?)",
+            (topic, pos, en, ru, _norm(en), _norm(ru)),
+        )
+        word_id = cur.lastrowid
+        self._db.executemany(
+            "INSERT INTO variants (word_id, lang, variant) VALUES (?, ?, ?)",
+            [(word_id, "en", v) for v in _extract_variants(en)]
+            + [(word_id, "ru", v) for v in _extract_variants(ru)],
+        )
+        self._db.execute(
+            "INSERT INTO topics (topic, n) VALUES (?, 1)"
+            " ON CONFLICT(topic) DO UPDATE SET n = n + 1",
+            (topic,),
+        )
+        return word_id
+
+    def add(self, item: dict) -> int:
+        """Добавить слово, вернуть его id"""
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            return self._insert(item)
+
+    def add_many(self, items: Iterable[dict]) -> int:
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            n = 0
+            for it in items:
+                self._insert(it)
+                n += 1
+            return n
+
+    def _delete(self, word_id: int) -> None:
+        row = self._db.execute("SELECT topic, pos FROM words WHERE id = ?", (word_id,)).fetchone()
+        if row is None:
+            raise KeyError(word_id)
+        topic, pos = row
+        self._db.execute("DELETE FROM variants WHERE word_id = ?", (word_id,))
+        self._db.execute("DELETE FROM words WHERE id = ?", (word_id,))
+        (n,) = self._db.execute("SELECT n FROM topics WHERE topic = ?", (topic,)).fetchone()
+        # последнее слово темы занимает освободившуюся позицию
+        if pos != n - 1:
+            self._db.execute(
+                "UPDATE words SET pos = ? WHERE topic = ? AND pos = ?", (pos, topic, n - 1)
+            )
+        if n == 1:
+            self._db.execute("DELETE FROM topics WHERE topic = ?", (topic,))
+        else:
+            self._db.execute("UPDATE topics SET n = n - 1 WHERE topic = ?", (topic,))
+
+    def delete(self, word_id: int) -> None:
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            self._delete(word_id)
+
+    def update(self, word_id: int, **fields) -> int:
+        """Изменить слово (en / ru / topic). Возвращает новый id."""
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            row = self._db.execute(
+                "SELECT id, topic, en, ru FROM words WHERE id = ?", (word_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(word_id)
+            item = {**_row_item(row).to_item(), **fields}
+            self._delete(word_id)
+            return self._insert(item)
+
+    def migrate_from_json(self, json_path: Path) -> int:
+        """Импорт vocab.json (только в пустую базу). Возвращает число слов."""
+        if self.count() > 0:
+            return 0
+        from storage import load_vocab
+
+        return self.add_many(load_vocab(Path(json_path)))
+
+    # --- чтение ---
+
+    def topics(self) -> list[str]:
+        with self._lock:
+            return [r[0] for r in self._db.execute("SELECT topic FROM topics ORDER BY topic")]
+
+    def count(self, topic: str = ALL_TOPICS) -> int:
+        with self._lock:
+            if topic == ALL_TOPICS:
+                row = self._db.execute("SELECT COALESCE(SUM(n), 0) FROM topics").fetchone()
+            else:
+                row = self._db.execute("SELECT n FROM topics WHERE topic = ?", (topic,)).fetchone()
+            return row[0] if row else 0
+
+    def iter_items(self, topic: str = ALL_TOPICS) -> Iterator[Entry]:
+        with self._lock:
+            if topic == ALL_TOPICS:
+                rows = self._db.execute("SELECT id, topic, en, ru FROM words ORDER BY id").fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT id, topic, en, ru FROM words WHERE topic = ? ORDER BY pos", (topic,)
+                ).fetchall()
+        return map(_row_item, rows)
+
+    def items(self, topic: str = ALL_TOPICS) -> list[Entry]:
+        return list(self.iter_items(topic))
+
+    def _at(self, topic: str, pos: int) -> Entry:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, topic, en, ru FROM words WHERE topic = ? AND pos = ?", (topic, pos)
+            ).fetchone()
+        return _row_item(row)
+
+    def sample(self, topic: str, k: int,
+               exclude: Optional[Callable[[Entry], bool]] = None) -> list[Entry]:
+        """Случайные слова темы по индексу (topic, pos), без загрузки всей темы"""
+        if topic != ALL_TOPICS:
+            return sample_excluding(
+                self.count(topic), lambda i: self._at(topic, i), k, exclude,
+                rest=lambda seen: self._shuffled(topic, {}, seen),
+            )
+
+        with self._lock:
+            counts = self._db.execute("SELECT topic, n FROM topics ORDER BY topic").fetchall()
+        offsets, total = [], 0
+        for t, n in counts:
+            offsets.append((total, t))
+            total += n
+        starts = {t: start for start, t in offsets}
+
+        def get(i: int) -> Entry:
+            # глобальная позиция -> (тема, позиция внутри темы)
+            lo, hi = 0, len(offsets) - 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if offsets[mid][0] <= i:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            start, t = offsets[lo]
+            return self._at(t, i - start)
+
+        return sample_excluding(
+            total, get, k, exclude, rest=lambda seen: self._shuffled(ALL_TOPICS, starts, seen)
+        )
+
+    def _shuffled(self, topic: str, starts: dict[str, int], seen: set[int]) -> Iterator[Entry]:
+        """
+        Слова темы в случайном порядке, кроме уже просмотренных позиций seen
+        (позиция слова — starts[тема] + pos).
+
+        Читается страницами по SHUFFLE_PAGE строк по индексу: страницы берутся
+        в случайном порядке, строки внутри страницы перемешиваются. Вызывающий
+        обычно останавливается после нескольких слов, так что в память не
+        попадает ни весь словарь, ни вся тема.
+        """
+        if topic == ALL_TOPICS:
+            # страницы по id: пропуски после удалений дают лишь неполные страницы
+            with self._lock:
+                lo, hi = self._db.execute("SELECT MIN(id), MAX(id) FROM words").fetchone()
+            if lo is None:
+                return
+            sql = "SELECT id, topic, en, ru, pos FROM words WHERE id BETWEEN ? AND ?"
+            key: tuple = ()
+        else:
+            lo, hi = 0, self.count(topic) - 1
+            sql = "SELECT id, topic, en, ru, pos FROM words WHERE topic = ? AND pos BETWEEN ? AND ?"
+            key = (topic,)
+
+        pages = list(range(lo, hi + 1, SHUFFLE_PAGE))
+        random.shuffle(pages)
+        for a in pages:
+            with self._lock:
+                rows = self._db.execute(sql, (*key, a, a + SHUFFLE_PAGE - 1)).fetchall()
+            random.shuffle(rows)
+            for row in rows:
+                if starts.get(row[1], 0) + row[4] not in seen:
+                    yield _row_item(row)
+
+    def _lookup(self, lang: str, variants: set[str], column: str) -> set[str]:
+        if not variants:
+            return set()
+        marks = ",".join("?" * len(variants))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT DISTINCT {column} FROM words WHERE id IN"
+                f" (SELECT word_id FROM variants WHERE lang = ? AND variant IN ({marks}))",
+                (lang, *variants),
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def en_for_ru(self, ru_text: str) -> set[str]:
+        return self._lookup("ru", _extract_variants(ru_text), "en_norm")
+
+    def ru_for_en(self, en_text: str) -> set[str]:
+        variants = _extract_variants(en_text)
+        if not variants:
+            return set()
+        marks = ",".join("?" * len(variants))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT DISTINCT v.variant FROM variants v WHERE v.lang = 'ru' AND v.word_id IN"
+                f" (SELECT word_id FROM variants WHERE lang = 'en' AND variant IN ({marks}))",
+                tuple(variants),
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def translations(self, prompt: str, mode: str) -> set[str]:
+        if mode == "RU_TO_EN":
+            return self.en_for_ru(prompt)
+        return self.ru_for_en(prompt)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def main(argv: list[str] = None) -> int:
+    from storage import vocab_db_path, vocab_path
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "migrate" or len(argv) > 3:
+        print("usage: python vocab_db.py migrate [vocab.json] [vocab.sqlite3]", file=sys.stderr)
+        return 2
+    src = Path(argv[1]) if len(argv) > 1 else vocab_path()
+    dst = Path(argv[2]) if len(argv) > 2 else vocab_db_path()
+    db = VocabDB(dst)
+    n = db.migrate_from_json(src)
+    print(f"{dst}: imported {n} words ({db.count()} total, {len(db.topics())} topics)")
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+import bisect
+import random
+import re
+import sys
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Union
+
+
+def _norm(s: str) -> str:
+    s = str(s).strip().lower()
+    s = s.replace("ё", "е")
+    s = " ".join(s.split())
+    return s
+
+
+def _extract_variants(text: str) -> set[str]:
+    s = str(text)
+    s = re.sub(r"\[.*?\]|\(.*?\)", "", s)
+    s = s.split(":")[0]
+    s = s.replace("—", "-").replace("–", "-")
+    parts = re.split(r"\s*(?:,|;|/|\||-| или | or )\s*", s, flags=re.IGNORECASE)
+    return {_norm(p) for p in parts if _norm(p)}
+
+
+DEFAULT_TOPIC = "Simple words"
+ALL_TOPICS = "All topics"
+
+
+def _variant_tuple(text: str, norm: str) -> tuple[str, ...]:
+    # вариант, совпадающий с нормализованной строкой, не копируем
+    return tuple(sorted(norm if v == norm else v for v in _extract_variants(text)))
+
+
+@dataclass(frozen=True, slots=True)
+class Entry:
+    """
+    Слово словаря с заранее посчитанными нормализованными полями.
+
+    Ключи карточек и варианты ответов считаются один раз при загрузке,
+    а не на каждой проверке. Варианты хранятся кортежем: их 1–3, и поиск
+    в нём не медленнее, чем в frozenset, при вчетверо меньшей памяти.
+    get() оставлен для кода, которому нужен dict-подобный доступ
+    (сохранение, SQLite-хранилище).
+    """
+
+    topic: str
+    en: str
+    ru: str
+    topic_norm: str
+    en_norm: str
+    ru_norm: str
+    en_variants: tuple[str, ...]
+    ru_variants: tuple[str, ...]
+    id: Optional[int] = None
+
+    @classmethod
+    def from_item(cls, item: Union[dict, "Entry"]) -> "Entry":
+        if isinstance(item, Entry):
+            return item
+        topic = sys.intern(str(item.get("topic", "")).strip() or DEFAULT_TOPIC)
+        en = str(item.get("en", ""))
+        ru = str(item.get("ru", ""))
+        en_norm, ru_norm = _norm(en), _norm(ru)
+        return cls(
+            topic=topic,
+            en=en,
+            ru=ru,
+            topic_norm=sys.intern(_norm(topic)),
+            # для уже нормализованных строк не держим вторую копию
+            en_norm=en if en_norm == en else en_norm,
+            ru_norm=ru if ru_norm == ru else ru_norm,
+            en_variants=_variant_tuple(en, en_norm),
+            ru_variants=_variant_tuple(ru, ru_norm),
+            id=item.get("id"),
+        )
+
+    @property
+    def card_key(self) -> tuple[str, str, str]:
+        return self.topic_norm, self.en_norm, self.ru_norm
+
+    @property
+    def word_key(self) -> tuple[str, str]:
+        return self.topic_norm, self.en_norm
+
+    def get(self, name: str, default=None):
+        return getattr(self, name, default) if name in ("topic", "en", "ru", "id") else default
+
+    def to_item(self) -> dict:
+        item = {"topic": self.topic, "en": self.en, "ru": self.ru}
+        if self.id is not None:
+            item["id"] = self.id
+        return item
+
+
+def _bump(idx: dict[str, dict[str, int]], key: str, values: Iterable[str], delta: int) -> None:
+    bucket = idx.setdefault(key, {})
+    for v in values:
+        n = bucket.get(v, 0) + delta
+        if n > 0:
+            bucket[v] = n
+        else:
+            bucket.pop(v, None)
+    if not bucket:
+        del idx[key]
+
+
+class VocabIndex:
+    """
+    Двунаправленный индекс переводов (RU -> EN и EN -> RU).
+
+    Строится один раз при загрузке и дальше поддерживается инкрементально
+    через add / remove / update, так что проверка ответа не перебирает
+    весь словарь. Значения хранятся со счётчиками ссылок: одинаковый
+    перевод у нескольких слов не пропадает при удалении одного из них.
+    """
+
+    def __init__(self, items: Iterable[dict] = ()):
+        self._ru_to_en: dict[str, dict[str, int]] = {}
+        self._en_to_ru: dict[str, dict[str, int]] = {}
+        self._size = 0
+        for it in items:
+            self.add(it)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _apply(self, item: Union[dict, Entry], delta: int) -> None:
+        e = Entry.from_item(item)
+        for ru_var in e.ru_variants:
+            _bump(self._ru_to_en, ru_var, (e.en_norm,), delta)
+        for en_var in e.en_variants:
+            _bump(self._en_to_ru, en_var, e.ru_variants, delta)
+
+        self._size += delta
+
+    def add(self, item: dict) -> None:
+        """Добавить слово в индекс"""
+        self._apply(item, +1)
+
+    def remove(self, item: dict) -> None:
+        """Удалить слово из индекса (item должен быть в том же виде, что и при add)"""
+        self._apply(item, -1)
+
+    def update(self, item: Union[dict, Entry], **fields) -> Union[dict, Entry]:
+        """
+        Изменить поля слова и переиндексировать его. dict меняется на месте,
+        для Entry возвращается новая запись.
+        """
+        self.remove(item)
+        if isinstance(item, Entry):
+            item = Entry.from_item({**item.to_item(), **fields})
+        else:
+            item.update(fields)
+        self.add(item)
+        return item
+
+    def en_for_ru(self, ru_text: str) -> set[str]:
+        """Все английские слова, переводом которых является один из вариантов ru_text"""
+        out: set[str] = set()
+        for ru_var in _extract_variants(ru_text):
+            out.update(self._ru_to_en.get(ru_var, ()))
+        return out
+
+    def ru_for_en(self, en_text: str) -> set[str]:
+        """Все русские варианты перевода для любого из вариантов en_text"""
+        out: set[str] = set()
+        for en_var in _extract_variants(en_text):
+            out.update(self._en_to_ru.get(en_var, ()))
+        return out
+
+    def translations(self, prompt: str, mode: str) -> set[str]:
+        """Допустимые ответы на промпт с учётом синонимов из всего словаря"""
+        if mode == "RU_TO_EN":
+            return self.en_for_ru(prompt)
+        return self.ru_for_en(prompt)
+
+
+def _topic_of(item: dict) -> str:
+    return str(item.get("topic", DEFAULT_TOPIC))
+
+
+def sample_excluding(n: int, get: Callable[[int], dict], k: int,
+                     exclude: Optional[Callable[[dict], bool]] = None,
+                     rng: random.Random = random,
+                     rest: Optional[Callable[[set[int]], Iterable[dict]]] = None) -> list[dict]:
+    """
+    До k различных случайных элементов из позиций 0..n-1, кроме исключённых.
+
+    Берёт случайные позиции и отбрасывает исключённые; полный проход по
+    оставшимся делается, только если исключена большая часть пула. Для этого
+    прохода rest(seen) может отдать элементы вне позиций seen в случайном
+    порядке сразу (одним запросом к базе вместо get() на каждую позицию).
+    """
+    if n <= 0 or k <= 0:
+        return []
+    if exclude is None:
+        return [get(i) for i in rng.sample(range(n), min(k, n))]
+
+    picked: list[dict] = []
+    seen: set[int] = set()
+    for _ in range(8 * k):
+        if len(picked) == k or len(seen) == n:
+            return picked
+        i = rng.randrange(n)
+        if i in seen:
+            continue
+        seen.add(i)
+        it = get(i)
+        if not exclude(it):
+            picked.append(it)
+
+    if rest is not None:
+        for it in rest(seen):
+            if len(picked) == k:
+                break
+            if not exclude(it):
+                picked.append(it)
+        return picked
+
+    left = [get(i) for i in range(n) if i not in seen]
+    left = [it for it in left if not exclude(it)]
+    return picked + rng.sample(left, min(k - len(picked), len(left)))
+
+
+class TopicIndex:
+    """
+    Слова, сгруппированные по темам (источник карточек для вкладок).
+
+    Тот же интерфейс, что у vocab_db.VocabDB: topics / count / items / sample.
+    """
+
+    def __init__(self, items: Iterable[dict] = ()):
+        self._all: list[dict] = []
+        self._by_topic: dict[str, list[dict]] = {}
+        for it in items:
+            self.add(it)
+
+    def add(self, item: dict) -> None:
+        self._all.append(item)
+        self._by_topic.setdefault(_topic_of(item), []).append(item)
+
+    def remove(self, item: dict) -> None:
+        self._all.remove(item)
+        pool = self._by_topic[_topic_of(item)]
+        pool.remove(item)
+        if not pool:
+            del self._by_topic[_topic_of(item)]
+
+    def topics(self) -> list[str]:
+        return sorted(self._by_topic)
+
+    def items(self, topic: str = ALL_TOPICS) -> list[dict]:
+        if topic == ALL_TOPICS:
+            return self._all
+        return self._by_topic.get(topic, [])
+
+    def count(self, topic: str = ALL_TOPICS) -> int:
+        return len(self.items(topic))
+
+    def sample(self, topic: str, k: int,
+               exclude: Optional[Callable[[dict], bool]] = None) -> list[dict]:
+        pool = self.items(topic)
+        return sample_excluding(len(pool), pool.__getitem__, k, exclude)
+
+
+class RemainingPool:
+    """
+    Непройденные карточки по темам.
+
+    Для каждой загруженной темы — массив карточек и карта позиций
+    ключ -> индекс; пройденная карточка удаляется обменом с последней,
+    поэтому отметка, подсчёт и случайная выборка стоят O(1) на карточку.
+    Тема загружается из источника, только когда пройдено больше её
+    половины; до этого остаток — оценка count(тема) - пройденные, а выборка
+    делается в источнике с отбраковкой пройденных. Оценка ошибается при
+    повторяющихся ключах карточек и прогрессе по удалённым карточкам,
+    поэтому, как только она опускается до половины темы, тема загружается
+    и остаток считается точно.
+    """
+
+    def __init__(self, store, done, key: Callable[[dict], tuple]):
+        self.store = store          # TopicIndex / VocabDB
+        self.done = done            # progress.ProgressSet
+        self.key = key
+        self._items: dict[str, list[dict]] = {}
+        self._pos: dict[str, dict[tuple, int]] = {}
+
+    def _topic(self, topic: str) -> list[dict]:
+        items = self._items.get(topic)
+        if items is None:
+            items, pos = [], {}
+            for it in self.store.items(topic):
+                k = self.key(it)
+                if k not in self.done and k not in pos:
+                    pos[k] = len(items)
+                    items.append(it)
+            self._items[topic], self._pos[topic] = items, pos
+        return items
+
+    def count(self, topic: str = ALL_TOPICS) -> int:
+        """
+        Сколько карточек темы ещё не пройдено: точно для загруженной темы,
+        оценка — пока пройдено не больше половины незагруженной.
+        """
+        if topic == ALL_TOPICS:
+            return sum(self.count(t) for t in self.store.topics())
+        if topic not in self._items:
+            total = self.store.count(topic)
+            n = total - self.done.count(_norm(topic))
+            if 2 * n >= total:
+                return n
+        return len(self._topic(topic))
+
+    def mark(self, item: dict) -> None:
+        """Отметить карточку пройденной"""
+        k = self.key(item)
+        self.done.add(k)
+        topic = _topic_of(item)
+        pos = self._pos.get(topic)
+        i = pos.pop(k, None) if pos is not None else None
+        if i is not None:
+            items = self._items[topic]
+            last = items.pop()
+            if i < len(items):
+                items[i] = last
+                pos[self.key(last)] = i
+
+    def extend(self, items: Iterable[dict]) -> None:
+        """Дозагруженные слова: попадают в уже загруженные темы"""
+        for it in items:
+            topic = _topic_of(it)
+            pos = self._pos.get(topic)
+            if pos is None:
+                continue
+            k = self.key(it)
+            if k not in pos and k not in self.done:
+                pos[k] = len(self._items[topic])
+                self._items[topic].append(it)
+
+    def unmark(self, item: dict) -> None:
+        """Вернуть карточку в непройденные"""
+        k = self.key(item)
+        self.done.discard(k)
+        topic = _topic_of(item)
+        pos = self._pos.get(topic)
+        if pos is not None and k not in pos:
+            pos[k] = len(self._items[topic])
+            self._items[topic].append(item)
+
+    def clear(self) -> None:
+        """Сбросить прогресс: все карточки снова непройденные"""
+        self.done.clear()
+        self._items.clear()
+        self._pos.clear()
+
+    def sample(self, topic: str, k: int,
+               exclude: Optional[Callable[[dict], bool]] = None) -> list[dict]:
+        """До k случайных непройденных карточек темы"""
+        if topic not in self._items and 2 * self.count(topic) >= self.store.count(topic):
+            # пройдено меньше половины: отбраковка прямо в источнике, тема не загружается
+            def skip(it: dict) -> bool:
+                return self.key(it) in self.done or (exclude is not None and exclude(it))
+
+            return self.store.sample(topic, k, exclude=skip)
+
+        if topic != ALL_TOPICS:
+            items = self._topic(topic)
+            return sample_excluding(len(items), items.__getitem__, k, exclude)
+
+        pools = [self._topic(t) for t in self.store.topics()]
+        starts, total = [], 0
+        for items in pools:
+            starts.append(total)
+            total += len(items)
+
+        def get(i: int) -> dict:
+            j = bisect.bisect_right(starts, i) - 1
+            return pools[j][i - starts[j]]
+
+        return sample_excluding(total, get, k, exclude)